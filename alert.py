@@ -1,13 +1,24 @@
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+
 import requests
 
-def send_pagerduty_alert(routing_key, incident_title, incident_detail):
-    url = "https://events.pagerduty.com/v2/enqueue"
+from utils.http_client import get_http_client
+
+PAGERDUTY_EVENTS_URL = "https://events.pagerduty.com/v2/enqueue"
+
+
+def send_pagerduty_alert(routing_key, incident_title, incident_detail, dedup_key=None, event_action="trigger"):
+    url = PAGERDUTY_EVENTS_URL
     headers = {
         "Content-Type": "application/json"
     }
     payload = {
         "routing_key": routing_key,
-        "event_action": "trigger",
+        "event_action": event_action,
         "payload": {
             "summary": incident_title,
             "source": "router-chain-monitor",
@@ -15,11 +26,151 @@ def send_pagerduty_alert(routing_key, incident_title, incident_detail):
             "custom_details": incident_detail
         }
     }
-    
-    response = requests.post(url, json=payload, headers=headers)
-    if response.status_code == 202:
+    if dedup_key:
+        payload["dedup_key"] = dedup_key
+
+    try:
+        response = get_http_client().post_json(url, payload, headers=headers)
         print("Alert sent successfully.")
-        return response.json()
-    else:
-        print(f"Failed to send alert. Status code: {response.status_code} {response.reason}")
-        return response.text
\ No newline at end of file
+        return response
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Failed to send alert: {e}")
+        return None
+
+
+class AlertDispatcher:
+    """
+    Sends PagerDuty events from a background worker so callers only ever enqueue.
+
+    Each alert condition is identified by a stable `dedup_key`. `evaluate` is given the keys that
+    were checked in a cycle and the subset currently firing: new firing keys are triggered, firing
+    keys are re-triggered at most once per `repeat_interval`, and keys that were checked but no
+    longer fire are resolved. Events queued within `batch_window` seconds of each other are
+    coalesced per key before sending. A keyed event that fails to send is retried with exponential
+    backoff up to `retry_max` seconds until it succeeds or a newer event for its key replaces it;
+    `repeat_interval` only starts counting once a trigger was sent.
+    """
+    def __init__(self, routing_key: str, repeat_interval: float = 3600, batch_window: float = 1.0,
+                 retry_base: float = 5, retry_max: float = 300):
+        """
+        :param routing_key: PagerDuty Events API v2 routing key. Events are dropped with a warning when empty.
+        :param repeat_interval: Minimum seconds between two triggers of the same firing key.
+        :param batch_window: Seconds the worker waits after the first queued event to collect a burst.
+        :param retry_base: Seconds before the first retry of a failed event.
+        :param retry_max: Maximum seconds between two retries of a failed event.
+        """
+        self.routing_key = routing_key
+        self.repeat_interval = repeat_interval
+        self.batch_window = batch_window
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.active = {}
+        self.last_sent = {}
+        # Keys with an event queued or waiting for a retry, and the failed events by key with their due time and attempt
+        self.pending = set()
+        self.retries = {}
+        self.queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self.run, name="alert-dispatcher", daemon=True)
+                self._worker.start()
+
+    def send(self, title: str, details, dedup_key: str = None, event_action: str = "trigger") -> None:
+        if dedup_key:
+            with self._lock:
+                self.pending.add(dedup_key)
+        self.enqueue((dedup_key, event_action, title, details))
+
+    def enqueue(self, event) -> None:
+        self.start()
+        self.queue.put(event)
+
+    def evaluate(self, checked, firing) -> None:
+        """
+        :param checked: Dedup keys of every condition that was successfully checked in this cycle.
+        :param firing: Mapping of dedup key to (title, details) of the conditions currently firing.
+        """
+        now = time.monotonic()
+        events = []
+        # The worker updates pending and last_sent concurrently, so deciding and marking a key must be atomic
+        with self._lock:
+            for dedup_key, (title, details) in firing.items():
+                self.active[dedup_key] = title
+                if dedup_key in self.pending:
+                    continue
+                last_sent = self.last_sent.get(dedup_key)
+                if last_sent is None or now - last_sent >= self.repeat_interval:
+                    self.pending.add(dedup_key)
+                    events.append((dedup_key, "trigger", title, details))
+            for dedup_key in [key for key in self.active if key in checked and key not in firing]:
+                title = self.active.pop(dedup_key)
+                self.last_sent.pop(dedup_key, None)
+                self.pending.add(dedup_key)
+                events.append((dedup_key, "resolve", f"Resolved: {title}", None))
+        for event in events:
+            self.enqueue(event)
+
+    def get_retry_timeout(self):
+        if not self.retries:
+            return None
+        return max(0.0, min(due for due, _, _ in self.retries.values()) - time.monotonic())
+
+    def drain(self):
+        events = []
+        try:
+            events.append(self.queue.get(timeout=self.get_retry_timeout()))
+        except queue.Empty:
+            pass
+        if events:
+            deadline = time.monotonic() + self.batch_window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    events.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+        now = time.monotonic()
+        coalesced = OrderedDict()
+        for dedup_key in [key for key, (due, _, _) in self.retries.items() if due <= now]:
+            _, attempt, event = self.retries.pop(dedup_key)
+            coalesced[dedup_key] = (event, attempt)
+        for index, event in enumerate(events):
+            # Keyless one-off alerts are never coalesced; a newer event for a key replaces its retry
+            self.retries.pop(event[0], None)
+            coalesced[event[0] if event[0] else index] = (event, 0)
+        return list(coalesced.values())
+
+    def handle_result(self, event, attempt: int, sent: bool) -> None:
+        dedup_key, event_action, title, _ = event
+        if not dedup_key:
+            # Keyless alerts are raised again by their next check
+            return
+        with self._lock:
+            if sent:
+                self.pending.discard(dedup_key)
+                # A trigger whose condition was resolved meanwhile must not hold back its next trigger
+                if event_action == "trigger" and dedup_key in self.active:
+                    self.last_sent[dedup_key] = time.monotonic()
+                return
+            delay = min(self.retry_max, self.retry_base * 2 ** attempt)
+            self.retries[dedup_key] = (time.monotonic() + delay, attempt + 1, event)
+        logging.warning("Alert %s failed, retrying in %.0fs: %s", event_action, delay, title)
+
+    def run(self) -> None:
+        while True:
+            for event, attempt in self.drain():
+                dedup_key, event_action, title, details = event
+                if not self.routing_key:
+                    logging.warning("PAGER_DUTY_ROUTING is not configured. Alert not sent.")
+                    self.handle_result(event, attempt, True)
+                    continue
+                sent = send_pagerduty_alert(self.routing_key, title, details, dedup_key, event_action) is not None
+                self.handle_result(event, attempt, sent)
+                if sent:
+                    logging.info("Alert %s: %s", event_action, title)
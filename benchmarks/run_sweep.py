@@ -0,0 +1,202 @@
+"""
+Benchmark `OrchestratorValidator.validate_pending_nonce` and the `/health` route against local simulators.
+
+    python -m benchmarks.run_sweep --chains 100 --validators 20 --iterations 5
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import yaml
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.simulators import Simulator, SimulatorProfile, account_address, chain_ids, operator_address, serve_simulators  # noqa: E402
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, int(round(q * len(values))) - 1))]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        'count': len(values),
+        'mean_ms': round(statistics.mean(values) * 1000, 2) if values else 0.0,
+        'p50_ms': round(percentile(values, 0.50) * 1000, 2),
+        'p99_ms': round(percentile(values, 0.99) * 1000, 2),
+        'max_ms': round(max(values) * 1000, 2) if values else 0.0
+    }
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def reset_counts(url: str) -> Dict[str, int]:
+    with urllib.request.urlopen(url + Simulator.COUNTS_PATH) as response:
+        return json.load(response)
+
+
+def write_workdir(workdir: str, lcd_url: str, rpc_url: str, chains: int, validators: int, settings: Dict[str, Any]) -> str:
+    artifacts = os.path.join(workdir, 'artifacts')
+    os.makedirs(artifacts)
+    for name in ('Gateway-ABI.json', 'Voyager-ABI.json'):
+        shutil.copy(os.path.join(REPO_ROOT, 'artifacts', name), artifacts)
+    chain_infos = {chain_id: {'name': f'Bench-{chain_id}', 'rpc': f'{rpc_url}/{chain_id}', 'buffer': 2} for chain_id in chain_ids(chains)}
+    with open(os.path.join(artifacts, 'chainInfos.json'), 'w') as f:
+        json.dump(chain_infos, f, indent=4)
+    config = {'settings': dict({
+        'router_chain_lcd_url': lcd_url,
+        'pager_duty_routing': '',
+        'schedule_interval_seconds': 5,
+        'min_wallet_balance': '10ROUTE',
+        'validators': [
+            {'operator_address': operator_address(index), 'validator_address': account_address(index), 'orchestrator_address': account_address(index)}
+            for index in range(validators)
+        ]
+    }, **settings)}
+    config_path = os.path.join(workdir, 'config.yml')
+    with open(config_path, 'w') as f:
+        yaml.safe_dump(config, f)
+    return config_path
+
+
+def run(args) -> Dict[str, Any]:
+    # The simulators run in their own process so they neither share the GIL nor count towards the peak RSS
+    conn, child_conn = multiprocessing.Pipe()
+    simulators = multiprocessing.Process(target=serve_simulators, daemon=True, args=(
+        args.chains,
+        SimulatorProfile(args.lcd_latency_ms / 1000, args.jitter_ms / 1000, args.error_rate),
+        SimulatorProfile(args.rpc_latency_ms / 1000, args.jitter_ms / 1000, args.error_rate),
+        not args.no_batch,
+        child_conn,
+        args.grpc,
+        args.validators if args.attestation_stream else 0,
+        args.ws_drop_seconds
+    ))
+    simulators.start()
+    lcd_url, rpc_url, grpc_target, ws_url = conn.recv()
+    workdir = tempfile.mkdtemp(prefix='router-monitor-bench-')
+    settings = json.loads(args.settings) if args.settings else {}
+    if grpc_target:
+        settings = dict({'router_chain_query': 'grpc', 'router_chain_grpc_url': grpc_target}, **settings)
+    if ws_url:
+        settings = dict({'attestation_stream': {'ws_url': ws_url}}, **settings)
+    config_path = write_workdir(workdir, lcd_url, rpc_url, args.chains, args.validators, settings)
+    os.chdir(workdir)
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+    try:
+        with quiet:
+            import main
+            from orchestrator.missing_nonce import MissingNonceOrchestrator
+            MissingNonceOrchestrator.CWD = workdir
+            main.validator = validator = main.OrchestratorValidator(config_path)
+            # Sharded, the stream runs in the workers
+            attestation_stream = validator.attestation_stream
+            if attestation_stream is not None:
+                # Sweep once the subscription is up, so the run measures lookups served by the index
+                deadline = time.monotonic() + 10
+                while not attestation_stream.index.stream_connected and time.monotonic() < deadline:
+                    time.sleep(0.05)
+
+            sweeps = []
+            requests = []
+            for _ in range(args.warmup + args.iterations):
+                reset_counts(lcd_url)
+                reset_counts(rpc_url)
+                started = time.perf_counter()
+                validator.validate_pending_nonce()
+                sweeps.append(time.perf_counter() - started)
+                requests.append({'lcd': reset_counts(lcd_url), 'rpc': reset_counts(rpc_url)})
+            sweeps = sweeps[args.warmup:]
+            requests = requests[args.warmup:]
+
+            client = main.app.test_client()
+
+            def get_health(_):
+                started = time.perf_counter()
+                response = client.get('/health')
+                assert response.status_code == 200
+                return time.perf_counter() - started
+
+            with ThreadPoolExecutor(max_workers=args.health_concurrency) as executor:
+                started = time.perf_counter()
+                health_latencies = list(executor.map(get_health, range(args.health_requests)))
+                health_wall = time.perf_counter() - started
+            if attestation_stream is not None:
+                attestation_stream.stop()
+            validator.nonce_sweeper.close()
+            if validator.shard_coordinator is not None:
+                validator.shard_coordinator.stop()
+    finally:
+        os.chdir(REPO_ROOT)
+        conn.close()
+        simulators.join(timeout=5)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'chains': args.chains,
+        'validators': args.validators,
+        'iterations': args.iterations,
+        'validate_pending_nonce': dict(summarize(sweeps), wall_seconds=round(sum(sweeps), 3)),
+        'requests_per_sweep': requests[-1] if requests else {},
+        'health': dict(summarize(health_latencies), wall_seconds=round(health_wall, 3),
+                       requests_per_second=round(len(health_latencies) / health_wall, 1) if health_wall else 0.0),
+        'peak_rss_mb': peak_rss_mb()
+    }
+    if attestation_stream is not None:
+        report['attestation_index'] = {
+            'events': attestation_stream.index.events,
+            'hits': attestation_stream.index.hits,
+            'misses': attestation_stream.index.misses,
+            'reconnects': attestation_stream.reconnects
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark nonce sweeps and /health against local LCD and EVM JSON-RPC simulators.")
+    parser.add_argument('--chains', type=int, default=100, help="Number of simulated chains.")
+    parser.add_argument('--validators', type=int, default=20, help="Number of monitored validators.")
+    parser.add_argument('--iterations', type=int, default=5, help="Measured validate_pending_nonce runs.")
+    parser.add_argument('--warmup', type=int, default=1, help="Unmeasured runs before the measured ones.")
+    parser.add_argument('--lcd-latency-ms', type=float, default=20, help="Base LCD response delay.")
+    parser.add_argument('--rpc-latency-ms', type=float, default=50, help="Base JSON-RPC response delay.")
+    parser.add_argument('--jitter-ms', type=float, default=10, help="Maximum extra random delay per request.")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of simulated requests failing with HTTP 500.")
+    parser.add_argument('--no-batch', action='store_true', help="Make the JSON-RPC simulator reject batch requests.")
+    parser.add_argument('--grpc', action='store_true', help="Query the Router chain through a gRPC stand-in instead of the LCD.")
+    parser.add_argument('--attestation-stream', action='store_true',
+                        help="Feed attestation_stream from a Tendermint websocket stand-in voting the LCD simulator's nonces every second.")
+    parser.add_argument('--ws-drop-seconds', type=float, default=0, help="With --attestation-stream, drop the websocket every N seconds.")
+    parser.add_argument('--health-requests', type=int, default=1000, help="Number of /health requests.")
+    parser.add_argument('--health-concurrency', type=int, default=16, help="Concurrent /health clients.")
+    parser.add_argument('--settings', type=str, default='', help="JSON object merged into the generated `settings` config section.")
+    parser.add_argument('--verbose', action='store_true', help="Keep the monitor's own output.")
+    args = parser.parse_args()
+    print(json.dumps(run(args), indent=4))
+
+
+if __name__ == "__main__":
+    main()
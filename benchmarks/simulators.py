@@ -0,0 +1,415 @@
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from aiohttp import WSMsgType, web
+
+from google.protobuf import json_format
+
+from chain.proto.attestation_pb2 import QueryLastEventNonceRequest, QueryLastEventNonceResponse
+from chain.proto.bank_pb2 import QueryBalanceRequest, QueryBalanceResponse
+from chain.proto.multichain_pb2 import QueryAllContractConfigRequest, QueryAllContractConfigResponse
+from chain.proto.staking_pb2 import QueryValidatorRequest, QueryValidatorResponse
+from chain.router_grpc import BALANCE_METHOD, CONTRACT_CONFIG_METHOD, LAST_EVENT_NONCE_METHOD, VALIDATOR_METHOD
+
+# 4-byte selectors of the Gateway `eventNonce()` and Voyager `depositNonce()` calls
+NONCE_SELECTORS = {
+    '0x1c3e6ee6': 'GATEWAY',
+    '0xde35f5cb': 'VOYAGER'
+}
+
+
+class SimulatorProfile:
+    """
+    Per-request behaviour of a simulator: a base latency with uniform jitter, and an error rate.
+    """
+    __slots__ = ('latency', 'jitter', 'error_rate')
+
+    def __init__(self, latency: float = 0.02, jitter: float = 0.01, error_rate: float = 0.0):
+        """
+        :param latency: Base response delay in seconds.
+        :param jitter: Maximum extra delay in seconds, drawn uniformly per request.
+        :param error_rate: Fraction of requests answered with HTTP 500.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+
+    def delay(self) -> None:
+        time.sleep(self.latency + random.uniform(0, self.jitter))
+
+    def should_fail(self) -> bool:
+        return random.random() < self.error_rate
+
+
+class Simulator:
+    """
+    Threaded local HTTP server answering through `handle(method, path, body)` and counting requests per route.
+
+    `GET /_bench/counts` returns and resets the counts without delay, so a harness in another process can read them.
+    """
+    COUNTS_PATH = '/_bench/counts'
+
+    def __init__(self, profile: SimulatorProfile, host: str = '127.0.0.1', port: int = 0):
+        self.profile = profile
+        self.counts = Counter()
+        self._counts_lock = threading.Lock()
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def respond(self, method: str) -> None:
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                status, payload = simulator.dispatch(method, self.path, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self.respond('GET')
+
+            def do_POST(self):
+                self.respond('POST')
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'Simulator':
+        self._thread = threading.Thread(target=self.server.serve_forever, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def count(self, route: str) -> None:
+        with self._counts_lock:
+            self.counts[route] += 1
+
+    def reset_counts(self) -> Dict[str, int]:
+        with self._counts_lock:
+            counts, self.counts = dict(self.counts), Counter()
+        return counts
+
+    def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if path == self.COUNTS_PATH:
+            return 200, self.reset_counts()
+        self.profile.delay()
+        if self.profile.should_fail():
+            self.count('error')
+            return 500, {'error': 'simulated failure'}
+        return self.handle(method, path, body)
+
+    def handle(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        raise NotImplementedError
+
+
+def chain_ids(chain_count: int) -> List[str]:
+    return [str(1000 + index) for index in range(chain_count)]
+
+
+def operator_address(index: int) -> str:
+    return f'routervaloper1bench{index:04d}'
+
+
+def account_address(index: int) -> str:
+    return f'router1bench{index:04d}'
+
+
+def contract_address(chain_id: str, contract_type: str) -> str:
+    prefix = 'a' if contract_type == 'GATEWAY' else 'b'
+    return '0x' + (prefix + chain_id).rjust(40, '0')
+
+
+def onchain_nonce(chain_id: str, contract_type: str) -> int:
+    return int(chain_id) * (2 if contract_type == 'GATEWAY' else 1)
+
+
+class LcdSimulator(Simulator):
+    """
+    Stand-in for the Router chain LCD: multichain contract config, attestation last_event_nonce,
+    staking validators and bank balances. Every `lagging_every`-th validator is behind on every chain.
+    """
+    LAST_EVENT_NONCE = re.compile(r'/attestation/last_event_nonce/([^/]+)/([^/]+)/([^/?]+)')
+    VALIDATOR = re.compile(r'/cosmos/staking/v1beta1/validators/([^/?]+)')
+    BALANCE = re.compile(r'/cosmos/bank/v1beta1/balances/([^/?]+)(/by_denom)?')
+
+    def __init__(self, chain_count: int, profile: Optional[SimulatorProfile] = None, lagging_every: int = 5, **kwargs):
+        super().__init__(profile or SimulatorProfile(), **kwargs)
+        self.chain_ids = chain_ids(chain_count)
+        self.lagging_every = lagging_every
+        self.addresses = {contract_address(chain_id, contract_type): contract_type for chain_id in self.chain_ids for contract_type in NONCE_SELECTORS.values()}
+
+    def last_event_nonce(self, chain_id: str, contract_type: str, validator: str) -> int:
+        nonce = onchain_nonce(chain_id, contract_type)
+        if self.lagging_every and int(validator[-4:]) % self.lagging_every == 0:
+            nonce -= 10
+        return nonce
+
+    def handle(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if path.endswith('/multichain/contract_config'):
+            self.count('contract_config')
+            return 200, {'contractConfig': [
+                {'chainId': chain_id, 'contractType': contract_type, 'contractAddress': contract_address(chain_id, contract_type), 'contract_enabled': True}
+                for chain_id in self.chain_ids for contract_type in NONCE_SELECTORS.values()
+            ]}
+        match = self.LAST_EVENT_NONCE.search(path)
+        if match:
+            self.count('last_event_nonce')
+            chain_id, address, validator = match.groups()
+            return 200, {'eventNonce': str(self.last_event_nonce(chain_id, self.addresses.get(address.lower(), 'GATEWAY'), validator))}
+        match = self.VALIDATOR.search(path)
+        if match:
+            self.count('validators')
+            address = match.group(1)
+            return 200, {'validator': {'operator_address': address, 'jailed': False, 'tokens': '1', 'description': {'moniker': 'bench-' + address[-4:]}}}
+        match = self.BALANCE.search(path)
+        if match:
+            self.count('balances')
+            coin = {'denom': 'route', 'amount': str(50 * 10 ** 18)}
+            return 200, {'balance': coin} if match.group(2) else {'balances': [coin], 'pagination': {'total': '1'}}
+        self.count('not_found')
+        return 404, {'code': 5, 'message': 'not found'}
+
+
+class RouterGrpcSimulator:
+    """
+    Stand-in for the Router chain node's gRPC query services. Every query is answered by the
+    `LcdSimulator` route it mirrors, so both transports serve the same data with the same latency,
+    error rate and request counts.
+    """
+    ROUTES = {
+        VALIDATOR_METHOD: (QueryValidatorRequest, QueryValidatorResponse,
+                           lambda request: f"/cosmos/staking/v1beta1/validators/{request.validator_addr}"),
+        BALANCE_METHOD: (QueryBalanceRequest, QueryBalanceResponse,
+                         lambda request: f"/cosmos/bank/v1beta1/balances/{request.address}/by_denom?denom={request.denom}"),
+        CONTRACT_CONFIG_METHOD: (QueryAllContractConfigRequest, QueryAllContractConfigResponse,
+                                 lambda request: "/router-protocol/router-chain/multichain/contract_config"),
+        LAST_EVENT_NONCE_METHOD: (QueryLastEventNonceRequest, QueryLastEventNonceResponse,
+                                  lambda request: "/router-protocol/router-chain/attestation/last_event_nonce/"
+                                                  f"{request.chainId}/{request.contract}/{request.validator}")
+    }
+
+    def __init__(self, lcd: LcdSimulator, host: str = '127.0.0.1', port: int = 0, max_workers: int = 64):
+        self.lcd = lcd
+        self.host = host
+        self.port = port
+        self.max_workers = max_workers
+        self.server = None
+
+    @property
+    def target(self) -> str:
+        return f'{self.host}:{self.port}'
+
+    def handle(self, method: str, request: bytes, context) -> bytes:
+        import grpc
+        request_type, response_type, get_path = self.ROUTES[method]
+        status, body = self.lcd.dispatch('GET', get_path(request_type.FromString(request)), b'')
+        if status != 200:
+            context.abort(grpc.StatusCode.NOT_FOUND if status == 404 else grpc.StatusCode.UNAVAILABLE, str(body))
+        return json_format.ParseDict(body, response_type(), ignore_unknown_fields=True).SerializeToString()
+
+    def start(self) -> 'RouterGrpcSimulator':
+        import grpc
+        from concurrent.futures import ThreadPoolExecutor
+        services = {}
+        for method in self.ROUTES:
+            service, name = method.lstrip('/').split('/')
+            services.setdefault(service, {})[name] = grpc.unary_unary_rpc_method_handler(
+                lambda request, context, method=method: self.handle(method, request, context))
+        self.server = grpc.server(ThreadPoolExecutor(max_workers=self.max_workers))
+        for service, handlers in services.items():
+            self.server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(service, handlers),))
+        self.port = self.server.add_insecure_port(self.target)
+        self.server.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.stop(grace=None)
+
+
+class EvmRpcSimulator(Simulator):
+    """
+    Stand-in for EVM JSON-RPC nodes answering `eth_call` nonce reads, `eth_blockNumber` and batches.
+    Every chain is served under its own path, `/<chain id>`.
+    """
+    def __init__(self, profile: Optional[SimulatorProfile] = None, supports_batch: bool = True, **kwargs):
+        super().__init__(profile or SimulatorProfile(), **kwargs)
+        self.supports_batch = supports_batch
+        self.started = time.monotonic()
+
+    def rpc_url(self, chain_id: str) -> str:
+        return f'{self.url}/{chain_id}'
+
+    def call(self, chain_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.count(request.get('method', 'unknown'))
+        response = {'jsonrpc': '2.0', 'id': request.get('id')}
+        if request.get('method') == 'eth_blockNumber':
+            response['result'] = hex(int(time.monotonic() - self.started) + 1)
+        elif request.get('method') == 'eth_chainId':
+            response['result'] = hex(int(chain_id))
+        elif request.get('method') == 'eth_call':
+            contract_type = NONCE_SELECTORS.get(request['params'][0].get('data', '')[:10])
+            if contract_type is None:
+                response['error'] = {'code': -32000, 'message': 'execution reverted'}
+            else:
+                response['result'] = '0x' + format(onchain_nonce(chain_id, contract_type), '064x')
+        else:
+            response['error'] = {'code': -32601, 'message': 'method not found'}
+        return response
+
+    def handle(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        chain_id = path.strip('/').split('/')[0] or '1'
+        request = json.loads(body or b'{}')
+        self.count('http')
+        if isinstance(request, list):
+            if not self.supports_batch:
+                return 200, {'jsonrpc': '2.0', 'id': None, 'error': {'code': -32600, 'message': 'batch not supported'}}
+            self.count('batch')
+            return 200, [self.call(chain_id, item) for item in request]
+        return 200, self.call(chain_id, request)
+
+
+class TendermintWsSimulator:
+    """
+    Stand-in for a Tendermint RPC websocket: accepts `subscribe` requests and pushes attestation vote
+    events, encoded like typed Cosmos SDK events, to every subscriber.
+    """
+    def __init__(self, event_type: str = 'routerprotocol.routerchain.attestation.EventAttestationVote', host: str = '127.0.0.1', port: int = 0):
+        self.event_type = event_type
+        self.host = host
+        self.port = port
+        self.subscribers = set()
+        self.subscriptions = 0
+        self._loop = asyncio.new_event_loop()
+        self._runner = None
+
+    @property
+    def url(self) -> str:
+        return f'ws://{self.host}:{self.port}/websocket'
+
+    async def handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                continue
+            payload = json.loads(message.data)
+            if payload.get('method') == 'subscribe':
+                self.subscriptions += 1
+                self.subscribers.add(ws)
+                await ws.send_json({'jsonrpc': '2.0', 'id': payload.get('id'), 'result': {}})
+        self.subscribers.discard(ws)
+        return ws
+
+    async def _start(self) -> None:
+        app = web.Application()
+        app.router.add_get('/websocket', self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    def start(self) -> 'TendermintWsSimulator':
+        threading.Thread(target=self._loop.run_forever, name=type(self).__name__, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def build_message(self, votes: Iterable[Tuple[str, str, str, int]]) -> Dict[str, Any]:
+        votes = list(votes)
+        events = {'tm.event': ['Tx']}
+        for index, name in enumerate(('chainId', 'contract', 'voter', 'eventNonce')):
+            events[f'{self.event_type}.{name}'] = [json.dumps(str(vote[index])) for vote in votes]
+        return {'jsonrpc': '2.0', 'id': 1, 'result': {'query': '', 'data': {'type': 'tendermint/event/Tx', 'value': {}}, 'events': events}}
+
+    def emit_votes(self, votes: Iterable[Tuple[str, str, str, int]]) -> None:
+        """
+        Push one transaction event holding (chain id, contract, voter, nonce) votes to every subscriber.
+        """
+        message = self.build_message(votes)
+
+        async def send():
+            for ws in list(self.subscribers):
+                await ws.send_json(message)
+        asyncio.run_coroutine_threadsafe(send(), self._loop).result()
+
+    def drop_connections(self) -> None:
+        """
+        Close every subscriber connection, as a node restart would.
+        """
+        async def close():
+            for ws in list(self.subscribers):
+                await ws.close()
+        asyncio.run_coroutine_threadsafe(close(), self._loop).result()
+
+
+def emit_lcd_votes(ws: TendermintWsSimulator, lcd: LcdSimulator, validator_count: int, stopped: threading.Event,
+                   vote_interval: float = 1, drop_seconds: float = 0) -> None:
+    """
+    Push a vote of every validator on every contract every `vote_interval` seconds, matching the nonces the LCD
+    simulator serves, and drop every subscriber connection every `drop_seconds` seconds when set.
+    """
+    votes = [
+        (chain_id, contract_address(chain_id, contract_type), account_address(index), lcd.last_event_nonce(chain_id, contract_type, operator_address(index)))
+        for chain_id in lcd.chain_ids for contract_type in NONCE_SELECTORS.values() for index in range(validator_count)
+    ]
+    last_drop = time.monotonic()
+    while not stopped.wait(vote_interval):
+        ws.emit_votes(votes)
+        if drop_seconds and time.monotonic() - last_drop >= drop_seconds:
+            ws.drop_connections()
+            last_drop = time.monotonic()
+
+
+def serve_simulators(chain_count: int, lcd_profile: SimulatorProfile, rpc_profile: SimulatorProfile, supports_batch: bool, conn,
+                     serve_grpc: bool = False, validator_count: int = 0, ws_drop_seconds: float = 0) -> None:
+    """
+    Process entry point: start the simulators, send their urls (and the gRPC target and websocket url, if served)
+    through `conn` and serve until `conn` closes. The Tendermint websocket is served when `validator_count` is set.
+    """
+    lcd = LcdSimulator(chain_count, lcd_profile).start()
+    rpc = EvmRpcSimulator(rpc_profile, supports_batch=supports_batch).start()
+    router_grpc = RouterGrpcSimulator(lcd).start() if serve_grpc else None
+    ws = TendermintWsSimulator().start() if validator_count else None
+    stopped = threading.Event()
+    if ws is not None:
+        threading.Thread(target=emit_lcd_votes, args=(ws, lcd, validator_count, stopped), kwargs={'drop_seconds': ws_drop_seconds},
+                         name='emit_lcd_votes', daemon=True).start()
+    conn.send((lcd.url, rpc.url, router_grpc.target if router_grpc is not None else None, ws.url if ws is not None else None))
+    try:
+        conn.recv()
+    except EOFError:
+        pass
+    stopped.set()
+    if ws is not None:
+        ws.stop()
+    if router_grpc is not None:
+        router_grpc.stop()
+    lcd.stop()
+    rpc.stop()
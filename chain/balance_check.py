@@ -1,67 +1,181 @@
-import requests
-
-class AccountBalanceFetcher:
-    def __init__(self, rpc,min_balance, validator_address, orchestrator_address):
-        self.rpc = rpc
-        self.validator_address = validator_address
-        self.orchestrator_address = orchestrator_address
-        self.min_balance = self.get_min_balance(min_balance)
-        print('min balance', self.min_balance)
-
-    def fetch_json(self, url):
-        try:
-            response = requests.get(url)
-            return response.json()
-        except Exception as e:
-            print(f'Error fetching {url}: {str(e)}')
-            raise e
-
-    def get_min_balance(self, min_balance):
-        try:
-            if min_balance[-5:] == 'ROUTE':
-                min_balance = int(min_balance[:-5])
-            else:
-                min_balance = 0
-            return min_balance
-        except:
-            return 0
-    
-    def convert_to_float(self, balance):
-        try:
-            return float(balance)/10**18
-        except:
-            return 0
-    
-    def validate_balances(self):
-        validator_balance = self.convert_to_float(self.fetch_balance_by_address(self.validator_address))
-        orchestrator_balance = self.convert_to_float(self.fetch_balance_by_address(self.orchestrator_address))
-        # convert balance of this type "89923000035815961600" to float by dividing by 10^18
-        isValidatorBalanceLow = validator_balance < self.min_balance
-        isOrchestratorBalanceLow = orchestrator_balance < self.min_balance
-        return {
-            "validator_balance": validator_balance,
-            "orchestrator_balance": orchestrator_balance,
-            "isValidatorBalanceLow": isValidatorBalanceLow,
-            "isOrchestratorBalanceLow": isOrchestratorBalanceLow
-        }
-
-    def fetch_balance_by_address(self, address):
-        url = f"{self.rpc}/cosmos/bank/v1beta1/balances/{address}?pagination.limit=1000"
-        try:
-            response = self.fetch_json(url)
-            balances = response.get('balances', [])
-            print('user balances', balances)
-            return balances[0].get('amount', '0')
-        except Exception as e:
-            print(f'Error fetching balances for {address}: {str(e)}')
-            return 0
-            
-
-# # Example usage
-# async def main():
-#     rpc = "RPC_ENDPOINT_HERE"
-#     account_address = "ACCOUNT_ADDRESS_HERE"
-#     fetcher = AccountBalanceFetcher(rpc, account_address)
-#     balances = await fetcher.fetch_balances()
-#     # Replace 'setBalances(balances)' with the equivalent Python code, depending on your application
-#     # For
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+from chain.router_grpc import get_router_grpc
+from utils.http_client import get_http_client
+from utils.metrics import BALANCE_FETCH_LATENCY
+
+DEFAULT_DENOM = 'route'
+DEFAULT_DECIMALS = 18
+# Display denom -> (base denom, decimals)
+DISPLAY_DENOMS = {
+    'ROUTE': (DEFAULT_DENOM, DEFAULT_DECIMALS)
+}
+MIN_BALANCE_PATTERN = re.compile(r'^\s*([0-9]+(?:\.[0-9]+)?)\s*(\S*)\s*$')
+
+
+def parse_min_balance(min_balance: Any, decimals: Optional[int] = None) -> Tuple[float, str, int]:
+    """
+    Parse a threshold such as `10ROUTE`, `2.5 ROUTE` or `1000000 ibc/27394...` into (amount, base denom, decimals).
+
+    A bare number is in ROUTE. Unparseable thresholds are 0 so they never alert.
+    """
+    if isinstance(min_balance, (int, float)):
+        return float(min_balance), DEFAULT_DENOM, DEFAULT_DECIMALS if decimals is None else int(decimals)
+    match = MIN_BALANCE_PATTERN.match(str(min_balance or ''))
+    if not match:
+        return 0.0, DEFAULT_DENOM, DEFAULT_DECIMALS if decimals is None else int(decimals)
+    amount, denom = match.groups()
+    base_denom, default_decimals = DISPLAY_DENOMS.get(denom.upper() if denom else 'ROUTE', (denom, DEFAULT_DECIMALS))
+    return float(amount), base_denom, default_decimals if decimals is None else int(decimals)
+
+
+class BalanceCheck:
+    """
+    Threshold of one (address, denom) pair, in display units of the denom.
+    """
+    __slots__ = ('address', 'role', 'denom', 'min_balance', 'decimals')
+
+    def __init__(self, address: str, role: str, denom: str = DEFAULT_DENOM, min_balance: float = 0, decimals: int = DEFAULT_DECIMALS):
+        self.address = address
+        self.role = role
+        self.denom = denom
+        self.min_balance = min_balance
+        self.decimals = decimals
+
+    @classmethod
+    def from_threshold(cls, address: str, role: str, min_balance: Any, decimals: Optional[int] = None) -> 'BalanceCheck':
+        amount, denom, decimals = parse_min_balance(min_balance, decimals)
+        return cls(address, role, denom, amount, decimals)
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return self.address, self.role, self.denom
+
+    @property
+    def alert_key(self) -> str:
+        if self.denom == DEFAULT_DENOM:
+            return f"balance_low:{self.address}:{self.role}"
+        return f"balance_low:{self.address}:{self.role}:{self.denom}"
+
+
+class BalanceResult:
+    __slots__ = ('check', 'balance', 'low', 'cached', 'error')
+
+    def __init__(self, check: BalanceCheck, balance: Optional[float], cached: bool = False, error: Optional[str] = None):
+        """
+        :param balance: Balance in display units, None when the lookup failed.
+        :param cached: The balance was served from the cache instead of the LCD.
+        """
+        self.check = check
+        self.balance = balance
+        self.low = balance is not None and balance < check.min_balance
+        self.cached = cached
+        self.error = error
+
+
+class CachedBalance:
+    __slots__ = ('amount', 'fetched_at', 'ttl')
+
+    def __init__(self, amount: int, fetched_at: float, ttl: float):
+        self.amount = amount
+        self.fetched_at = fetched_at
+        self.ttl = ttl
+
+
+class BalanceMonitor:
+    """
+    Checks the balances of any number of (address, denom) pairs concurrently through the shared pooled HTTP client.
+
+    Each pair is read once per check with the LCD `by_denom` query, however many thresholds refer
+    to it. Balances are cached with a TTL that follows how fast they change: a balance that did not
+    move doubles its TTL up to `max_ttl`, and one that moved is re-read after half the time it would
+    take to reach its threshold at the observed rate, and never later than `max_ttl`. Balances below
+    their threshold are not cached.
+    """
+    def __init__(self, lcd_url: str, checks: Iterable[BalanceCheck] = (), min_ttl: float = 0, max_ttl: float = 300, max_workers: int = 8):
+        """
+        :param lcd_url: Router chain LCD url.
+        :param checks: Thresholds to check.
+        :param min_ttl: Shortest time in seconds a fetched balance is reused.
+        :param max_ttl: Longest time in seconds a fetched balance is reused.
+        :param max_workers: Maximum number of concurrent balance lookups.
+        """
+        self.lcd_url = lcd_url
+        self.checks: List[BalanceCheck] = []
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.cache: Dict[Tuple[str, str], CachedBalance] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="balance-check")
+        self.set_checks(checks)
+
+    def set_checks(self, checks: Iterable[BalanceCheck]) -> None:
+        self.checks = list(checks)
+        live = {(check.address, check.denom) for check in self.checks}
+        with self._lock:
+            self.cache = {key: entry for key, entry in self.cache.items() if key in live}
+
+    def get_check(self, address: str, role: str, denom: str = DEFAULT_DENOM) -> Optional[BalanceCheck]:
+        return next((check for check in self.checks if check.key == (address, role, denom)), None)
+
+    def get_balance_uri(self, address: str, denom: str) -> str:
+        return f"{self.lcd_url}/cosmos/bank/v1beta1/balances/{address}/by_denom?denom={quote(denom, safe='')}"
+
+    def fetch_amount(self, address: str, denom: str) -> int:
+        router_grpc = get_router_grpc()
+        with BALANCE_FETCH_LATENCY.time():
+            if router_grpc is not None:
+                return router_grpc.get_balance(address, denom)
+            response = get_http_client().get_json(self.get_balance_uri(address, denom))
+        return int((response.get('balance') or {}).get('amount') or 0)
+
+    def next_ttl(self, previous: Optional[CachedBalance], amount: int, now: float, threshold_amount: float) -> float:
+        headroom = amount - threshold_amount
+        if previous is None or headroom <= 0:
+            # Low balances are re-read every check so a top-up resolves the alert right away
+            return self.min_ttl
+        spent = max(previous.amount - amount, 0)
+        if spent == 0:
+            # A top-up only moves the balance away from the threshold
+            return min(self.max_ttl, max(previous.ttl, self.min_ttl, 1) * 2)
+        rate = spent / max(now - previous.fetched_at, 1e-3)
+        return min(self.max_ttl, max(self.min_ttl, headroom / rate / 2))
+
+    def get_amount(self, address: str, denom: str, threshold_amount: float) -> Tuple[int, bool]:
+        """
+        :return: The balance in base units and whether it came from the cache.
+        """
+        now = time.monotonic()
+        with self._lock:
+            previous = self.cache.get((address, denom))
+        if previous is not None and now - previous.fetched_at < previous.ttl:
+            return previous.amount, True
+        amount = self.fetch_amount(address, denom)
+        with self._lock:
+            self.cache[(address, denom)] = CachedBalance(amount, now, self.next_ttl(previous, amount, now, threshold_amount))
+        return amount, False
+
+    def check_all(self) -> List[BalanceResult]:
+        """
+        Check every threshold, reading each distinct (address, denom) pair at most once.
+        """
+        thresholds: Dict[Tuple[str, str], float] = {}
+        for check in self.checks:
+            key = (check.address, check.denom)
+            thresholds[key] = max(thresholds.get(key, 0.0), check.min_balance * 10 ** check.decimals)
+        futures = {key: self._executor.submit(self.get_amount, key[0], key[1], threshold) for key, threshold in thresholds.items()}
+        results = []
+        for check in self.checks:
+            try:
+                amount, cached = futures[(check.address, check.denom)].result()
+            except Exception as e:
+                print(f'Error fetching {check.denom} balance of {check.address}: {str(e)}')
+                results.append(BalanceResult(check, None, error=str(e)))
+                continue
+            results.append(BalanceResult(check, amount / 10 ** check.decimals, cached))
+        return results
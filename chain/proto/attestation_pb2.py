@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: chain/proto/attestation.proto
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1d\x63hain/proto/attestation.proto\x12&routerprotocol.routerchain.attestation\"R\n\x1aQueryLastEventNonceRequest\x12\x0f\n\x07\x63hainId\x18\x01 \x01(\t\x12\x10\n\x08\x63ontract\x18\x02 \x01(\t\x12\x11\n\tvalidator\x18\x03 \x01(\t\"1\n\x1bQueryLastEventNonceResponse\x12\x12\n\neventNonce\x18\x01 \x01(\x04\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'chain.proto.attestation_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _globals['_QUERYLASTEVENTNONCEREQUEST']._serialized_start=73
+  _globals['_QUERYLASTEVENTNONCEREQUEST']._serialized_end=155
+  _globals['_QUERYLASTEVENTNONCERESPONSE']._serialized_start=157
+  _globals['_QUERYLASTEVENTNONCERESPONSE']._serialized_end=206
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: chain/proto/multichain.proto
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1c\x63hain/proto/multichain.proto\x12%routerprotocol.routerchain.multichain\")\n\x0bPageRequest\x12\x0b\n\x03key\x18\x01 \x01(\x0c\x12\r\n\x05limit\x18\x03 \x01(\x04\"/\n\x0cPageResponse\x12\x10\n\x08next_key\x18\x01 \x01(\x0c\x12\r\n\x05total\x18\x02 \x01(\x04\"\x9e\x02\n\x0e\x43ontractConfig\x12\x0f\n\x07\x63hainId\x18\x01 \x01(\t\x12\x17\n\x0f\x63ontractAddress\x18\x02 \x01(\t\x12\x16\n\x0e\x63ontractHeight\x18\x03 \x01(\x04\x12\x1e\n\x16lastObservedEventNonce\x18\x04 \x01(\x04\x12\x1f\n\x17lastObservedValsetNonce\x18\x05 \x01(\x04\x12$\n\x1clastObservedEventBlockHeight\x18\x06 \x01(\x04\x12I\n\x0c\x63ontractType\x18\x07 \x01(\x0e\x32\x33.routerprotocol.routerchain.multichain.ContractType\x12\x18\n\x10\x63ontract_enabled\x18\x08 \x01(\x08\"g\n\x1dQueryAllContractConfigRequest\x12\x46\n\npagination\x18\x01 \x01(\x0b\x32\x32.routerprotocol.routerchain.multichain.PageRequest\"\xb8\x01\n\x1eQueryAllContractConfigResponse\x12M\n\x0e\x63ontractConfig\x18\x01 \x03(\x0b\x32\x35.routerprotocol.routerchain.multichain.ContractConfig\x12G\n\npagination\x18\x02 \x01(\x0b\x32\x33.routerprotocol.routerchain.multichain.PageResponse*(\n\x0c\x43ontractType\x12\x0b\n\x07GATEWAY\x10\x00\x12\x0b\n\x07VOYAGER\x10\x01\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'chain.proto.multichain_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _globals['_CONTRACTTYPE']._serialized_start=744
+  _globals['_CONTRACTTYPE']._serialized_end=784
+  _globals['_PAGEREQUEST']._serialized_start=71
+  _globals['_PAGEREQUEST']._serialized_end=112
+  _globals['_PAGERESPONSE']._serialized_start=114
+  _globals['_PAGERESPONSE']._serialized_end=161
+  _globals['_CONTRACTCONFIG']._serialized_start=164
+  _globals['_CONTRACTCONFIG']._serialized_end=450
+  _globals['_QUERYALLCONTRACTCONFIGREQUEST']._serialized_start=452
+  _globals['_QUERYALLCONTRACTCONFIGREQUEST']._serialized_end=555
+  _globals['_QUERYALLCONTRACTCONFIGRESPONSE']._serialized_start=558
+  _globals['_QUERYALLCONTRACTCONFIGRESPONSE']._serialized_end=742
+# @@protoc_insertion_point(module_scope)
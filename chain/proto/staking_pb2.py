@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: chain/proto/staking.proto
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x19\x63hain/proto/staking.proto\x12\x16\x63osmos.staking.v1beta1\"l\n\x0b\x44\x65scription\x12\x0f\n\x07moniker\x18\x01 \x01(\t\x12\x10\n\x08identity\x18\x02 \x01(\t\x12\x0f\n\x07website\x18\x03 \x01(\t\x12\x18\n\x10security_contact\x18\x04 \x01(\t\x12\x0f\n\x07\x64\x65tails\x18\x05 \x01(\t\"\x84\x02\n\tValidator\x12\x18\n\x10operator_address\x18\x01 \x01(\t\x12\x0e\n\x06jailed\x18\x03 \x01(\x08\x12\x32\n\x06status\x18\x04 \x01(\x0e\x32\".cosmos.staking.v1beta1.BondStatus\x12\x0e\n\x06tokens\x18\x05 \x01(\t\x12\x18\n\x10\x64\x65legator_shares\x18\x06 \x01(\t\x12\x38\n\x0b\x64\x65scription\x18\x07 \x01(\x0b\x32#.cosmos.staking.v1beta1.Description\x12\x18\n\x10unbonding_height\x18\x08 \x01(\x03\x12\x1b\n\x13min_self_delegation\x18\x0b \x01(\t\"/\n\x15QueryValidatorRequest\x12\x16\n\x0evalidator_addr\x18\x01 \x01(\t\"N\n\x16QueryValidatorResponse\x12\x34\n\tvalidator\x18\x01 \x01(\x0b\x32!.cosmos.staking.v1beta1.Validator*v\n\nBondStatus\x12\x1b\n\x17\x42OND_STATUS_UNSPECIFIED\x10\x00\x12\x18\n\x14\x42OND_STATUS_UNBONDED\x10\x01\x12\x19\n\x15\x42OND_STATUS_UNBONDING\x10\x02\x12\x16\n\x12\x42OND_STATUS_BONDED\x10\x03\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'chain.proto.staking_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _globals['_BONDSTATUS']._serialized_start=555
+  _globals['_BONDSTATUS']._serialized_end=673
+  _globals['_DESCRIPTION']._serialized_start=53
+  _globals['_DESCRIPTION']._serialized_end=161
+  _globals['_VALIDATOR']._serialized_start=164
+  _globals['_VALIDATOR']._serialized_end=424
+  _globals['_QUERYVALIDATORREQUEST']._serialized_start=426
+  _globals['_QUERYVALIDATORREQUEST']._serialized_end=473
+  _globals['_QUERYVALIDATORRESPONSE']._serialized_start=475
+  _globals['_QUERYVALIDATORRESPONSE']._serialized_end=553
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,198 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional, Type
+
+from google.protobuf.message import Message
+
+from chain.proto.attestation_pb2 import QueryLastEventNonceRequest, QueryLastEventNonceResponse
+from chain.proto.bank_pb2 import QueryBalanceRequest, QueryBalanceResponse
+from chain.proto.multichain_pb2 import PageRequest, QueryAllContractConfigRequest, QueryAllContractConfigResponse
+from chain.proto.staking_pb2 import QueryValidatorRequest, QueryValidatorResponse
+from utils.http_client import get_http_client
+from utils.protobuf import to_dict
+from utils.tracing import KIND_CLIENT, span
+
+# Query services of the Router chain node. Their messages are generated from the subsets of the chain's
+# protos in `chain/proto`; responses are converted to the LCD's JSON so callers can use either transport.
+VALIDATOR_METHOD = '/cosmos.staking.v1beta1.Query/Validator'
+BALANCE_METHOD = '/cosmos.bank.v1beta1.Query/Balance'
+CONTRACT_CONFIG_METHOD = '/routerprotocol.routerchain.multichain.Query/ContractConfigAll'
+LAST_EVENT_NONCE_METHOD = '/routerprotocol.routerchain.attestation.Query/LastEventNonce'
+
+CONTRACT_CONFIG_PAGE_LIMIT = 1000
+
+# Status codes that point at the node rather than at the query, the gRPC counterpart of an HTTP 5xx
+SERVER_ERROR_CODES = {'CANCELLED', 'UNKNOWN', 'DEADLINE_EXCEEDED', 'RESOURCE_EXHAUSTED', 'INTERNAL', 'UNAVAILABLE', 'DATA_LOSS'}
+
+
+def is_server_error(error: Exception) -> bool:
+    """
+    True unless `error` is a `grpc.RpcError` whose status only rejects the query, e.g. `NOT_FOUND` or `INVALID_ARGUMENT`.
+    """
+    code = getattr(error, 'code', None)
+    if not callable(code):
+        return True
+    return getattr(code(), 'name', None) in SERVER_ERROR_CODES
+
+
+def get_contract_config_request(key: bytes) -> QueryAllContractConfigRequest:
+    return QueryAllContractConfigRequest(pagination=PageRequest(key=key, limit=CONTRACT_CONFIG_PAGE_LIMIT))
+
+
+class RouterGrpcClient:
+    """
+    Queries the Router chain node's gRPC services directly instead of through the LCD REST gateway.
+
+    All queries share one HTTP/2 channel, so any number of concurrent queries are multiplexed over a
+    single connection. Synchronous callers use a blocking channel; the sweep event loop gets its own
+    `grpc.aio` channel. Messages are the generated classes of `chain/proto`. `grpcio` is only imported
+    once a query is made.
+    """
+    def __init__(self, target: str, tls: bool = False, timeout: float = 10, max_message_bytes: int = 10 * 1024 * 1024):
+        """
+        :param target: Node gRPC address, e.g. `localhost:9090`.
+        :param tls: Use a TLS channel with the system root certificates.
+        :param timeout: Deadline in seconds of a single query.
+        :param max_message_bytes: Largest response accepted.
+        """
+        self.target = target
+        self.tls = tls
+        self.timeout = timeout
+        self.max_message_bytes = max_message_bytes
+        self._channel = None
+        self._aio_channels = {}
+        self._lock = threading.Lock()
+
+    @property
+    def host(self) -> str:
+        return f"grpc://{self.target}"
+
+    def get_options(self):
+        return [
+            ('grpc.max_receive_message_length', self.max_message_bytes),
+            ('grpc.keepalive_time_ms', 30000),
+            ('grpc.keepalive_permit_without_calls', 1),
+            ('grpc.http2.max_pings_without_data', 0)
+        ]
+
+    def create_channel(self, module):
+        """
+        :param module: `grpc` or `grpc.aio`.
+        """
+        if self.tls:
+            import grpc
+            return module.secure_channel(self.target, grpc.ssl_channel_credentials(), options=self.get_options())
+        return module.insecure_channel(self.target, options=self.get_options())
+
+    def get_channel(self):
+        if self._channel is None:
+            with self._lock:
+                if self._channel is None:
+                    import grpc
+                    self._channel = self.create_channel(grpc)
+        return self._channel
+
+    def get_aio_channel(self):
+        # A grpc.aio channel is bound to the event loop it was created in
+        loop = asyncio.get_event_loop()
+        channel = self._aio_channels.get(loop)
+        if channel is None:
+            from grpc import aio
+            channel = self._aio_channels[loop] = self.create_channel(aio)
+        return channel
+
+    def call(self, method: str, request: Message, response_type: Type[Message]) -> Dict[str, Any]:
+        with span(f"gRPC {method}", KIND_CLIENT, **{'rpc.system': 'grpc', 'rpc.method': method, 'server.address': self.target}):
+            started = time.monotonic()
+            try:
+                response = self.get_channel().unary_unary(method)(request.SerializeToString(), timeout=self.timeout)
+            except Exception:
+                get_http_client().record(self.host, time.monotonic() - started, error=True)
+                raise
+            get_http_client().record(self.host, time.monotonic() - started)
+            return to_dict(response_type.FromString(response))
+
+    async def call_async(self, method: str, request: Message, response_type: Type[Message]) -> Dict[str, Any]:
+        with span(f"gRPC {method}", KIND_CLIENT, **{'rpc.system': 'grpc', 'rpc.method': method, 'server.address': self.target}):
+            started = time.monotonic()
+            try:
+                response = await self.get_aio_channel().unary_unary(method)(request.SerializeToString(), timeout=self.timeout)
+            except Exception:
+                get_http_client().record(self.host, time.monotonic() - started, error=True)
+                raise
+            get_http_client().record(self.host, time.monotonic() - started)
+            return to_dict(response_type.FromString(response))
+
+    def get_validator(self, operator_address: str) -> Dict[str, Any]:
+        """
+        :return: The validator in the LCD's `/cosmos/staking/v1beta1/validators/{address}` shape.
+        """
+        return self.call(VALIDATOR_METHOD, QueryValidatorRequest(validator_addr=operator_address), QueryValidatorResponse)
+
+    def get_balance(self, address: str, denom: str) -> int:
+        """
+        :return: The balance of one denom in base units.
+        """
+        response = self.call(BALANCE_METHOD, QueryBalanceRequest(address=address, denom=denom), QueryBalanceResponse)
+        return int(response['balance']['amount'] or 0)
+
+    def get_contract_config(self) -> Dict[str, Any]:
+        """
+        :return: Every page of the multichain contract config, in the LCD's `contract_config` shape.
+        """
+        contract_config = []
+        key = b''
+        while True:
+            response = self.call(CONTRACT_CONFIG_METHOD, get_contract_config_request(key), QueryAllContractConfigResponse)
+            contract_config.extend(response['contractConfig'])
+            key = response['pagination']['next_key']
+            if not key:
+                return {'contractConfig': contract_config}
+
+    async def get_contract_config_async(self) -> Dict[str, Any]:
+        contract_config = []
+        key = b''
+        while True:
+            response = await self.call_async(CONTRACT_CONFIG_METHOD, get_contract_config_request(key), QueryAllContractConfigResponse)
+            contract_config.extend(response['contractConfig'])
+            key = response['pagination']['next_key']
+            if not key:
+                return {'contractConfig': contract_config}
+
+    def get_last_event_nonce(self, chain_id: str, contract_address: str, validator_address: str) -> Dict[str, Any]:
+        """
+        :return: `{'eventNonce': ...}`, as the LCD's `last_event_nonce` route.
+        """
+        request = QueryLastEventNonceRequest(chainId=chain_id, contract=contract_address, validator=validator_address)
+        return self.call(LAST_EVENT_NONCE_METHOD, request, QueryLastEventNonceResponse)
+
+    async def get_last_event_nonce_async(self, chain_id: str, contract_address: str, validator_address: str) -> Dict[str, Any]:
+        request = QueryLastEventNonceRequest(chainId=chain_id, contract=contract_address, validator=validator_address)
+        return await self.call_async(LAST_EVENT_NONCE_METHOD, request, QueryLastEventNonceResponse)
+
+    def close(self) -> None:
+        if self._channel is not None:
+            self._channel.close()
+            self._channel = None
+
+
+_client: Optional[RouterGrpcClient] = None
+
+
+def configure_router_grpc(target: str = '', **kwargs) -> Optional[RouterGrpcClient]:
+    """
+    Route Router chain queries through the node's gRPC services at `target`, or back through the LCD when it is empty.
+    """
+    global _client
+    previous, _client = _client, RouterGrpcClient(target, **kwargs) if target else None
+    if previous is not None:
+        previous.close()
+    return _client
+
+
+def get_router_grpc() -> Optional[RouterGrpcClient]:
+    """
+    :return: The shared gRPC query client, or None when queries go through the LCD.
+    """
+    return _client
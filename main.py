@@ -1,134 +1,667 @@
-import json
 import os
+import sys
+import atexit
+import signal
 import logging
 import argparse
-from typing import List, Dict, Any
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Tuple
 import schedule
 import time
-from flask import Flask, jsonify
-from threading import Thread
+from flask import Flask, Response, jsonify, request
+from threading import Lock, Thread
 
 from orchestrator.missing_nonce import MissingNonceOrchestrator
-from alert import send_pagerduty_alert
+from orchestrator.results import NonceResult, count_by, group_by, select_behind, select_failed, select_ok, to_dicts
+from orchestrator.async_sweep import AsyncNonceSweeper
+from orchestrator.attestation_stream import DEFAULT_EVENT_TYPE, DEFAULT_QUERY, TendermintAttestationStream
+from orchestrator.sharding import ShardCoordinator, create_worker_app
+from alert import AlertDispatcher
 from orchestrator.health_check import validate_orchestrator_health
 from utils.read_config import ConfigManager
+from utils.file_watcher import FileWatcher
+from utils.http_client import configure_http_client, get_http_client
+from utils.tracing import configure_tracer, span
+from utils.profiler import SamplingProfiler
+from utils.snapshot import SnapshotStore
+from utils.adaptive_scheduler import AdaptiveScheduler
+from utils.timeseries import HistoryStore
+from utils.broadcast import ResultBroadcaster
+from utils.metrics import DIFF_NONCES, NONCE_READ_FAILURES, REGISTRY, VALIDATOR_JAILED, WALLET_BALANCE, WALLET_BALANCE_ROUTE
 from orchestrator.get_validator_info import ValidatorInfo
-from chain.balance_check import AccountBalanceFetcher
+from orchestrator.fleet import load_balance_checks, load_validator_targets
+from chain.balance_check import DEFAULT_DENOM, BalanceMonitor
+from chain.router_grpc import configure_router_grpc
 
 app = Flask(__name__)
 
+def get_http_options(config_manager: ConfigManager) -> Dict[str, Any]:
+    return dict(
+        connect_timeout=float(config_manager.read_config("settings.http_connect_timeout_seconds", "3.05")),
+        read_timeout=float(config_manager.read_config("settings.http_read_timeout_seconds", "10")),
+        max_retries=int(config_manager.read_config("settings.http_max_retries", "2")),
+        max_response_bytes=int(config_manager.read_config("settings.http_max_response_bytes", str(10 * 1024 * 1024)))
+    )
+
+def configure_http(config_manager: ConfigManager) -> None:
+    configure_http_client(**get_http_options(config_manager))
+
+def configure_router_query(config_manager: ConfigManager) -> None:
+    # Router chain queries go through the LCD unless the node's gRPC services are selected
+    if str(config_manager.read_config("settings.router_chain_query", "lcd")).lower() != "grpc":
+        configure_router_grpc("")
+        return
+    target = config_manager.read_config("settings.router_chain_grpc_url", "")
+    if not target:
+        logging.error("router_chain_query is grpc but router_chain_grpc_url is not set, querying the LCD instead")
+    configure_router_grpc(
+        target,
+        tls=bool(config_manager.read_config("settings.router_chain_grpc_tls", False)),
+        timeout=float(config_manager.read_config("settings.router_chain_grpc_timeout_seconds", "10")),
+        max_message_bytes=int(config_manager.read_config("settings.http_max_response_bytes", str(10 * 1024 * 1024)))
+    )
+
+def configure_tracing(config_manager: ConfigManager, suffix: str = "") -> None:
+    path = config_manager.read_config("settings.tracing.path", "")
+    configure_tracer(
+        path=path + suffix if path else "",
+        sample_rate=float(config_manager.read_config("settings.tracing.sample_rate", "1")),
+        max_file_bytes=int(config_manager.read_config("settings.tracing.max_file_bytes", str(100 * 1024 * 1024)))
+    )
+
+def get_sweep_options(config_manager: ConfigManager) -> Dict[str, Any]:
+    return dict(
+        concurrency=int(config_manager.read_config("settings.sweep_concurrency", "32")),
+        timeout=float(config_manager.read_config("settings.sweep_timeout_seconds", "10")),
+        include_block_number=bool(config_manager.read_config("settings.rpc_batch_block_number", True))
+    )
+
+def create_nonce_sweeper(config_manager: ConfigManager) -> AsyncNonceSweeper:
+    return AsyncNonceSweeper(MissingNonceOrchestrator(config_manager), **get_sweep_options(config_manager))
+
+def get_validator_aliases(targets) -> Dict[str, str]:
+    # Votes may be signed by the orchestrator or validator account; the index is keyed by operator address
+    aliases = {}
+    for target in targets:
+        aliases[target.orchestrator_address] = target.operator_address
+        aliases[target.validator_address] = target.operator_address
+    return aliases
+
+def start_attestation_stream(config_manager: ConfigManager, nonce_sweeper: AsyncNonceSweeper, targets) -> Optional[TendermintAttestationStream]:
+    # Feeds the index of the process doing the last_event_nonce lookups, i.e. of each shard worker when sharded
+    index = nonce_sweeper.orchestrator.attestation_index
+    if index is None:
+        return None
+    attestation_stream = TendermintAttestationStream(
+        config_manager.read_config("settings.attestation_stream.ws_url", ""),
+        index,
+        query=config_manager.read_config("settings.attestation_stream.query", DEFAULT_QUERY),
+        event_type=config_manager.read_config("settings.attestation_stream.event_type", DEFAULT_EVENT_TYPE),
+        attributes=config_manager.read_config("settings.attestation_stream.attributes", {}),
+        validator_aliases=get_validator_aliases(targets)
+    )
+    attestation_stream.start(nonce_sweeper.get_loop())
+    return attestation_stream
+
+def exit_with_parent(parent_pid: int) -> None:
+    # A local shard worker must not outlive its coordinator, which may not get to stop it (e.g. SIGKILL)
+    while os.getppid() == parent_pid:
+        time.sleep(2)
+    logging.info("Shard coordinator exited, stopping worker")
+    os._exit(0)
+
+# config.yml keys that are only read at startup
+RESTART_KEYS = (
+    "settings.scheduler.mode", "settings.scheduler.max_workers", "settings.attestation_stream",
+    "settings.sharding", "settings.chain_adapters", "settings.history_db_path", "settings.environment",
+    "settings.router_chain_query", "settings.router_chain_grpc_url", "settings.router_chain_grpc_tls",
+    "settings.router_chain_grpc_timeout_seconds"
+)
+TARGET_KEYS = (
+    "settings.validators", "settings.validator_address", "settings.orchestrator_address",
+    "settings.operator_address", "settings.min_wallet_balance", "settings.orchestrator_health_endpoint",
+    "settings.balance_checks"
+)
+
+def matches(changed, prefixes) -> bool:
+    return any(key == prefix or key.startswith(prefix + ".") for key in changed for prefix in prefixes)
+
+def apply_sweep_config(config_manager: ConfigManager, nonce_sweeper: AsyncNonceSweeper, changed, trace_suffix: str = "") -> None:
+    # Settings of the chain sweep, applied in place by the monitor and by every shard worker
+    if matches(changed, ("settings.tracing",)):
+        configure_tracing(config_manager, trace_suffix)
+    if matches(changed, ("settings.http_connect_timeout_seconds", "settings.http_read_timeout_seconds",
+                         "settings.http_max_retries", "settings.http_max_response_bytes")):
+        http_client = get_http_client()
+        for name, value in get_http_options(config_manager).items():
+            setattr(http_client, name, value)
+    nonce_sweeper.reconfigure(**get_sweep_options(config_manager))
+    nonce_sweeper.orchestrator.apply_config()
+
+def watch_worker_config(config_manager: ConfigManager, nonce_sweeper: AsyncNonceSweeper,
+                        attestation_stream: Optional[TendermintAttestationStream], trace_suffix: str) -> None:
+    """
+    Apply config.yml changes to a shard worker in place, as `OrchestratorValidator.reload_config` does for the monitor.
+    chainInfos.json is re-read by the sweeper on its next snapshot.
+    """
+    if not config_manager.read_config("settings.config_reload", True):
+        return
+
+    def reload(path: str) -> None:
+        changed = config_manager.reload()
+        if not changed:
+            return
+        print(f"Reloaded {path}: {', '.join(sorted(changed))}")
+        restart = sorted(key for key in changed if matches([key], RESTART_KEYS))
+        if restart:
+            logging.warning(f"Restart required to apply {', '.join(restart)}")
+        apply_sweep_config(config_manager, nonce_sweeper, changed, trace_suffix)
+        if attestation_stream is not None and matches(changed, TARGET_KEYS):
+            attestation_stream.validator_aliases = get_validator_aliases(load_validator_targets(config_manager))
+
+    FileWatcher([config_manager.config_file_path], reload,
+                poll_interval=float(config_manager.read_config("settings.config_poll_seconds", "5"))).start()
+
 class OrchestratorValidator:
-    def __init__(self, config_file_path: str):
+    def __init__(self, config_file_path: str, profile: bool = False):
         self.config_manager = ConfigManager(config_file_path)
+        configure_http(self.config_manager)
+        configure_router_query(self.config_manager)
+        configure_tracing(self.config_manager)
+        self.profile_sweeps = profile
+        self.profile_lock = Lock()
+        # Samples of every profiled sweep, rewritten to one file after each sweep
+        self.sweep_profile = SamplingProfiler()
         self.pager_duty_routing = self.config_manager.read_config("settings.pager_duty_routing", "")
-        self.orchestrator_health_endpoint = self.config_manager.read_config("settings.orchestrator_health_endpoint", "")
+        self.alerts = AlertDispatcher(
+            self.pager_duty_routing,
+            repeat_interval=float(self.config_manager.read_config("settings.alert_repeat_interval_seconds", "3600")),
+            batch_window=float(self.config_manager.read_config("settings.alert_batch_window_seconds", "1"))
+        )
         self.schedule_interval_seconds = int(self.config_manager.read_config("settings.schedule_interval_seconds", "-1"))
+        self.schedule_job = None
         lcd_url=self.config_manager.read_config("settings.router_chain_lcd_url", "")
-        self.operator_address=self.config_manager.read_config('settings.operator_address', '')
-        self.missing_nonce_orchestrator = MissingNonceOrchestrator(self.config_manager)
+        self.nonce_sweeper = create_nonce_sweeper(self.config_manager)
+        self.missing_nonce_orchestrator = self.nonce_sweeper.orchestrator
         self.validator_info = ValidatorInfo(lcd_url)
+        self.targets = load_validator_targets(self.config_manager)
+        self.balance_monitor = BalanceMonitor(
+            lcd_url,
+            load_balance_checks(self.config_manager, self.targets),
+            max_ttl=float(self.config_manager.read_config("settings.balance_cache_max_seconds", "300")),
+            max_workers=int(self.config_manager.read_config("settings.balance_concurrency", "8"))
+        )
+        self.health_snapshot = SnapshotStore()
+        self.broadcaster = ResultBroadcaster(int(self.config_manager.read_config("settings.stream_buffer_size", "1024")))
+        self.nonce_sweeper.result_listeners.append(self.broadcaster.publish)
+        # With sharding the chains are checked by worker processes or instances and merged here
+        self.shard_coordinator = None
+        self.chain_sweeper = self.nonce_sweeper
+        worker_urls = self.config_manager.read_config("settings.sharding.worker_urls", [])
+        worker_count = int(self.config_manager.read_config("settings.sharding.workers", "0"))
+        shard_options = dict(
+            request_timeout=float(self.config_manager.read_config("settings.sharding.request_timeout_seconds",
+                                                                  self.missing_nonce_orchestrator.sweep_deadline_seconds + 10)),
+            retry_dead_seconds=float(self.config_manager.read_config("settings.sharding.retry_dead_seconds", "30")),
+            startup_timeout=float(self.config_manager.read_config("settings.sharding.startup_timeout_seconds", "30"))
+        )
+        if worker_urls:
+            self.shard_coordinator = ShardCoordinator(self.nonce_sweeper, worker_urls, **shard_options)
+        elif worker_count > 0:
+            self.shard_coordinator = ShardCoordinator.spawn_local(
+                self.nonce_sweeper, os.path.abspath(__file__), config_file_path, worker_count,
+                int(self.config_manager.read_config("settings.sharding.base_port", "5101")), **shard_options)
+        self.attestation_stream = None
+        if self.shard_coordinator is not None:
+            self.chain_sweeper = self.shard_coordinator
+            # Workers would otherwise keep running, and holding their ports, after the coordinator exits
+            atexit.register(self.shard_coordinator.stop)
+        else:
+            # Shard workers run their own stream
+            self.attestation_stream = start_attestation_stream(self.config_manager, self.nonce_sweeper, self.targets)
+        history_db_path = self.config_manager.read_config("settings.history_db_path", "")
+        self.history = None
+        if history_db_path:
+            self.history = HistoryStore(
+                history_db_path,
+                raw_retention_seconds=int(self.config_manager.read_config("settings.history_raw_retention_seconds", 2 * 86400)),
+                downsample_seconds=int(self.config_manager.read_config("settings.history_downsample_seconds", 300)),
+                retention_seconds=int(self.config_manager.read_config("settings.history_retention_seconds", 30 * 86400)))
+
+        # In adaptive mode every chain is polled on its own cadence and the scheduled sweep
+        # only evaluates the latest per-chain results
+        self.chain_results = {}
+        self.chain_scheduler = None
+        if self.config_manager.read_config("settings.scheduler.mode", "interval") == "adaptive":
+            self.chain_scheduler = AdaptiveScheduler(
+                self.poll_chain,
+                min_interval=float(self.config_manager.read_config("settings.scheduler.min_interval_seconds", "2")),
+                max_interval=float(self.config_manager.read_config("settings.scheduler.max_interval_seconds", "60")),
+                max_workers=int(self.config_manager.read_config("settings.scheduler.max_workers", "8"))
+            )
+
+    def reload_config(self, path: str) -> None:
+        """
+        Apply a changed config.yml or chainInfos.json without restarting.
 
-        self.validator_address=self.config_manager.read_config('settings.validator_address', '')
-        self.orchestrator_address=self.config_manager.read_config('settings.orchestrator_address', '')
-        min_balance=self.config_manager.read_config('settings.min_wallet_balance', "4ROUTE")
-        self.balance_fetcher = AccountBalanceFetcher(lcd_url,min_balance, self.validator_address, self.orchestrator_address)
+        Settings are applied in place, so pooled connections, cached contract config, remembered
+        nonces, RPC scores, circuit states, balance caches and per-chain cadences all survive.
+        """
+        if os.path.abspath(path) != os.path.abspath(self.config_manager.config_file_path):
+            # chainInfos.json is re-read by the sweeper on its next snapshot; new or changed chains are polled right away
+            previous = self.missing_nonce_orchestrator.config_cache.snapshot
+            previous_infos = dict(previous.chain_infos) if previous is not None else {}
+            keys = self.get_chain_keys()
+            snapshot = self.nonce_sweeper.get_config_snapshot_sync()
+            changed = {chain_id for chain_id in snapshot.chain_infos if snapshot.chain_infos[chain_id] != previous_infos.get(chain_id)} if snapshot else set()
+            print(f"Reloaded {path}: {len(changed)} chain(s) added or changed")
+            if self.chain_scheduler is not None:
+                self.chain_scheduler.set_keys(keys)
+                self.chain_scheduler.reset(chain_id for chain_id in keys if chain_id in changed)
+            return
+        changed = self.config_manager.reload()
+        if not changed:
+            return
+        print(f"Reloaded {path}: {', '.join(sorted(changed))}")
+        restart = sorted(key for key in changed if matches([key], RESTART_KEYS))
+        if restart:
+            logging.warning(f"Restart required to apply {', '.join(restart)}")
+        apply_sweep_config(self.config_manager, self.nonce_sweeper, changed)
+        lcd_url = self.config_manager.read_config("settings.router_chain_lcd_url", "")
+        if lcd_url != self.validator_info.lcd_url:
+            self.validator_info.lcd_url = lcd_url
+            self.validator_info.vals_info = {}
+            self.balance_monitor.lcd_url = lcd_url
+        if matches(changed, TARGET_KEYS):
+            self.targets = load_validator_targets(self.config_manager)
+            self.balance_monitor.set_checks(load_balance_checks(self.config_manager, self.targets))
+            if self.attestation_stream is not None:
+                self.attestation_stream.validator_aliases = get_validator_aliases(self.targets)
+        self.balance_monitor.max_ttl = float(self.config_manager.read_config("settings.balance_cache_max_seconds", "300"))
+        self.pager_duty_routing = self.config_manager.read_config("settings.pager_duty_routing", "")
+        self.alerts.routing_key = self.pager_duty_routing
+        self.alerts.repeat_interval = float(self.config_manager.read_config("settings.alert_repeat_interval_seconds", "3600"))
+        self.alerts.batch_window = float(self.config_manager.read_config("settings.alert_batch_window_seconds", "1"))
+        if "settings.stream_buffer_size" in changed:
+            self.broadcaster.resize(int(self.config_manager.read_config("settings.stream_buffer_size", "1024")))
+        if self.history is not None:
+            self.history.raw_retention_seconds = int(self.config_manager.read_config("settings.history_raw_retention_seconds", 2 * 86400))
+            self.history.downsample_seconds = int(self.config_manager.read_config("settings.history_downsample_seconds", 300))
+            self.history.retention_seconds = int(self.config_manager.read_config("settings.history_retention_seconds", 30 * 86400))
+        if self.chain_scheduler is not None:
+            self.chain_scheduler.reconfigure(
+                float(self.config_manager.read_config("settings.scheduler.min_interval_seconds", "2")),
+                float(self.config_manager.read_config("settings.scheduler.max_interval_seconds", "60"))
+            )
+        schedule_interval_seconds = int(self.config_manager.read_config("settings.schedule_interval_seconds", "-1"))
+        if schedule_interval_seconds != self.schedule_interval_seconds:
+            self.schedule_interval_seconds = schedule_interval_seconds
+            if self.schedule_job is not None and schedule_interval_seconds > 0:
+                schedule.cancel_job(self.schedule_job)
+                self.schedule_job = schedule.every(schedule_interval_seconds).seconds.do(self.validate_pending_nonce)
+                print(f"Rescheduled validator with interval {schedule_interval_seconds} seconds")
 
-    def get_filtered_results(self, result_json):
-        return [r for r in result_json if isinstance(r, dict) and r.get('diff_nonces', 0) > 0]
+    def watch_config(self) -> None:
+        if not self.config_manager.read_config("settings.config_reload", True):
+            return
+        watcher = FileWatcher(
+            [self.config_manager.config_file_path, MissingNonceOrchestrator.CWD + MissingNonceOrchestrator.CHAIN_CONFIG],
+            self.reload_config,
+            poll_interval=float(self.config_manager.read_config("settings.config_poll_seconds", "5"))
+        )
+        watcher.start()
+
+    def get_profile_dir(self) -> str:
+        return self.config_manager.read_config("settings.profiling.dir", "./profiles")
+
+    def get_profile_interval(self) -> float:
+        return float(self.config_manager.read_config("settings.profiling.interval_ms", "10")) / 1000
+
+    def is_profile_route_enabled(self) -> bool:
+        return self.profile_sweeps or bool(self.config_manager.read_config("settings.profiling.route", False))
+
+    @contextmanager
+    def profile_sweep(self):
+        """
+        With `--profile`, sample the stacks of every thread during the enclosed sweep and add them to `sweeps.folded`,
+        the flamegraph input file of all sweeps since startup.
+        """
+        if not self.profile_sweeps or not self.profile_lock.acquire(blocking=False):
+            yield
+            return
+        profiler = SamplingProfiler(self.get_profile_interval())
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            self.sweep_profile.merge(profiler)
+            self.profile_lock.release()
+            path = self.sweep_profile.write(self.get_profile_dir(), "sweeps", timestamped=False)
+            if path:
+                print(f"Added {profiler.sample_count} sweep samples to {path} ({self.sweep_profile.sample_count} in total)")
+
+    def profile_live(self, seconds: float) -> Optional[Tuple[SamplingProfiler, Optional[str]]]:
+        """
+        Sample the stacks of every thread for a number of seconds, capped at `profiling.max_seconds`.
+
+        :return: The profiler and the file its folded stacks were written to, or None while another profile is being captured.
+        """
+        if not self.profile_lock.acquire(blocking=False):
+            return None
+        try:
+            profiler = SamplingProfiler(self.get_profile_interval())
+            profiler.start()
+            time.sleep(min(max(seconds, 0.1), float(self.config_manager.read_config("settings.profiling.max_seconds", "120"))))
+            profiler.stop()
+        finally:
+            self.profile_lock.release()
+        return profiler, profiler.write(self.get_profile_dir(), "live")
+
+    def get_filtered_results(self, results: List[NonceResult]) -> List[NonceResult]:
+        return select_behind(results)
+
+    def get_failed_results(self, results: List[NonceResult]) -> List[NonceResult]:
+        return select_failed(results)
 
     def send_alert(self, title: str, result: List[Dict[str, Any]]) -> None:
-        # print(f"Alert: {title} - {json.dumps(result)}")
-        if self.pager_duty_routing:
-            send_pagerduty_alert(self.pager_duty_routing, title, json.dumps(result))
-            logging.info("Alert sent: %s", title)
-        else:
-            logging.warning("PAGER_DUTY_ROUTING is not configured. Alert not sent.")
+        # Only enqueues; the dispatcher worker does the network I/O
+        self.alerts.send(title, result)
 
     def validate_orchestrator_health_endpoints(self) -> None:
-        if not self.orchestrator_health_endpoint:
-            logging.warning("ORCHESTRATOR_HEALTH_ENDPOINT is not configured. Skipping health check.")
-            return
-        orch_health = validate_orchestrator_health(self.orchestrator_health_endpoint)
-        if orch_health:
-            alert_title = f"Orchestrator Health Alert. {len(orch_health)} RPCs are unhealthy."
-            self.send_alert(alert_title, orch_health)
-            logging.info("orch_health: %s", orch_health)
-        else:
-            logging.info("No unhealthy RPCs found or ORCHESTRATOR_HEALTH_ENDPOINT is not configured.")
+        for target in self.targets:
+            if not target.orchestrator_health_endpoint:
+                logging.warning("ORCHESTRATOR_HEALTH_ENDPOINT is not configured for %s. Skipping health check.", target.operator_address)
+                continue
+            orch_health = validate_orchestrator_health(target.orchestrator_health_endpoint)
+            if orch_health:
+                alert_title = f"Orchestrator Health Alert. {len(orch_health)} RPCs are unhealthy."
+                self.send_alert(alert_title, orch_health)
+                logging.info("orch_health: %s", orch_health)
+            else:
+                logging.info("No unhealthy RPCs found or ORCHESTRATOR_HEALTH_ENDPOINT is not configured.")
 
-    def validate_pending_nonce(self) -> None:
-        val_info=self.validator_info.get_validator_info(self.operator_address)
-        
-        # Validate validator health
-        validator_health=self.validator_info.validate_info(val_info)
-        if not validator_health.get('isHealthy', False):
-            title = f"Validator Health Alert - {validator_health.get('moniker', '')} is unhealthy"
-            self.send_alert(title, [validator_health])
-
-        # Validate orchestrator health
-        for source in ["GATEWAY", "VOYAGER"]:
-            result = self.missing_nonce_orchestrator.get_orchestrators_by_pending_nonce(val_info, source)
-            if not result:
-                logging.error(f"Failed to get orchestrators by pending nonce for {source}.")
+    def get_validator_infos(self) -> List[Any]:
+        return [self.validator_info.get_validator_info(target.operator_address) for target in self.targets]
+
+    def validate_balances(self, checked, firing) -> None:
+        for result in self.balance_monitor.check_all():
+            check = result.check
+            if result.balance is None:
+                # A failed lookup neither fires nor resolves its alert
                 continue
-            result_json = json.loads(result)
-            filtered_result = self.get_filtered_results(result_json)
-
-            if filtered_result:
-                title = f"{source} Orchestrator Alert - nonce behind for {len(filtered_result)} chains"
-                self.send_alert(title, filtered_result)
-        
-        balance_results = self.balance_fetcher.validate_balances()
-        isValidatorBalanceLow = balance_results.get('isValidatorBalanceLow', False)
-        isOrchestratorBalanceLow = balance_results.get('isOrchestratorBalanceLow', False)
-        if isValidatorBalanceLow:
-            validator_balance = balance_results.get('validator_balance', 0)
-            title = f"Validator Balance Alert - Validator balance is {validator_balance} for {self.validator_address}"
-            self.send_alert(title, [validator_balance])
-        if isOrchestratorBalanceLow:
-            orchestrator_balance = balance_results.get('orchestrator_balance', 0)
-            title = f"Orchestrator Balance Alert - Orchestrator balance is {orchestrator_balance} for {self.orchestrator_address}"
-            self.send_alert(title, [orchestrator_balance])
-    
-    def check_health(self) -> Dict[str, Any]:
+            WALLET_BALANCE.set(result.balance, check.address, check.role, check.denom)
+            if check.denom == DEFAULT_DENOM:
+                WALLET_BALANCE_ROUTE.set(result.balance, check.address, check.role)
+            if self.history is not None and not result.cached:
+                self.history.record_balance(check.address, check.role, result.balance, denom=check.denom)
+            checked.add(check.alert_key)
+            if result.low:
+                role = check.role.capitalize()
+                denom = '' if check.denom == DEFAULT_DENOM else f" {check.denom}"
+                title = f"{role} Balance Alert - {role} balance is {result.balance}{denom} for {check.address}"
+                firing[check.alert_key] = (title, [result.balance])
+
+    def get_nonce_alert_key(self, result: NonceResult, source: str) -> str:
+        return f"nonce_behind:{result.validator_address}:{result.chain_id}:{source}"
+
+    def get_chain_contract_types(self) -> Dict[str, Tuple[str, ...]]:
+        snapshot = self.nonce_sweeper.get_config_snapshot_sync()
+        if snapshot is None:
+            return {}
+        contract_types = {}
+        for chain_id in snapshot.chain_infos:
+            gateway_address, voyager_address = snapshot.multi_chain_config[chain_id]
+            sources = tuple(source for source, address in (("GATEWAY", gateway_address), ("VOYAGER", voyager_address)) if address)
+            if sources:
+                contract_types[chain_id] = sources
+        return contract_types
+
+    def get_chain_keys(self) -> List[str]:
+        return list(self.get_chain_contract_types())
+
+    def poll_chain(self, chain_id: str) -> bool:
         """
-        Perform on-demand health check and nonce validation, returning the results.
+        Check the Gateway and Voyager nonces of one chain for all validators, in one batched read, and store the results.
+
+        :return: True if either on-chain nonce advanced since the previous poll (or on the first poll).
         """
-        health_results = {}
-        health_check = validate_orchestrator_health(self.orchestrator_health_endpoint)
-        if health_check:
-            health_results['orchestrator_health'] = health_check
-        else:
-            health_results['orchestrator_health'] = 'No unhealthy RPCs found or endpoint is not configured.'
-        
-        val_info=self.validator_info.get_validator_info(self.operator_address)
-        validator_health=self.validator_info.validate_info(val_info)
+        sources = self.get_chain_contract_types().get(chain_id)
+        if not sources:
+            return False
+        results = self.chain_sweeper.sweep(self.get_validator_infos(), sources, [chain_id])
+        if results is None:
+            return False
+        records = {source: results.get(source, []) for source in sources}
+        previous = self.chain_results.get(chain_id)
+        self.chain_results[chain_id] = records
+        if previous is None:
+            return True
+        return any(
+            {r.onchain_nonce for r in select_ok(source_records)} != {r.onchain_nonce for r in select_ok(previous.get(source, []))}
+            for source, source_records in records.items()
+        )
+
+    def collect_sweep_results(self, val_infos) -> Dict[str, List[Any]]:
+        if self.chain_scheduler is None:
+            return self.chain_sweeper.sweep(val_infos) or {}
+        keys = self.get_chain_keys()
+        self.chain_scheduler.set_keys(keys)
+        sweep_results = {"GATEWAY": [], "VOYAGER": []}
+        for chain_id in keys:
+            for source, records in self.chain_results.get(chain_id, {}).items():
+                sweep_results[source].extend(records)
+        for chain_id in set(self.chain_results) - set(keys):
+            self.chain_results.pop(chain_id, None)
+        return sweep_results
+
+    def validate_pending_nonce(self) -> None:
+        with self.profile_sweep(), span("validate_pending_nonce", validators=len(self.targets)):
+            val_infos = self.get_validator_infos()
+            # Dedup keys of every condition checked in this sweep, and the ones currently firing
+            checked = set()
+            firing = {}
+
+            # Validate validator health
+            validator_healths = [self.validator_info.validate_info(val_info) for val_info in val_infos]
+            for target, validator_health in zip(self.targets, validator_healths):
+                if validator_health is None:
+                    logging.error(f"Failed to get validator info for {target.operator_address}.")
+                    continue
+                VALIDATOR_JAILED.set(1 if validator_health.get('jailed') else 0, validator_health.get('moniker', ''))
+                dedup_key = f"validator_unhealthy:{target.operator_address}"
+                checked.add(dedup_key)
+                if not validator_health.get('isHealthy', False):
+                    title = f"Validator Health Alert - {validator_health.get('moniker', '')} is unhealthy"
+                    firing[dedup_key] = (title, [validator_health])
+
+            # Validate orchestrator health. On-chain nonces are read once and shared by all validators
+            sweep_results = self.collect_sweep_results(val_infos)
+            for source in ["GATEWAY", "VOYAGER"]:
+                results = sweep_results.get(source)
+                if not results:
+                    logging.error(f"Failed to get orchestrators by pending nonce for {source}.")
+                    continue
+                # Failed reads are neither checked nor recorded, so their alerts neither fire nor resolve
+                read_results = select_ok(results)
+                for r in read_results:
+                    DIFF_NONCES.set(r.diff_nonces, r.chain_id, source, r.moniker)
+                    checked.add(self.get_nonce_alert_key(r, source))
+                for (chain_id, status), count in count_by(self.get_failed_results(results), 'chain_id', 'status').items():
+                    NONCE_READ_FAILURES.inc(count, chain_id, source, status)
+                if self.history is not None:
+                    self.history.record_nonces(read_results, source)
+                filtered_result = self.get_filtered_results(results)
+
+                for moniker, moniker_result in group_by(filtered_result, 'moniker').items():
+                    for r in moniker_result:
+                        title = f"{source} Orchestrator Alert - {moniker} nonce behind on {r.chain_name} ({r.chain_id})"
+                        firing[self.get_nonce_alert_key(r, source)] = (title, r.to_dict())
+
+            with span("validate_balances", checks=len(self.balance_monitor.checks)):
+                self.validate_balances(checked, firing)
+            self.alerts.evaluate(checked, firing)
+
+            with span("orchestrator_health_endpoints", targets=len(self.targets)):
+                health_checks = [validate_orchestrator_health(target.orchestrator_health_endpoint) for target in self.targets]
+            self.health_snapshot.set(self.build_health_report(health_checks, validator_healths, sweep_results))
+
+    def build_health_report(self, health_checks, validator_healths, sweep_results) -> Dict[str, Any]:
         nonce_results = {}
+        nonce_errors = {}
         for source in ["GATEWAY", "VOYAGER"]:
-            result = self.missing_nonce_orchestrator.get_orchestrators_by_pending_nonce(val_info, source)
-            if result:
-                result_json = json.loads(result)
-                nonce_results[source] = self.get_filtered_results(result_json)
+            results = sweep_results.get(source)
+            if results:
+                nonce_results[source] = self.get_filtered_results(results)
+                nonce_errors[source] = self.get_failed_results(results)
             else:
                 nonce_results[source] = 'Failed to get data or none found.'
-        
+                nonce_errors[source] = []
+
+        # Records become dicts only here, at the HTTP edge
+        by_moniker = {
+            source: group_by(results, 'moniker') if isinstance(results, list) else results
+            for source, results in nonce_results.items()
+        }
+        errors_by_moniker = {source: group_by(results, 'moniker') for source, results in nonce_errors.items()}
         # health_check: response of /health endpoint from orchestrator
         # nonce_validation: Validates current nonce and last processed nonce from Router Chain
         # validator_health: Validates if the validator is jailed or not
+        validators = {}
+        for target, health_check, validator_health in zip(self.targets, health_checks, validator_healths):
+            moniker = (validator_health or {}).get('moniker') or target.operator_address
+            validators[moniker] = {
+                'orchestrator_health': {
+                    'health_check': health_check if health_check else 'No unhealthy RPCs found or endpoint is not configured.',
+                    'nonce_validation': {
+                        source: to_dicts(results.get(moniker, [])) if isinstance(results, dict) else results
+                        for source, results in by_moniker.items()
+                    },
+                    # Checks that could not be read: timeout, circuit_open, rpc_error or lcd_error
+                    'nonce_errors': {
+                        source: to_dicts(results.get(moniker, []))
+                        for source, results in errors_by_moniker.items()
+                    }
+                },
+                'validator_health': validator_health
+            }
 
+        if len(self.targets) == 1:
+            return dict(next(iter(validators.values())), validators=validators)
         return {
-            'orchestrator_health':{
-                'health_check': health_results["orchestrator_health"],
-                'nonce_validation': nonce_results
+            'orchestrator_health': {
+                'nonce_validation': {source: to_dicts(results) if isinstance(results, list) else results for source, results in nonce_results.items()},
+                'nonce_errors': {source: to_dicts(results) for source, results in nonce_errors.items()}
             },
-            'validator_health': validator_health
+            'validator_health': validator_healths,
+            'validators': validators
         }
 
+    def check_health(self) -> Dict[str, Any]:
+        """
+        Perform on-demand health check and nonce validation, returning the results.
+        """
+        health_checks = [validate_orchestrator_health(target.orchestrator_health_endpoint) for target in self.targets]
+        val_infos = self.get_validator_infos()
+        validator_healths = [self.validator_info.validate_info(val_info) for val_info in val_infos]
+        sweep_results = self.chain_sweeper.sweep(val_infos) or {}
+        return self.build_health_report(health_checks, validator_healths, sweep_results)
+
+    def get_history(self, args) -> Dict[str, Any]:
+        """
+        Query the sample history. Without `kind`, lists the recorded series.
+
+        :param args: `kind` (nonce|balance), `since` seconds or `start`/`end` unix seconds, and either
+                     `chain_id`, `contract_type`, `validator` (nonce) or `address`, `role` (balance).
+        :raises ValueError: On a non-integer `start`, `end` or `since`, or an unknown `kind`.
+        """
+        if self.history is None:
+            return {'error': 'history is not enabled, set settings.history_db_path'}
+        kind = args.get('kind')
+        if not kind:
+            return {'series': self.history.list_series()}
+        try:
+            end = int(args.get('end', time.time()))
+            start = int(args.get('start', end - int(args.get('since', 86400))))
+        except ValueError:
+            raise ValueError('start, end and since must be integer seconds')
+        if kind == 'nonce':
+            chain_id = args.get('chain_id', '')
+            snapshot = self.missing_nonce_orchestrator.config_cache.snapshot
+            buffer = snapshot.chain_infos.get(chain_id, {}).get('buffer', 0) if snapshot else 0
+            return self.history.nonce_history(chain_id, args.get('contract_type', 'GATEWAY'), args.get('validator', ''), start, end, buffer)
+        if kind == 'balance':
+            address = args.get('address', '')
+            role = args.get('role', 'validator')
+            denom = args.get('denom', DEFAULT_DENOM)
+            check = self.balance_monitor.get_check(address, role, denom)
+            return self.history.balance_history(address, role, start, end, check.min_balance if check else None, denom)
+        raise ValueError(f'unknown kind {kind}, expected nonce or balance')
+
+    def get_health(self, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Return the health report of the latest sweep with its generation time.
+
+        :param refresh: Run a fresh check first. Concurrent refreshes share one in-flight check.
+        :return: The report, or None while no check has completed yet.
+        """
+        report, generated_at = self.health_snapshot.get()
+        if refresh or report is None:
+            try:
+                report, generated_at = self.health_snapshot.refresh(self.check_health)
+            except Exception as e:
+                # The latest report, if any, is still served with its age
+                logging.error(f"Health check failed: {str(e)}")
+                report, generated_at = self.health_snapshot.get()
+        if report is None:
+            return None
+        report = dict(report, generated_at=generated_at, age_seconds=round(time.time() - generated_at, 3))
+        if self.shard_coordinator is not None:
+            report['shards'] = self.shard_coordinator.get_report()
+        return report
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/stream', methods=['GET'])
+def stream():
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    return Response(
+        validator.broadcaster.stream(last_event_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/history', methods=['GET'])
+def history():
+    try:
+        return jsonify(validator.get_history(request.args))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/debug/profile', methods=['GET'])
+def debug_profile():
+    if not validator.is_profile_route_enabled():
+        return jsonify({'error': 'profiling is disabled, start with --profile or set settings.profiling.route'}), 404
+    try:
+        seconds = float(request.args.get('seconds', '10'))
+    except ValueError:
+        return jsonify({'error': 'seconds must be a number'}), 400
+    captured = validator.profile_live(seconds)
+    if captured is None:
+        return jsonify({'error': 'a profile is already being captured'}), 409
+    profiler, path = captured
+    filename = os.path.basename(path) if path else "profile.folded"
+    return Response(profiler.render(), mimetype='text/plain', headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
 @app.route('/health', methods=['GET'])
 def check_health():
-    print("Checking health...")
-    results = validator.check_health()
-    return jsonify(results)
+    refresh = request.args.get('refresh', '').lower() in ('1', 'true', 'yes')
+    report = validator.get_health(refresh)
+    if report is None:
+        return jsonify({'error': 'no report yet, the first health check has not completed'}), 503
+    return jsonify(report)
 
 is_scheduler_running = False
 def schedule_validator(validator: OrchestratorValidator):
@@ -142,7 +675,11 @@ def schedule_validator(validator: OrchestratorValidator):
         logging.error("Invalid schedule interval. Cron job not scheduled")
         return
     print(f"Scheduling validator with interval {validator.schedule_interval_seconds} seconds...")
-    schedule.every(validator.schedule_interval_seconds).seconds.do(validator.validate_pending_nonce)
+    if validator.chain_scheduler is not None:
+        print("Polling chains on adaptive per-chain cadences...")
+        validator.chain_scheduler.set_keys(validator.get_chain_keys())
+        Thread(target=validator.chain_scheduler.run_forever, daemon=True).start()
+    validator.schedule_job = schedule.every(validator.schedule_interval_seconds).seconds.do(validator.validate_pending_nonce)
     is_scheduler_running = True
 
     while True:
@@ -155,8 +692,31 @@ if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     parser = argparse.ArgumentParser(description="Validate orchestrator health and pending nonces.")
     parser.add_argument('--config', type=str, help="Path to the JSON configuration file.", required=True)
+    parser.add_argument('--worker', action='store_true', help="Run as a shard worker that only checks the chains it is sent.")
+    parser.add_argument('--port', type=int, default=5000, help="Port to listen on.")
+    parser.add_argument('--parent-pid', type=int, help="Exit the shard worker when this process exits.")
+    parser.add_argument('--profile', action='store_true', help="Write a sampling profile of every sweep and enable /debug/profile.")
     args = parser.parse_args()
-    validator = OrchestratorValidator(args.config)
+    # Exit through atexit on SIGTERM too, so local shard workers are stopped
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    if args.worker:
+        config_manager = ConfigManager(args.config)
+        configure_http(config_manager)
+        configure_router_query(config_manager)
+        # Workers append to their own trace file next to the coordinator's
+        trace_suffix = f".worker-{args.port}"
+        configure_tracing(config_manager, trace_suffix)
+        if args.parent_pid:
+            Thread(target=exit_with_parent, args=(args.parent_pid,), daemon=True).start()
+        nonce_sweeper = create_nonce_sweeper(config_manager)
+        attestation_stream = start_attestation_stream(config_manager, nonce_sweeper, load_validator_targets(config_manager))
+        watch_worker_config(config_manager, nonce_sweeper, attestation_stream, trace_suffix)
+        logging.info(f"Starting shard worker on port {args.port}...")
+        create_worker_app(nonce_sweeper).run(host='0.0.0.0', port=args.port, threaded=True)
+        raise SystemExit(0)
+    validator = OrchestratorValidator(args.config, profile=args.profile)
     logging.info(f"Reading configuration from {args.config}...")
+    validator.watch_config()
     Thread(target=schedule_validator, args=(validator,), daemon=True).start()
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # The reloader would run a second coordinator that spawns its own workers
+    app.run(host='0.0.0.0', port=args.port, debug=True, use_reloader=validator.shard_coordinator is None)
@@ -0,0 +1,345 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import aiohttp
+
+from orchestrator.config_snapshot import ChainConfigSnapshot
+from orchestrator.missing_nonce import ContractType, MissingNonceOrchestrator, ReadStatus
+from orchestrator.chain_adapters import ChainAdapterRegistry, UnsupportedChainType, get_chain_type
+from orchestrator.nonce_reader import BLOCK_NUMBER
+from orchestrator.results import NonceResult
+from orchestrator.rpc_pool import get_rpc_urls
+from chain.router_grpc import get_router_grpc, is_server_error
+from utils.http_client import ResponseTooLarge, decode_json, get_http_client
+from utils.tracing import KIND_CLIENT, bind, span
+from utils.metrics import LCD_LAST_EVENT_NONCE_LATENCY, LCD_LOOKUPS_SKIPPED, RPC_NONCE_LATENCY, SWEEP_DURATION
+
+
+class AsyncNonceSweeper:
+    """
+    Runs every (chain, contract type) nonce check of a sweep in one asyncio event loop.
+
+    The loop lives in a dedicated daemon thread so the aiohttp session (and its
+    keep-alive connections) survive between sweeps. Callers stay synchronous.
+    """
+    def __init__(self, missing_nonce_orchestrator: MissingNonceOrchestrator, concurrency: int = 32, timeout: float = 10, include_block_number: bool = True):
+        """
+        :param missing_nonce_orchestrator: Orchestrator providing the LCD url and the config/result helpers.
+        :param concurrency: Maximum number of in-flight HTTP requests (RPC and LCD) during a sweep.
+        :param timeout: Total timeout in seconds for a single HTTP request.
+        :param include_block_number: Read `eth_blockNumber` in the same JSON-RPC batch as the nonces.
+        """
+        self.orchestrator = missing_nonce_orchestrator
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = float(timeout)
+        self.contract_registry = missing_nonce_orchestrator.contract_registry
+        self.chain_adapters = ChainAdapterRegistry(self.contract_registry, self.post_json, include_block_number, missing_nonce_orchestrator.rpc_pool)
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        self._session = None
+        self._semaphore = None
+        self._session_stale = False
+        # Called with (contract type, records) as soon as each chain of a sweep is done
+        self.result_listeners: List[Callable[[str, List[NonceResult]], Any]] = []
+
+    def publish_results(self, chain_results: Dict[str, List[NonceResult]]) -> None:
+        for listener in self.result_listeners:
+            for contract_type, records in chain_results.items():
+                try:
+                    listener(contract_type, records)
+                except Exception as e:
+                    print(f"Error publishing results: {str(e)}")
+
+    def publish_task_results(self, task: asyncio.Future) -> None:
+        if not task.cancelled() and task.exception() is None:
+            self.publish_results(task.result())
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="nonce-sweeper", daemon=True).start()
+            return self._loop
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Return the sweeper loop, for long running coroutines that share it.
+        """
+        return self._ensure_loop()
+
+    def run(self, coro):
+        """
+        Run a coroutine on the sweeper loop and block until it finishes.
+        """
+        return asyncio.run_coroutine_threadsafe(bind(coro), self._ensure_loop()).result()
+
+    def close(self) -> None:
+        """
+        Close the aiohttp session and its keep-alive connections.
+        """
+        if self._session is not None and not self._session.closed:
+            self.run(self._session.close())
+
+    def reconfigure(self, concurrency: int, timeout: float, include_block_number: bool) -> None:
+        """
+        Apply new sweep settings. The aiohttp session is only rebuilt when its limits changed.
+        """
+        concurrency = max(1, int(concurrency))
+        timeout = float(timeout)
+        if (concurrency, timeout) != (self.concurrency, self.timeout):
+            self.concurrency = concurrency
+            self.timeout = timeout
+            self._session_stale = True
+        self.chain_adapters.include_block_number = include_block_number
+        for reader in list(self.chain_adapters.readers.values()):
+            reader.include_block_number = include_block_number
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session_stale and self._session is not None:
+            # Requests still in flight on the old session get their full timeout before it closes
+            stale = self._session
+            asyncio.get_event_loop().call_later(stale.timeout.total or 0, lambda: asyncio.ensure_future(stale.close()))
+            self._session = None
+        self._session_stale = False
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def request_json(self, method: str, url: str, raise_for_status: bool = False, **kwargs) -> Any:
+        session = await self._get_session()
+        http_client = get_http_client()
+        host = http_client.get_host(url)
+        with span(f"HTTP {method}", KIND_CLIENT, **{'http.request.method': method, 'server.address': host}) as http_span:
+            async with self._semaphore:
+                started = time.monotonic()
+                try:
+                    async with session.request(method, url, **kwargs) as response:
+                        if http_span is not None:
+                            http_span.set_attribute('http.response.status_code', response.status)
+                        if raise_for_status:
+                            response.raise_for_status()
+                        body = await response.read()
+                        if len(body) > http_client.max_response_bytes:
+                            raise ResponseTooLarge(f"Response from {url} exceeds {http_client.max_response_bytes} bytes")
+                        result = decode_json(body)
+                except Exception:
+                    http_client.record(host, time.monotonic() - started, error=True)
+                    raise
+                http_client.record(host, time.monotonic() - started)
+                return result
+
+    async def fetch_json(self, url: str) -> Optional[Any]:
+        try:
+            return await self.request_json('GET', url)
+        except Exception as e:
+            print(f'Error fetching {url}: {str(e)}')
+            return None
+
+    async def post_json(self, url: str, payload: Any) -> Any:
+        return await self.request_json('POST', url, json=payload)
+
+    async def fetch_contract_config(self) -> Optional[Any]:
+        router_grpc = get_router_grpc()
+        if router_grpc is None:
+            return await self.fetch_json(self.orchestrator.config_cache.contract_config_url)
+        try:
+            return await router_grpc.get_contract_config_async()
+        except Exception as e:
+            print(f'Error fetching contract config from {router_grpc.target}: {str(e)}')
+            return None
+
+    async def fetch_last_event_nonce(self, endpoint: str, chain_id: str, contract_address: str, validator_address: str) -> Any:
+        """
+        Raises on any failed lookup; `is_host_error` tells a failing LCD or node from a rejected query.
+        """
+        router_grpc = get_router_grpc()
+        if router_grpc is None:
+            return await self.request_json('GET', self.orchestrator.get_last_event_nonce_uri(endpoint, chain_id, contract_address, validator_address), raise_for_status=True)
+        return await router_grpc.get_last_event_nonce_async(chain_id, contract_address, validator_address)
+
+    @staticmethod
+    def is_host_error(error: Exception) -> bool:
+        """
+        True for transport errors, timeouts and 5xx (or the gRPC equivalents), false for a 4xx that only
+        rejects this one query.
+        """
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status >= 500
+        return is_server_error(error)
+
+    async def process_contract(self, chain_id, name, chain_buffer_nonce, validator, endpoint, contract_type, contract_address, onchain_event_nonce, block_number=None) -> NonceResult:
+        with span("process_validator", chain_id=chain_id, contract_type=contract_type.value, validator=validator['operator_address']):
+            if onchain_event_nonce is None:
+                # Never compute a diff from a failed read
+                return self.orchestrator.build_failure(validator, chain_id, name, ReadStatus.RPC_ERROR, "on-chain nonce read failed")
+            nonce_gate = self.orchestrator.nonce_gate
+            attestation_index = self.orchestrator.attestation_index
+            last_executed_nonce = None
+            if nonce_gate is not None:
+                last_executed_nonce = nonce_gate.get(chain_id, contract_type.value, validator['operator_address'], onchain_event_nonce)
+            if last_executed_nonce is None and attestation_index is not None:
+                last_executed_nonce = attestation_index.get(chain_id, contract_address, validator['operator_address'])
+            if last_executed_nonce is None:
+                lcd_circuit = self.orchestrator.get_lcd_circuit(endpoint)
+                if not lcd_circuit.allow():
+                    return self.orchestrator.build_failure(validator, chain_id, name, ReadStatus.CIRCUIT_OPEN, "LCD circuit is open")
+                try:
+                    with LCD_LAST_EVENT_NONCE_LATENCY.time(chain_id, contract_type.value):
+                        last_executed_nonce_data = await self.fetch_last_event_nonce(endpoint, chain_id, contract_address, validator['operator_address'])
+                except Exception as e:
+                    print(f"Error fetching last_event_nonce of {validator['operator_address']} on {chain_id}: {str(e)}")
+                    if self.is_host_error(e):
+                        lcd_circuit.record_failure()
+                    else:
+                        # The host answered; only this check failed
+                        lcd_circuit.record_success()
+                    return self.orchestrator.build_failure(validator, chain_id, name, ReadStatus.LCD_ERROR, "last_event_nonce lookup failed")
+                lcd_circuit.record_success()
+                if not last_executed_nonce_data or 'eventNonce' not in last_executed_nonce_data:
+                    print("last_executed_nonce_data not found")
+                    return self.orchestrator.build_failure(validator, chain_id, name, ReadStatus.LCD_ERROR, "last_event_nonce lookup failed")
+                last_executed_nonce = int(last_executed_nonce_data['eventNonce'])
+                if nonce_gate is not None:
+                    nonce_gate.update(chain_id, contract_type.value, validator['operator_address'], onchain_event_nonce, last_executed_nonce)
+                if attestation_index is not None:
+                    attestation_index.reconcile(chain_id, contract_address, validator['operator_address'], last_executed_nonce)
+            else:
+                LCD_LOOKUPS_SKIPPED.inc()
+            return self.orchestrator.build_result(validator, chain_id, name, onchain_event_nonce, last_executed_nonce, chain_buffer_nonce, block_number)
+
+    async def process_chain(self, chain_id, chain_config, endpoint, validators, multi_chain_config, contract_types) -> Dict[str, List[Optional[NonceResult]]]:
+        with span("process_chain", chain_id=chain_id, chain_type=get_chain_type(chain_config), validators=len(validators)):
+            rpc_urls = get_rpc_urls(chain_config)
+            name = chain_config.get('name', 'NOT_FOUND')
+            chain_buffer_nonce = chain_config.get('buffer', 0)
+            contract_config = multi_chain_config.get(chain_id)
+            if not rpc_urls or not contract_config:
+                print(f"no rpc or contract config for chainId -> {chain_id}")
+                return {}
+            addresses = {
+                contract_type.value: contract_config[1] if contract_type == ContractType.VOYAGER else contract_config[0]
+                for contract_type in contract_types
+            }
+            targets = {contract_type: address for contract_type, address in addresses.items() if address}
+            if not targets:
+                print(f"no contract address for chainId -> {chain_id}")
+                return {}
+
+            try:
+                nonce_reader = self.chain_adapters.get(get_chain_type(chain_config))
+            except UnsupportedChainType as e:
+                print(f"{str(e)} for chainId -> {chain_id}")
+                return self.build_failures(chain_id, chain_config, validators, targets, ReadStatus.RPC_ERROR, str(e))
+            rpc_circuit = self.orchestrator.get_rpc_circuit(chain_id)
+            if not rpc_circuit.allow():
+                return self.build_failures(chain_id, chain_config, validators, targets, ReadStatus.CIRCUIT_OPEN, "RPC circuit is open")
+            # The on-chain nonces are read once and shared by every validator
+            try:
+                with RPC_NONCE_LATENCY.time(chain_id), span("read_onchain_nonces", chain_id=chain_id, contract_types=','.join(targets)):
+                    nonces = await nonce_reader.read(rpc_urls, targets)
+            except asyncio.CancelledError:
+                # Cut off by the sweep deadline
+                rpc_circuit.record_failure()
+                raise
+            if any(nonces.get(contract_type) is not None for contract_type in targets):
+                rpc_circuit.record_success()
+            else:
+                rpc_circuit.record_failure()
+            block_number = nonces.get(BLOCK_NUMBER)
+            pairs = [(ContractType(contract_type), validator) for contract_type in targets for validator in validators]
+            results = await asyncio.gather(*[
+                self.process_contract(chain_id, name, chain_buffer_nonce, validator, endpoint, contract_type,
+                                      targets[contract_type.value], nonces.get(contract_type.value), block_number)
+                for contract_type, validator in pairs
+            ])
+            chain_results = {}
+            for (contract_type, _), result in zip(pairs, results):
+                chain_results.setdefault(contract_type.value, []).append(result)
+            return chain_results
+
+    def build_failures(self, chain_id, chain_config, validators, contract_types, status: ReadStatus, error: str) -> Dict[str, List[NonceResult]]:
+        name = chain_config.get('name', 'NOT_FOUND')
+        return {
+            contract_type: [self.orchestrator.build_failure(validator, chain_id, name, status, error) for validator in validators]
+            for contract_type in contract_types
+        }
+
+    def get_config_snapshot_sync(self) -> Optional[ChainConfigSnapshot]:
+        return self.run(self.get_config_snapshot())
+
+    async def get_config_snapshot(self) -> Optional[ChainConfigSnapshot]:
+        config_cache = self.orchestrator.config_cache
+        if config_cache.snapshot is not None and config_cache.is_fresh():
+            return config_cache.snapshot
+        with span("config_snapshot"):
+            multi_chain_config_result = await self.fetch_contract_config() if config_cache.needs_lcd_refresh() else None
+            return config_cache.build(multi_chain_config_result)
+
+    async def sweep_async(self, validator_infos, contract_types=("GATEWAY", "VOYAGER"), chain_ids=None) -> Optional[Dict[str, List[NonceResult]]]:
+        if isinstance(validator_infos, dict):
+            validator_infos = [validator_infos]
+        validators = [validator_info['validator'] for validator_info in validator_infos or [] if validator_info and validator_info.get('validator')]
+        if not validators:
+            print("Exiting! validator data is empty, skipping sweep")
+            return None
+        endpoint = self.orchestrator.lcd_url
+        snapshot = await self.get_config_snapshot()
+        if snapshot is None:
+            return None
+        multi_chain_config = snapshot.multi_chain_config
+        chain_infos = snapshot.chain_infos
+        if chain_ids is not None:
+            chain_infos = {chain_id: chain_config for chain_id, chain_config in chain_infos.items() if chain_id in chain_ids}
+
+        contract_types = [ContractType(contract_type) for contract_type in contract_types]
+        print(f'Processing {len(chain_infos)} chains for {[c.value for c in contract_types]} types and {len(validators)} validators: ', chain_infos.keys())
+        with SWEEP_DURATION.time():
+            tasks = [
+                asyncio.ensure_future(self.process_chain(chain_id, chain_config, endpoint, validators, multi_chain_config, contract_types))
+                for chain_id, chain_config in chain_infos.items()
+            ]
+            for task in tasks:
+                task.add_done_callback(self.publish_task_results)
+            if tasks:
+                # Chains still running at the deadline are reported as timed out instead of waited on
+                _, pending = await asyncio.wait(tasks, timeout=self.orchestrator.sweep_deadline_seconds)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.wait(pending)
+
+        sweep_results = {contract_type.value: [] for contract_type in contract_types}
+        type_values = [contract_type.value for contract_type in contract_types]
+        for (chain_id, chain_config), task in zip(chain_infos.items(), tasks):
+            if task.cancelled():
+                print(f"Sweep deadline exceeded for chainId -> {chain_id}")
+                result = self.build_failures(chain_id, chain_config, validators, type_values, ReadStatus.TIMEOUT, "sweep deadline exceeded")
+                self.publish_results(result)
+            elif task.exception() is not None:
+                print(f"Error processing chainId -> {chain_id}: {str(task.exception())}")
+                result = self.build_failures(chain_id, chain_config, validators, type_values, ReadStatus.RPC_ERROR, str(task.exception()))
+                self.publish_results(result)
+            else:
+                result = task.result()
+            for contract_type in contract_types:
+                sweep_results[contract_type.value].extend(result.get(contract_type.value, [None]))
+        return sweep_results
+
+    def sweep(self, validator_infos, contract_types=("GATEWAY", "VOYAGER"), chain_ids=None) -> Optional[Dict[str, List[NonceResult]]]:
+        """
+        Check the pending nonces of every supported chain for all contract types and validators at once.
+
+        :param validator_infos: One validator info, or a list of them, as returned by `ValidatorInfo.get_validator_info`.
+        :param contract_types: Contract types to check.
+        :param chain_ids: Only check these chains; all supported chains when None.
+        :return: Per contract type list of per-chain, per-validator `NonceResult` records, or None if the sweep could not start.
+        """
+        with span("sweep", contract_types=','.join(contract_types), chains=','.join(chain_ids) if chain_ids is not None else None):
+            return self.run(self.sweep_async(validator_infos, contract_types, chain_ids))
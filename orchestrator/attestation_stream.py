@@ -0,0 +1,195 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import aiohttp
+
+DEFAULT_QUERY = "tm.event='Tx' AND message.module='attestation'"
+DEFAULT_EVENT_TYPE = "routerprotocol.routerchain.attestation.EventAttestationVote"
+
+
+class IndexEntry:
+    __slots__ = ('nonce', 'observed_at', 'reconciled_at')
+
+    def __init__(self, nonce: int, observed_at: float, reconciled_at: Optional[float]):
+        self.nonce = nonce
+        self.observed_at = observed_at
+        # Monotonic time of the last LCD lookup behind the nonce, None until it is reconciled
+        self.reconciled_at = reconciled_at
+
+
+class AttestationIndex:
+    """
+    Last observed attestation nonce per (chain, contract, validator), fed by websocket vote events
+    and by LCD `last_event_nonce` lookups.
+
+    An entry is only trusted while the event stream is connected and its last LCD reconciliation
+    is younger than `reconcile_seconds`. Every entry needs a new LCD reconciliation whenever the
+    stream connects or disconnects, since events may have been missed in between.
+    """
+    def __init__(self, reconcile_seconds: float = 300):
+        """
+        :param reconcile_seconds: Maximum age in seconds of the last LCD lookup behind a trusted entry.
+        """
+        self.reconcile_seconds = reconcile_seconds
+        self.entries: Dict[Tuple[str, str, str], IndexEntry] = {}
+        self.stream_connected = False
+        self.events = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(chain_id: str, contract_address: str, validator_address: str) -> Tuple[str, str, str]:
+        return str(chain_id), contract_address.lower(), validator_address
+
+    def observe(self, chain_id: str, contract_address: str, validator_address: str, nonce: int) -> None:
+        """
+        Record a nonce seen in a vote event. Older nonces than the indexed one are ignored.
+        """
+        key = self.get_key(chain_id, contract_address, validator_address)
+        with self._lock:
+            self.events += 1
+            entry = self.entries.get(key)
+            if entry is None:
+                # Not trusted until an LCD lookup reconciles it
+                self.entries[key] = IndexEntry(nonce, time.monotonic(), None)
+            elif nonce > entry.nonce:
+                entry.nonce = nonce
+                entry.observed_at = time.monotonic()
+
+    def set_connected(self, connected: bool) -> None:
+        """
+        Record a stream (re)connect or disconnect, and mark every entry for reconciliation.
+        """
+        with self._lock:
+            self.stream_connected = connected
+            for entry in self.entries.values():
+                entry.reconciled_at = None
+
+    def reconcile(self, chain_id: str, contract_address: str, validator_address: str, nonce: int) -> None:
+        """
+        Record the nonce returned by an LCD lookup; it replaces the indexed nonce.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.entries[self.get_key(chain_id, contract_address, validator_address)] = IndexEntry(nonce, now, now)
+
+    def get(self, chain_id: str, contract_address: str, validator_address: str) -> Optional[int]:
+        """
+        :return: The indexed nonce if the LCD lookup can be skipped, otherwise None.
+        """
+        entry = self.entries.get(self.get_key(chain_id, contract_address, validator_address))
+        reconciled_at = entry.reconciled_at if entry is not None else None
+        if reconciled_at is None or not self.stream_connected or time.monotonic() - reconciled_at >= self.reconcile_seconds:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.nonce
+
+
+def parse_attribute(value: Any) -> str:
+    # Typed Cosmos SDK events carry JSON encoded attribute values
+    value = str(value)
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1]
+    return value
+
+
+class TendermintAttestationStream:
+    """
+    Subscribes to the Router chain Tendermint RPC websocket and feeds attestation vote events into an `AttestationIndex`.
+
+    Reconnects with jittered exponential backoff; the index is marked disconnected meanwhile so
+    lookups fall back to the LCD, and its entries are only trusted again once the LCD reconciled them.
+    """
+    def __init__(self, ws_url: str, index: AttestationIndex, query: str = DEFAULT_QUERY, event_type: str = DEFAULT_EVENT_TYPE,
+                 attributes: Optional[Dict[str, str]] = None, validator_aliases: Optional[Dict[str, str]] = None,
+                 backoff_base: float = 1, backoff_max: float = 60, heartbeat: float = 30):
+        """
+        :param ws_url: Tendermint RPC websocket url, e.g. `ws://host:26657/websocket`.
+        :param index: Index to feed.
+        :param query: Tendermint event subscription query.
+        :param event_type: Event type whose attributes describe one vote.
+        :param attributes: Attribute names of the `chain_id`, `contract`, `validator` and `nonce` of a vote.
+        :param validator_aliases: Maps vote signer addresses (e.g. orchestrator addresses) to validator operator addresses.
+        :param backoff_base: First reconnect delay in seconds.
+        :param backoff_max: Maximum reconnect delay in seconds.
+        :param heartbeat: Seconds between websocket pings.
+        """
+        self.ws_url = ws_url
+        self.index = index
+        self.query = query
+        self.event_type = event_type
+        self.attributes = dict({'chain_id': 'chainId', 'contract': 'contract', 'validator': 'voter', 'nonce': 'eventNonce'}, **(attributes or {}))
+        self.validator_aliases = validator_aliases or {}
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.heartbeat = heartbeat
+        self.reconnects = 0
+        self.last_event_at = None
+        self._task = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Run the subscription on `loop`, which must be running in another thread.
+        """
+        if self._task is None:
+            self._task = asyncio.run_coroutine_threadsafe(self.run(), loop)
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def parse_votes(self, message: Dict[str, Any]) -> Iterator[Tuple[str, str, str, int]]:
+        """
+        :return: (chain id, contract, validator, nonce) of every vote in a subscription message.
+        """
+        events = (message.get('result') or {}).get('events') or {}
+        columns = [events.get(f"{self.event_type}.{self.attributes[name]}") or [] for name in ('chain_id', 'contract', 'validator', 'nonce')]
+        for chain_id, contract, validator, nonce in zip(*columns):
+            try:
+                nonce = int(parse_attribute(nonce))
+            except ValueError:
+                continue
+            validator = parse_attribute(validator)
+            yield parse_attribute(chain_id), parse_attribute(contract), self.validator_aliases.get(validator, validator), nonce
+
+    async def consume(self, session: aiohttp.ClientSession) -> None:
+        async with session.ws_connect(self.ws_url, heartbeat=self.heartbeat) as ws:
+            await ws.send_json({"jsonrpc": "2.0", "method": "subscribe", "id": 1, "params": {"query": self.query}})
+            print(f"Subscribed to attestation events on {self.ws_url}")
+            self.index.set_connected(True)
+            async for message in ws:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    if message.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                        break
+                    continue
+                payload = json.loads(message.data)
+                if payload.get('error'):
+                    raise ConnectionError(f"Subscription rejected: {payload['error']}")
+                for chain_id, contract, validator, nonce in self.parse_votes(payload):
+                    self.index.observe(chain_id, contract, validator, nonce)
+                    self.last_event_at = time.time()
+
+    async def run(self) -> None:
+        attempt = 0
+        async with aiohttp.ClientSession() as session:
+            while True:
+                started = time.monotonic()
+                try:
+                    await self.consume(session)
+                except asyncio.CancelledError:
+                    self.index.set_connected(False)
+                    raise
+                except Exception as e:
+                    print(f"Attestation stream error on {self.ws_url}: {str(e)}")
+                self.index.set_connected(False)
+                # A connection that stayed up for a while starts the backoff over
+                attempt = 0 if time.monotonic() - started > self.backoff_max else attempt + 1
+                self.reconnects += 1
+                await asyncio.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
@@ -0,0 +1,73 @@
+import importlib
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from orchestrator.contract_registry import ContractRegistry
+from orchestrator.rpc_pool import RpcPool
+
+DEFAULT_CHAIN_TYPE = 'evm'
+
+# Chain type -> "module:class" of its `NonceReader`; a module is only imported once a configured chain needs it
+ADAPTERS: Dict[str, str] = {
+    'evm': 'orchestrator.nonce_reader:BatchNonceReader',
+    'tron': 'orchestrator.tron_reader:TronNonceReader'
+}
+
+
+class UnsupportedChainType(ValueError):
+    pass
+
+
+def get_chain_type(chain_config: Dict[str, Any]) -> str:
+    """
+    :return: The `type` of a `chainInfos.json` entry, `evm` when it has none.
+    """
+    return str(chain_config.get('type') or DEFAULT_CHAIN_TYPE).strip().lower()
+
+
+def register_adapter(chain_type: str, path: str) -> None:
+    """
+    Register the `NonceReader` subclass, given as "module:class", that reads the nonces of a chain type.
+    """
+    ADAPTERS[chain_type.strip().lower()] = path
+
+
+def load_adapter(chain_type: str) -> type:
+    path = ADAPTERS.get(chain_type)
+    if path is None:
+        raise UnsupportedChainType(f"No chain adapter registered for chain type {chain_type}")
+    module_name, class_name = path.split(':', 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class ChainAdapterRegistry:
+    """
+    One `NonceReader` per chain type, imported and created the first time a chain of that type is read.
+    """
+    def __init__(self, contract_registry: ContractRegistry, post_json: Callable[[str, Any], Awaitable[Any]], include_block_number: bool = True,
+                 rpc_pool: Optional[RpcPool] = None):
+        """
+        :param contract_registry: Registry providing the nonce getters of each contract type.
+        :param post_json: Coroutine posting a JSON payload to an RPC url and returning the decoded body.
+        :param include_block_number: Also read the block height the nonces were read at.
+        :param rpc_pool: Endpoint scores; the process-wide pool when None.
+        """
+        self.contract_registry = contract_registry
+        self.post_json = post_json
+        self.include_block_number = include_block_number
+        self.rpc_pool = rpc_pool
+        self.readers = {}
+        self._lock = threading.Lock()
+
+    def get(self, chain_type: str = DEFAULT_CHAIN_TYPE):
+        """
+        :raises UnsupportedChainType: When no adapter is registered for the chain type.
+        """
+        reader = self.readers.get(chain_type)
+        if reader is None:
+            with self._lock:
+                reader = self.readers.get(chain_type)
+                if reader is None:
+                    reader = load_adapter(chain_type)(self.contract_registry, self.post_json, self.include_block_number, self.rpc_pool)
+                    self.readers[chain_type] = reader
+        return reader
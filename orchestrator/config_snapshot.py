@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class ChainConfigSnapshot:
+    """
+    Parsed multichain contract config and chain infos, filtered to enabled and supported chains.
+    """
+    __slots__ = ('multi_chain_config', 'chain_infos', 'fetched_at', 'chain_infos_mtime')
+
+    def __init__(self, multi_chain_config: Dict[str, List[str]], chain_infos: Dict[str, Dict[str, Any]], fetched_at: float, chain_infos_mtime: float):
+        self.multi_chain_config = multi_chain_config
+        self.chain_infos = chain_infos
+        self.fetched_at = fetched_at
+        self.chain_infos_mtime = chain_infos_mtime
+
+
+class ChainConfigCache:
+    """
+    Caches one `ChainConfigSnapshot` shared by the GATEWAY and VOYAGER checks.
+
+    The LCD contract config is refetched once `ttl_seconds` have passed; `chainInfos.json`
+    is re-read as soon as its mtime changes. A failed LCD refresh keeps serving the previous snapshot.
+    """
+    def __init__(self, missing_nonce_orchestrator, ttl_seconds: float = 300):
+        """
+        :param missing_nonce_orchestrator: Orchestrator providing the LCD url, chain infos path and config helpers.
+        :param ttl_seconds: Maximum age in seconds of the cached LCD contract config.
+        """
+        self.orchestrator = missing_nonce_orchestrator
+        self.ttl_seconds = ttl_seconds
+        self.snapshot = None
+        self._multi_chain_config_result = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def contract_config_url(self) -> str:
+        return f"{self.orchestrator.lcd_url}/router-protocol/router-chain/multichain/contract_config"
+
+    def get_chain_infos_mtime(self) -> float:
+        try:
+            return os.stat(self.orchestrator.CWD + self.orchestrator.CHAIN_CONFIG).st_mtime
+        except OSError:
+            return 0.0
+
+    def needs_lcd_refresh(self) -> bool:
+        return self._multi_chain_config_result is None or time.time() - self._fetched_at >= self.ttl_seconds
+
+    def expire(self) -> None:
+        """
+        Refetch the contract config on the next lookup, e.g. after the LCD url changed.
+        """
+        with self._lock:
+            self._fetched_at = 0.0
+
+    def is_fresh(self) -> bool:
+        return not self.needs_lcd_refresh() and self.snapshot.chain_infos_mtime == self.get_chain_infos_mtime()
+
+    def build(self, multi_chain_config_result: Optional[Dict[str, Any]]) -> Optional[ChainConfigSnapshot]:
+        """
+        Build a new snapshot from a freshly fetched contract config, or from the cached one when it is None.
+
+        :param multi_chain_config_result: Raw LCD `contract_config` response, or None to reuse the previous one.
+        :return: The new snapshot, or None when there is no usable contract config or no supported chain.
+        """
+        with self._lock:
+            if multi_chain_config_result:
+                self._fetched_at = time.time()
+                self._multi_chain_config_result = multi_chain_config_result
+            elif self._multi_chain_config_result is not None:
+                if self.needs_lcd_refresh():
+                    print("Failed to refresh multichain contract config, using the cached one")
+                multi_chain_config_result = self._multi_chain_config_result
+            else:
+                return None
+
+            chain_infos_mtime = self.get_chain_infos_mtime()
+            multi_chain_config = self.orchestrator.get_multi_chain_config(multi_chain_config_result)
+            chain_infos = self.orchestrator.get_supported_chain_infos(multi_chain_config_result)
+            if chain_infos is None:
+                return None
+            chain_infos = {chain_id: chain_config for chain_id, chain_config in chain_infos.items() if chain_id in multi_chain_config}
+            self.orchestrator.contract_registry.sync(chain_infos, multi_chain_config)
+            self.snapshot = ChainConfigSnapshot(multi_chain_config, chain_infos, self._fetched_at, chain_infos_mtime)
+            return self.snapshot
+
+    def get(self) -> Optional[ChainConfigSnapshot]:
+        """
+        Return the current snapshot, refreshing whichever source is stale.
+        """
+        if self.snapshot is not None and self.is_fresh():
+            return self.snapshot
+        multi_chain_config_result = self.orchestrator.fetch_contract_config() if self.needs_lcd_refresh() else None
+        return self.build(multi_chain_config_result)
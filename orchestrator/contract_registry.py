@@ -0,0 +1,89 @@
+import json
+import threading
+from typing import Any, Dict, List, Tuple
+
+
+class ContractRegistry:
+    """
+    Long-lived cache of parsed ABIs, nonce getter selectors and `eth_call` targets.
+
+    Call targets are keyed by (contract address, contract type) and are dropped by `sync`
+    once the chain infos or the multichain contract config stop referencing them.
+    """
+    NONCE_FUNCTIONS = {
+        'GATEWAY': 'eventNonce',
+        'VOYAGER': 'depositNonce'
+    }
+
+    def __init__(self, abi_paths: Dict[str, str]):
+        """
+        :param abi_paths: Mapping of contract type value to ABI artifact path.
+        """
+        self.abi_paths = abi_paths
+        self._lock = threading.RLock()
+        self._abis = {}
+        self._signatures = {}
+        self._selectors = {}
+        self._call_targets = {}
+        self._fingerprint = None
+
+    def get_abi(self, contract_type: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            if contract_type not in self._abis:
+                with open(self.abi_paths[contract_type]) as f:
+                    self._abis[contract_type] = json.load(f)['abi']
+            return self._abis[contract_type]
+
+    def get_signature(self, contract_type: str) -> str:
+        """
+        Return the signature of the nonce getter of a contract type, e.g. `eventNonce()`.
+        """
+        with self._lock:
+            if contract_type not in self._signatures:
+                fn_name = self.NONCE_FUNCTIONS[contract_type]
+                fn_abi = next(item for item in self.get_abi(contract_type) if item.get('type') == 'function' and item.get('name') == fn_name)
+                self._signatures[contract_type] = f"{fn_name}({','.join(i['type'] for i in fn_abi.get('inputs', []))})"
+            return self._signatures[contract_type]
+
+    def get_selector(self, contract_type: str) -> str:
+        """
+        Return the 4-byte selector of the nonce getter of a contract type as a 0x-prefixed hex string.
+        """
+        with self._lock:
+            if contract_type not in self._selectors:
+                # Only needed once per contract type, so keep it off the startup path
+                from eth_utils import keccak
+                self._selectors[contract_type] = '0x' + keccak(text=self.get_signature(contract_type))[:4].hex()
+            return self._selectors[contract_type]
+
+    def get_call_target(self, address: str, contract_type: str) -> Tuple[str, str]:
+        """
+        Return the (address, call data) pair for a raw `eth_call` of the nonce getter.
+        """
+        key = (address, contract_type)
+        target = self._call_targets.get(key)
+        if target is None:
+            target = (address.lower(), self.get_selector(contract_type))
+            self._call_targets[key] = target
+        return target
+
+    def sync(self, chain_infos: Dict[str, Dict[str, Any]], multi_chain_config: Dict[str, List[str]]) -> None:
+        """
+        Evict call targets no longer referenced by the chain infos or the multichain config.
+
+        :param chain_infos: Parsed `chainInfos.json` content.
+        :param multi_chain_config: Output of `MissingNonceOrchestrator.get_multi_chain_config`.
+        """
+        fingerprint = json.dumps([chain_infos, multi_chain_config], sort_keys=True, default=str)
+        if fingerprint == self._fingerprint:
+            return
+        live_targets = set()
+        for chain_id in chain_infos:
+            gateway_address, voyager_address = multi_chain_config.get(chain_id, ["", ""])
+            if gateway_address:
+                live_targets.add((gateway_address.lower(), 'GATEWAY'))
+            if voyager_address:
+                live_targets.add((voyager_address.lower(), 'VOYAGER'))
+        with self._lock:
+            self._call_targets = {key: target for key, target in self._call_targets.items() if (key[0].lower(), key[1]) in live_targets}
+            self._fingerprint = fingerprint
@@ -0,0 +1,46 @@
+import time
+from typing import Optional
+
+
+class GateEntry:
+    __slots__ = ('onchain_nonce', 'validator_nonce', 'checked_at')
+
+    def __init__(self, onchain_nonce: int, validator_nonce: int, checked_at: float):
+        self.onchain_nonce = onchain_nonce
+        self.validator_nonce = validator_nonce
+        self.checked_at = checked_at
+
+
+class LastEventNonceGate:
+    """
+    Remembers the last (on-chain nonce, validator nonce) pair per chain, contract type and validator
+    so the LCD `last_event_nonce` lookup can be skipped while nothing can have changed.
+
+    A lookup is still required when the on-chain nonce moved, when the validator was behind at the
+    previous lookup, or when the previous lookup is older than `max_age_seconds`.
+    """
+    def __init__(self, max_age_seconds: float = 60):
+        """
+        :param max_age_seconds: Maximum age in seconds of a remembered validator nonce.
+        """
+        self.max_age_seconds = max_age_seconds
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, chain_id: str, contract_type: str, validator_address: str, onchain_nonce: int) -> Optional[int]:
+        """
+        :return: The remembered validator nonce if the LCD lookup can be skipped, otherwise None.
+        """
+        entry = self.entries.get((chain_id, contract_type, validator_address))
+        if (entry is None
+                or entry.onchain_nonce != onchain_nonce
+                or entry.validator_nonce < entry.onchain_nonce
+                or time.monotonic() - entry.checked_at >= self.max_age_seconds):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.validator_nonce
+
+    def update(self, chain_id: str, contract_type: str, validator_address: str, onchain_nonce: int, validator_nonce: int) -> None:
+        self.entries[(chain_id, contract_type, validator_address)] = GateEntry(onchain_nonce, validator_nonce, time.monotonic())
@@ -0,0 +1,69 @@
+from typing import Any, Dict, List
+
+from chain.balance_check import BalanceCheck
+
+
+class ValidatorTarget:
+    """
+    One monitored validator: its operator, validator and orchestrator addresses plus its balance checks.
+    """
+    def __init__(self, operator_address: str, validator_address: str, orchestrator_address: str,
+                 min_wallet_balance: str = "4ROUTE", orchestrator_health_endpoint: str = ""):
+        self.operator_address = operator_address
+        self.validator_address = validator_address
+        self.orchestrator_address = orchestrator_address
+        self.orchestrator_health_endpoint = orchestrator_health_endpoint
+        self.balance_checks = [
+            BalanceCheck.from_threshold(address, role, min_wallet_balance)
+            for address, role in ((validator_address, 'validator'), (orchestrator_address, 'orchestrator')) if address
+        ]
+
+
+def load_validator_targets(config_manager) -> List[ValidatorTarget]:
+    """
+    Read the monitored validators from the config.
+
+    `settings.validators` may list several address sets; each entry falls back to the top-level
+    `min_wallet_balance` and `orchestrator_health_endpoint` when it omits them. Without it, the
+    top-level addresses form a single target.
+
+    :param config_manager: Loaded `ConfigManager`.
+    :return: The validator targets, in config order.
+    """
+    defaults = {
+        'operator_address': config_manager.read_config('settings.operator_address', ''),
+        'validator_address': config_manager.read_config('settings.validator_address', ''),
+        'orchestrator_address': config_manager.read_config('settings.orchestrator_address', ''),
+        'min_wallet_balance': config_manager.read_config('settings.min_wallet_balance', "4ROUTE"),
+        'orchestrator_health_endpoint': config_manager.read_config('settings.orchestrator_health_endpoint', ''),
+    }
+    entries: List[Dict[str, Any]] = config_manager.read_config('settings.validators', [])
+    if not entries:
+        return [ValidatorTarget(**defaults)]
+    targets = []
+    for entry in entries:
+        values = dict(defaults, operator_address='', validator_address='', orchestrator_address='')
+        values.update({key: value for key, value in entry.items() if key in defaults})
+        targets.append(ValidatorTarget(**values))
+    return targets
+
+
+def load_balance_checks(config_manager, targets: List[ValidatorTarget]) -> List[BalanceCheck]:
+    """
+    Combine the validator and orchestrator balance checks of every target with `settings.balance_checks`.
+
+    Each `settings.balance_checks` entry takes an `address`, a `role` (default `account`), a
+    `min_balance` such as `5ROUTE` or `1000000 ibc/...` and optionally the `decimals` of its denom.
+    An entry with the same address, role and denom as a target's check replaces it.
+
+    :param config_manager: Loaded `ConfigManager`.
+    :param targets: Monitored validators.
+    :return: The balance checks, one per (address, role, denom).
+    """
+    checks = {check.key: check for target in targets for check in target.balance_checks}
+    for entry in config_manager.read_config('settings.balance_checks', []) or []:
+        if not entry.get('address'):
+            continue
+        check = BalanceCheck.from_threshold(entry['address'], entry.get('role', 'account'), entry.get('min_balance', 0), entry.get('decimals'))
+        checks[check.key] = check
+    return list(checks.values())
@@ -1,13 +1,13 @@
 import os
 import json
-import requests
 import time
 import concurrent.futures
-from web3 import Web3
 from collections import defaultdict
 from dotenv import load_dotenv
 from enum import Enum
 from utils.read_config import ConfigManager
+from utils.http_client import get_http_client
+from chain.router_grpc import get_router_grpc
 
 class ValidatorInfo:
     def __init__(self, lcd_url) -> None:
@@ -16,8 +16,7 @@ class ValidatorInfo:
     
     def fetch_json(self, url):
         try:
-            response = requests.get(url)
-            return response.json()
+            return get_http_client().get_json(url)
         except Exception as e:
             print(f'Error fetching {url}: {str(e)}')
             raise e
@@ -32,13 +31,16 @@ class ValidatorInfo:
         if cache_val_info and int(time.time())-cache_val_info.get('cache_epoch_time')<300:
             return cache_val_info.get('val_info')
 
-        if not self.lcd_url:
+        router_grpc = get_router_grpc()
+        if router_grpc is not None:
+            val_info = router_grpc.get_validator(validator_address)
+        elif not self.lcd_url:
             print("LCD URL is not provided.")
             return None
-    
-        endpoint = self.lcd_url
-        validators_info_endpoint = f"{endpoint}/cosmos/staking/v1beta1/validators/{validator_address}"
-        val_info = self.fetch_json(validators_info_endpoint)
+        else:
+            endpoint = self.lcd_url
+            validators_info_endpoint = f"{endpoint}/cosmos/staking/v1beta1/validators/{validator_address}"
+            val_info = self.fetch_json(validators_info_endpoint)
         self.vals_info[validator_address] = {
             "val_info": val_info,
             "cache_epoch_time": int(time.time())
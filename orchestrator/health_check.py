@@ -1,6 +1,8 @@
 import requests
 from typing import Optional, List, Dict, Any
 
+from utils.http_client import get_http_client
+
 def fetch_health_data(api_url: str) -> Optional[Dict[str, Any]]:
     """
     Fetch health data from a given API URL.
@@ -9,10 +11,8 @@ def fetch_health_data(api_url: str) -> Optional[Dict[str, Any]]:
     :return: JSON response as a dictionary, or None if an error occurs.
     """
     try:
-        response = requests.get(api_url)
-        response.raise_for_status()  # Raises an exception for HTTP errors
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        return get_http_client().get_json(api_url)  # Raises an exception for HTTP errors
+    except (requests.exceptions.RequestException, ValueError) as e:
         print(f"Error fetching health data: {e}")
         return None
 
@@ -1,13 +1,20 @@
 import os
 import json
-import requests
-import time
-import concurrent.futures
-from web3 import Web3
-from collections import defaultdict
+import asyncio
 from dotenv import load_dotenv
 from enum import Enum
 from utils.read_config import ConfigManager
+from utils.circuit_breaker import configure_circuit_breakers
+from utils.http_client import get_http_client
+from chain.router_grpc import get_router_grpc
+from utils.tracing import propagate
+from orchestrator.contract_registry import ContractRegistry
+from orchestrator.chain_adapters import ChainAdapterRegistry, register_adapter
+from orchestrator.config_snapshot import ChainConfigCache
+from orchestrator.delta_gate import LastEventNonceGate
+from orchestrator.attestation_stream import AttestationIndex
+from orchestrator.rpc_pool import configure_rpc_pool
+from orchestrator.results import NonceResult
 
 load_dotenv()
 
@@ -15,6 +22,14 @@ class ContractType(Enum):
     GATEWAY = 'GATEWAY'
     VOYAGER = 'VOYAGER'
 
+class ReadStatus(Enum):
+    OK = 'ok'
+    RPC_ERROR = 'rpc_error'
+    LCD_ERROR = 'lcd_error'
+    TIMEOUT = 'timeout'
+    CIRCUIT_OPEN = 'circuit_open'
+    WORKER_ERROR = 'worker_error'
+
 class MissingNonceOrchestrator:
     ABI = {
         'GATEWAY': "./artifacts/Gateway-ABI.json",
@@ -29,67 +44,90 @@ class MissingNonceOrchestrator:
         self.VALIDATOR_ADDRESS=self.config_manager.read_config('settings.validator_address', '')
         self.CHAIN_ENV = self.config_manager.read_config('settings.environment', 'testnet')
         self.lcd_url = self.config_manager.read_config('settings.router_chain_lcd_url', '')
+        self.contract_registry = ContractRegistry(self.ABI)
+        self.config_cache = ChainConfigCache(self, float(self.config_manager.read_config('settings.contract_config_ttl_seconds', '300')))
+        self.rpc_pool = configure_rpc_pool(
+            hedge_delay=float(self.config_manager.read_config('settings.rpc_hedge_delay_seconds', '1')),
+            eject_after=int(self.config_manager.read_config('settings.rpc_eject_after_failures', '3')),
+            eject_seconds=float(self.config_manager.read_config('settings.rpc_eject_seconds', '60'))
+        )
+        for chain_type, adapter_path in (self.config_manager.read_config('settings.chain_adapters', {}) or {}).items():
+            register_adapter(chain_type, adapter_path)
+        self.chain_adapters = ChainAdapterRegistry(self.contract_registry, self.post_json, False, self.rpc_pool)
+        self.circuit_breakers = configure_circuit_breakers(
+            failure_threshold=int(self.config_manager.read_config('settings.circuit_failure_threshold', '3')),
+            reset_timeout=float(self.config_manager.read_config('settings.circuit_reset_seconds', '30'))
+        )
+        self.sweep_deadline_seconds = float(self.config_manager.read_config('settings.sweep_deadline_seconds', '30'))
+        self.nonce_gate = None
+        if self.config_manager.read_config('settings.incremental_lcd', False):
+            self.nonce_gate = LastEventNonceGate(float(self.config_manager.read_config('settings.lcd_max_age_seconds', '60')))
+        self.attestation_index = None
+        if self.config_manager.read_config('settings.attestation_stream.ws_url', ''):
+            self.attestation_index = AttestationIndex(float(self.config_manager.read_config('settings.attestation_stream.reconcile_seconds', '300')))
+
+    def apply_config(self):
+        """
+        Apply a reloaded configuration in place, keeping the cached contract config, remembered
+        validator nonces, RPC scores and circuit states.
+        """
+        self.DEBUG_MODE = self.config_manager.read_config('settings.debug_mode', 'False')
+        self.VALIDATOR_ADDRESS = self.config_manager.read_config('settings.validator_address', '')
+        lcd_url = self.config_manager.read_config('settings.router_chain_lcd_url', '')
+        if lcd_url != self.lcd_url:
+            self.lcd_url = lcd_url
+            self.config_cache.expire()
+        self.config_cache.ttl_seconds = float(self.config_manager.read_config('settings.contract_config_ttl_seconds', '300'))
+        self.rpc_pool.hedge_delay = float(self.config_manager.read_config('settings.rpc_hedge_delay_seconds', '1'))
+        self.rpc_pool.eject_after = max(1, int(self.config_manager.read_config('settings.rpc_eject_after_failures', '3')))
+        self.rpc_pool.eject_seconds = float(self.config_manager.read_config('settings.rpc_eject_seconds', '60'))
+        self.circuit_breakers.reconfigure(
+            int(self.config_manager.read_config('settings.circuit_failure_threshold', '3')),
+            float(self.config_manager.read_config('settings.circuit_reset_seconds', '30'))
+        )
+        self.sweep_deadline_seconds = float(self.config_manager.read_config('settings.sweep_deadline_seconds', '30'))
+        lcd_max_age_seconds = float(self.config_manager.read_config('settings.lcd_max_age_seconds', '60'))
+        if not self.config_manager.read_config('settings.incremental_lcd', False):
+            self.nonce_gate = None
+        elif self.nonce_gate is None:
+            self.nonce_gate = LastEventNonceGate(lcd_max_age_seconds)
+        else:
+            self.nonce_gate.max_age_seconds = lcd_max_age_seconds
+        if self.attestation_index is not None:
+            self.attestation_index.reconcile_seconds = float(self.config_manager.read_config('settings.attestation_stream.reconcile_seconds', '300'))
 
     def print_debug(self, *args, **kwargs):
         if self.DEBUG_MODE:
             print(*args, **kwargs)
 
-    def fetch_json(self, url):
-        try:
-            response = requests.get(url)
-            return response.json()
-        except Exception as e:
-            print(f'Error fetching {url}: {str(e)}')
-            raise e
-
-    def get_network(self):
-        env = self.CHAIN_ENV
-        env = env.lower()
-        network_map = {
-            'devnet': 'devnet',
-            'testnet': 'testnet',
-            'devnet-alpha': 'devnet-alpha',
-            'mainnet': 'mainnet'
-        }
-        return network_map.get(env, '')
-
-    def get_recent_nonce(self, rpc, address, contract_type):
-        try:
-            rpc = rpc.strip()        
-            with open(self.ABI[contract_type.value]) as f:
-                contract_json = json.load(f)
-            web3_instance = Web3(Web3.HTTPProvider(rpc))
-            address=Web3.to_checksum_address(address.lower())
-            contract = web3_instance.eth.contract(address=address, abi=contract_json['abi'])
-            if contract_type == ContractType.GATEWAY:
-                response = int(contract.functions.eventNonce().call())
-            else:
-                response = int(contract.functions.depositNonce().call())
-            return response
-        except Exception as e:
-            print(f'Error fetching nonce for {address}: {str(e)}')
-            print(e.__traceback__)
-            return 0
+    async def post_json(self, url, payload):
+        # The blocking shared client runs in the default executor so hedged reads still overlap
+        return await asyncio.get_event_loop().run_in_executor(None, propagate(get_http_client().post_json), url, payload)
+
+    def get_rpc_circuit(self, chain_id):
+        return self.circuit_breakers.get(f"rpc:{chain_id}")
+
+    def get_lcd_circuit(self, endpoint):
+        router_grpc = get_router_grpc()
+        host = router_grpc.host if router_grpc is not None else get_http_client().get_host(endpoint)
+        return self.circuit_breakers.get(f"lcd:{host}")
 
     def fetch_data(self, url):
         try:
-            response = requests.get(url)
-            return response.json()
+            return get_http_client().get_json(url)
         except Exception as e:
             print(e)
             return None
 
-    def group_by_chain_id(self, array):
-        result = defaultdict(list)
-        for item in array:
-            result[item['chainId']].append(item)
-        return result
-
-    def group_by_validator_address(self, array):
-        result = defaultdict(list)
-        for item in array:
-            result[item['moniker']].append(item)
-        return result
+    def fetch_contract_config(self):
+        router_grpc = get_router_grpc()
+        if router_grpc is None:
+            return self.fetch_data(self.config_cache.contract_config_url)
+        try:
+            return router_grpc.get_contract_config()
+        except Exception as e:
+            print(f'Error fetching contract config from {router_grpc.target}: {str(e)}')
+            return None
 
     def get_all_supported_chain(self, multi_chain_config_result):
         all_supported_chains=[]
@@ -115,94 +153,40 @@ class MissingNonceOrchestrator:
             multi_chain_config[chain_id] = config
         return multi_chain_config
 
-    def process_chain_by_id(self, args):
-        chain_id, chain_config, endpoint, result, multi_chain_config, contract_type = args
-        return self.process_chain(chain_id, chain_config, endpoint, result, multi_chain_config, contract_type)
+    def load_chain_infos(self):
+        chain_config_file_path=self.CWD+self.CHAIN_CONFIG
+        with open(chain_config_file_path) as f:
+            chain_infos_json = json.load(f)
+        return dict(chain_infos_json)
+
+    def get_supported_chain_infos(self, multi_chain_config_result):
+        chain_infos = self.load_chain_infos()
+        all_supported_chains = self.get_all_supported_chain(multi_chain_config_result)
+
+        if all_supported_chains and len(all_supported_chains) > 0:
+            return {k: v for k, v in chain_infos.items() if k in all_supported_chains}
+        print("no supported chains found, exiting")
+        return None
 
     def truncate_address(self, address, keep=10):
         return address[:keep] + '...' + address[-keep:]
 
-    def process_validator(self, args):
-        validator, endpoint, chain_id, contract_config, onchain_event_nonce, name, chain_buffer_nonce, contract_type, contract_address = args
-        current_power = 0
-        validator_address = validator['operator_address']
-        last_nonce_handled_uri = f"{endpoint}/router-protocol/router-chain/attestation/last_event_nonce/{chain_id}/{contract_address}/{validator_address}"
-        last_executed_nonce_data = self.fetch_data(last_nonce_handled_uri)
-        
-        if not last_executed_nonce_data:
-            print("last_executed_nonce_data not found")
-            return None
+    def get_last_event_nonce_uri(self, endpoint, chain_id, contract_address, validator_address):
+        return f"{endpoint}/router-protocol/router-chain/attestation/last_event_nonce/{chain_id}/{contract_address}/{validator_address}"
 
-        last_executed_nonce = int(last_executed_nonce_data['eventNonce'])
+    def build_result(self, validator, chain_id, name, onchain_event_nonce, last_executed_nonce, chain_buffer_nonce, block_number=None):
+        validator_address = validator['operator_address']
         if last_executed_nonce < (onchain_event_nonce - chain_buffer_nonce):
-            current_power += int(validator['tokens'])
             self.print_debug(f"[❌] {self.truncate_address(validator_address)} - {name}({chain_id}) as last_executed_nonce {last_executed_nonce} < {onchain_event_nonce}")
         else:
             self.print_debug(f"[✅] {self.truncate_address(validator_address)} - {chain_id} as last_executed_nonce {last_executed_nonce} > onchain_event_nonce {onchain_event_nonce}")
         
-        diff_nonces = onchain_event_nonce - last_executed_nonce
-        return {
-                'validator_address': validator_address,
-                'chainId': chain_id,
-                'latest_onchain_eventNonce': onchain_event_nonce,
-                'lastest_val_executed_nonce': last_executed_nonce,
-                'chain_name': name,
-                'moniker': validator['description']['moniker'],
-                'jailed': validator['jailed'],
-                'diff_nonces': diff_nonces
-            }
-
-    def process_chain(self, chain_id, chain_config, endpoint, result, multi_chain_config, contract_type):
-        if not result or not result.get('validator'):
-            print(f"Exiting! validator data is empty for chainId -> {chain_id} RPC -> {rpc_url} type -> {contract_type.value}")
-            return []
-        rpc_url = chain_config.get('rpc', '')
-        name=chain_config.get('name', 'NOT_FOUND')
-        chain_buffer_nonce=chain_config.get('buffer', 0)
-        contract_config = multi_chain_config.get(chain_id)
-        contract_address = contract_config[0]
-        if contract_type == ContractType.VOYAGER:
-            contract_address = contract_config[1]
-        if not rpc_url or not contract_config or not contract_address:
-            print(f"no rpc or contract config for chainId -> {chain_id}")
-            return []
-        onchain_event_nonce = self.get_recent_nonce(rpc_url, contract_address, contract_type)
-        args_list=(result['validator'], endpoint, chain_id, contract_config, onchain_event_nonce, name, chain_buffer_nonce, contract_type, contract_address)
-        res = self.process_validator(args_list)
-        return res
-
-    def get_orchestrators_by_pending_nonce(self, validator_info, contract_type="GATEWAY"):
-        contract_type = ContractType(contract_type)
-        if contract_type not in ContractType:
-            print("contract_type is not supported, exiting")
-            return None
-
-        # validators_info_endpoint = f"{endpoint}/cosmos/staking/v1beta1/validators/{self.VALIDATOR_ADDRESS}"
-        # validator_info = self.fetch_json(validators_info_endpoint)
-
-        endpoint = self.lcd_url
-        multi_chain_endpoint = f"{endpoint}/router-protocol/router-chain/multichain/contract_config"
-        multi_chain_config_result = self.fetch_json(multi_chain_endpoint)
-        multi_chain_config = self.get_multi_chain_config(multi_chain_config_result)
-
-        chain_config_file_path=self.CWD+self.CHAIN_CONFIG
-        with open(chain_config_file_path) as f:
-            chain_infos_json = json.load(f)
-        
-        chain_infos = dict(chain_infos_json)
-        all_supported_chains = self.get_all_supported_chain(multi_chain_config_result)
-
-        if all_supported_chains and len(all_supported_chains) > 0:
-            chain_infos = {k: v for k, v in chain_infos.items() if k in all_supported_chains}
-        else:
-            print("no supported chains found, exiting")
-            return None
-        tasks = []
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            print(f'Processing {len(chain_infos)} chains for {contract_type} type: ', chain_infos.keys())
-            args_list = [(chain_id, chain_config, endpoint, validator_info, multi_chain_config, contract_type) for chain_id, chain_config in chain_infos.items()]
-            results = list(executor.map(self.process_chain_by_id, args_list))
-        if not results:
-            print("no results found, exiting")
-            exit(1)
-        return json.dumps(results, indent=4)
+        return NonceResult(validator_address, chain_id, name, validator['description']['moniker'], validator['jailed'], ReadStatus.OK.value,
+                           onchain_event_nonce, last_executed_nonce, block_number)
+
+    def build_failure(self, validator, chain_id, name, status, error):
+        """
+        Result record of a check whose nonces could not be read. It has no nonces and no `diff_nonces`.
+        """
+        return NonceResult(validator['operator_address'], chain_id, name, validator['description']['moniker'], validator['jailed'],
+                           status.value, error=error)
@@ -0,0 +1,177 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from orchestrator.contract_registry import ContractRegistry
+from orchestrator.rpc_pool import RpcPool, get_rpc_pool
+from utils.http_client import HttpClient
+from utils.metrics import RPC_HEDGED_READS
+from utils.tracing import span
+
+BLOCK_NUMBER = 'block_number'
+
+
+class NonceReader:
+    """
+    Chain adapter reading the Gateway and Voyager nonces of one chain type.
+
+    When a chain has several RPCs, the best ranked one of the `RpcPool` is read first; if it has
+    not answered within its p95 latency the runner-up is read as well and the first complete
+    answer wins. Failed reads fail over to the next endpoint. Subclasses implement `read_rpc`.
+    """
+    def __init__(self, contract_registry: ContractRegistry, post_json: Callable[[str, Any], Awaitable[Any]], include_block_number: bool = True,
+                 rpc_pool: Optional[RpcPool] = None):
+        """
+        :param contract_registry: Registry providing the nonce getters of each contract type.
+        :param post_json: Coroutine posting a JSON payload to an RPC url and returning the decoded body.
+        :param include_block_number: Also read the block height both nonces were read at.
+        :param rpc_pool: Endpoint scores; the process-wide pool when None.
+        """
+        self.contract_registry = contract_registry
+        self.post_json = post_json
+        self.include_block_number = include_block_number
+        self.rpc_pool = rpc_pool if rpc_pool is not None else get_rpc_pool()
+
+    async def read_scored(self, rpc: str, targets: Dict[str, str]) -> Dict[str, Optional[int]]:
+        # Cancelled reads are scored by `read`
+        started = time.monotonic()
+        with span("rpc.read", **{'server.address': HttpClient.get_host(rpc), 'adapter': type(self).__name__}):
+            values = await self.read_rpc(rpc, targets)
+        self.rpc_pool.record(rpc, time.monotonic() - started, bool(values) and None not in values.values())
+        return values
+
+    async def read(self, rpcs: Union[str, List[str]], targets: Dict[str, str]) -> Dict[str, Optional[int]]:
+        """
+        Read the nonces of several contracts on one chain, hedging and failing over across its RPCs.
+
+        :param rpcs: Chain RPC url, or every RPC url of the chain.
+        :param targets: Mapping of contract type value to contract address.
+        :return: Mapping of contract type value (and `block_number`) to the value read, None where every read failed.
+        """
+        if isinstance(rpcs, str):
+            rpcs = [rpcs]
+        candidates = iter(self.rpc_pool.rank([rpc.strip() for rpc in rpcs]))
+        pending = {}
+        values = {}
+        hedged = False
+        started = time.monotonic()
+        answered = False
+
+        def launch() -> bool:
+            rpc = next(candidates, None)
+            if rpc is None:
+                return False
+            pending[asyncio.ensure_future(self.read_scored(rpc, targets))] = rpc
+            return True
+
+        try:
+            launch()
+            while pending:
+                timeout = None
+                if not hedged and len(pending) == 1:
+                    timeout = self.rpc_pool.get_hedge_delay(next(iter(pending.values())))
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    if launch():
+                        RPC_HEDGED_READS.inc()
+                    continue
+                for task in done:
+                    pending.pop(task)
+                    result = task.result()
+                    if result and None not in result.values():
+                        answered = True
+                        return result
+                    # Keep whatever a partial answer did read
+                    values.update({key: value for key, value in result.items() if value is not None or key not in values})
+                if not pending:
+                    launch()
+        finally:
+            for task, rpc in pending.items():
+                task.cancel()
+                if not answered:
+                    # Cut off by the sweep deadline rather than beaten by a hedge, which costs an endpoint nothing;
+                    # failures add no latency sample
+                    self.rpc_pool.record(rpc, time.monotonic() - started, False)
+        return values
+
+    async def read_rpc(self, rpc: str, targets: Dict[str, str]) -> Dict[str, Optional[int]]:
+        """
+        Read the nonces of several contracts on one chain RPC.
+
+        :param rpc: Chain RPC url.
+        :param targets: Mapping of contract type value to contract address.
+        :return: Mapping of contract type value (and `block_number`) to the value read, None where the read failed.
+        """
+        raise NotImplementedError
+
+
+class BatchNonceReader(NonceReader):
+    """
+    EVM chain adapter reading the Gateway and Voyager nonces of a chain with a single JSON-RPC batch POST.
+
+    RPCs that reject batches are remembered and served with one request per call from then on.
+    """
+    def __init__(self, contract_registry: ContractRegistry, post_json: Callable[[str, Any], Awaitable[Any]], include_block_number: bool = True,
+                 rpc_pool: Optional[RpcPool] = None):
+        super().__init__(contract_registry, post_json, include_block_number, rpc_pool)
+        self.batch_unsupported = set()
+
+    def build_requests(self, targets: Dict[str, str]) -> Dict[int, Any]:
+        requests = {}
+        for request_id, (contract_type, address) in enumerate(targets.items(), start=1):
+            to_address, call_data = self.contract_registry.get_call_target(address, contract_type)
+            requests[request_id] = (contract_type, {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "eth_call",
+                "params": [{"to": to_address, "data": call_data}, "latest"]
+            })
+        if self.include_block_number:
+            request_id = len(requests) + 1
+            requests[request_id] = (BLOCK_NUMBER, {"jsonrpc": "2.0", "id": request_id, "method": "eth_blockNumber", "params": []})
+        return requests
+
+    @staticmethod
+    def parse_result(response: Any) -> Optional[int]:
+        if not isinstance(response, dict) or response.get('error') or not response.get('result'):
+            return None
+        try:
+            return int(response['result'], 16)
+        except (TypeError, ValueError):
+            return None
+
+    async def read_single(self, rpc: str, payload: Dict[str, Any]) -> Optional[int]:
+        try:
+            return self.parse_result(await self.post_json(rpc, payload))
+        except Exception as e:
+            print(f'Error calling {payload["method"]} on {rpc}: {str(e)}')
+            return None
+
+    async def read_rpc(self, rpc: str, targets: Dict[str, str]) -> Dict[str, Optional[int]]:
+        """
+        Read the nonces of several contracts on one chain RPC.
+
+        :param rpc: Chain RPC url.
+        :param targets: Mapping of contract type value to contract address.
+        :return: Mapping of contract type value (and `block_number`) to the value read, None where the read failed.
+        """
+        rpc = rpc.strip()
+        with span("build_requests", contracts=len(targets)):
+            requests = self.build_requests(targets)
+        if not requests:
+            return {}
+        if len(requests) > 1 and rpc not in self.batch_unsupported:
+            try:
+                response = await self.post_json(rpc, [payload for _, payload in requests.values()])
+            except Exception as e:
+                print(f'Error sending batch to {rpc}: {str(e)}')
+                return {key: None for key, _ in requests.values()}
+            if isinstance(response, list):
+                by_id = {item.get('id'): item for item in response if isinstance(item, dict)}
+                return {key: self.parse_result(by_id.get(request_id)) for request_id, (key, _) in requests.items()}
+            print(f'RPC {rpc} does not support JSON-RPC batches, falling back to single calls')
+            self.batch_unsupported.add(rpc)
+
+        values = await asyncio.gather(*[self.read_single(rpc, payload) for _, payload in requests.values()])
+        return {key: value for (key, _), value in zip(requests.values(), values)}
@@ -0,0 +1,121 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+STATUS_OK = 'ok'
+
+
+class NonceResult:
+    """
+    Outcome of one (chain, contract type, validator) nonce check.
+
+    Failed checks have a `status` other than `ok`, an `error` and no nonces. Records stay typed
+    through the sweep, alerting and storage; `to_dict` builds the wire format at the HTTP and alert edge.
+    """
+    __slots__ = ('validator_address', 'chain_id', 'chain_name', 'moniker', 'jailed', 'status',
+                 'onchain_nonce', 'executed_nonce', 'diff_nonces', 'block_number', 'error')
+
+    def __init__(self, validator_address: str, chain_id: str, chain_name: str, moniker: str, jailed: bool, status: str = STATUS_OK,
+                 onchain_nonce: Optional[int] = None, executed_nonce: Optional[int] = None, block_number: Optional[int] = None,
+                 error: Optional[str] = None):
+        self.validator_address = validator_address
+        self.chain_id = chain_id
+        self.chain_name = chain_name
+        self.moniker = moniker
+        self.jailed = jailed
+        self.status = status
+        self.onchain_nonce = onchain_nonce
+        self.executed_nonce = executed_nonce
+        self.diff_nonces = onchain_nonce - executed_nonce if status == STATUS_OK else None
+        self.block_number = block_number
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_OK
+
+    @property
+    def behind(self) -> bool:
+        return self.status == STATUS_OK and self.diff_nonces > 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.ok:
+            result = {
+                'validator_address': self.validator_address,
+                'chainId': self.chain_id,
+                'latest_onchain_eventNonce': self.onchain_nonce,
+                'lastest_val_executed_nonce': self.executed_nonce,
+                'chain_name': self.chain_name,
+                'moniker': self.moniker,
+                'jailed': self.jailed,
+                'diff_nonces': self.diff_nonces,
+                'status': self.status
+            }
+            if self.block_number is not None:
+                result['block_number'] = self.block_number
+            return result
+        return {
+            'validator_address': self.validator_address,
+            'chainId': self.chain_id,
+            'chain_name': self.chain_name,
+            'moniker': self.moniker,
+            'jailed': self.jailed,
+            'status': self.status,
+            'error': self.error
+        }
+
+    def __repr__(self) -> str:
+        return f"NonceResult({self.to_dict()!r})"
+
+
+COLUMNS = ('validator_address', 'chain_id', 'chain_name', 'moniker', 'jailed', 'status',
+           'onchain_nonce', 'executed_nonce', 'block_number', 'error')
+
+
+def to_columns(records: Iterable[Optional[NonceResult]]) -> Dict[str, List[Any]]:
+    """
+    Columnar batch of records, one list per field, for compact transfer between processes.
+    """
+    records = [record for record in records if record is not None]
+    return {column: [getattr(record, column) for record in records] for column in COLUMNS}
+
+
+def from_columns(columns: Dict[str, List[Any]]) -> List[NonceResult]:
+    if not columns:
+        return []
+    return [NonceResult(*row) for row in zip(*(columns[column] for column in COLUMNS))]
+
+
+def select_ok(records: Iterable[Optional[NonceResult]]) -> List[NonceResult]:
+    return [record for record in records if record is not None and record.ok]
+
+
+def select_behind(records: Iterable[Optional[NonceResult]]) -> List[NonceResult]:
+    return [record for record in records if record is not None and record.behind]
+
+
+def select_failed(records: Iterable[Optional[NonceResult]]) -> List[NonceResult]:
+    return [record for record in records if record is not None and not record.ok]
+
+
+def group_by(records: Iterable[Optional[NonceResult]], field: str) -> Dict[Any, List[NonceResult]]:
+    groups = defaultdict(list)
+    for record in records:
+        if record is not None:
+            groups[getattr(record, field)].append(record)
+    return groups
+
+
+def count_by(records: Iterable[Optional[NonceResult]], *fields: str) -> Dict[Any, int]:
+    """
+    :return: Number of records per value (or tuple of values) of the given fields.
+    """
+    counts = defaultdict(int)
+    for record in records:
+        if record is not None:
+            counts[tuple(getattr(record, field) for field in fields) if len(fields) > 1 else getattr(record, fields[0])] += 1
+    return counts
+
+
+def to_dicts(records: Iterable[Optional[NonceResult]]) -> List[Dict[str, Any]]:
+    return [record.to_dict() for record in records if record is not None]
+
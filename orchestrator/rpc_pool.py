@@ -0,0 +1,144 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+def get_rpc_urls(chain_config: Dict[str, Any]) -> List[str]:
+    """
+    :return: The RPC urls of a `chainInfos.json` entry, whose `rpc` is either one url or a list of urls.
+    """
+    rpc = chain_config.get('rpc') or []
+    if isinstance(rpc, str):
+        rpc = [rpc]
+    return [url.strip() for url in rpc if url and url.strip()]
+
+
+class EndpointStats:
+    __slots__ = ('latency_ewma', 'error_ewma', 'latencies', 'consecutive_failures', 'ejected_until', 'requests', 'errors')
+
+    def __init__(self, window: int):
+        self.latency_ewma = None
+        self.error_ewma = 0.0
+        self.latencies = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+        self.errors = 0
+
+
+class RpcPool:
+    """
+    Rolling latency and error scores of chain RPC endpoints.
+
+    Endpoints are ranked by latency EWMA plus a penalty proportional to their error EWMA; endpoints
+    that were never used rank first so every configured RPC gets measured. An endpoint failing
+    `eject_after` times in a row is ejected for `eject_seconds`, after which it is tried again
+    and re-ejected on its next failure. The p95 of an endpoint's recent latencies is how long a
+    read waits on it before hedging to the runner-up.
+    """
+    def __init__(self, hedge_delay: float = 1.0, eject_after: int = 3, eject_seconds: float = 60,
+                 alpha: float = 0.2, error_penalty: float = 5.0, window: int = 100, min_samples: int = 10):
+        """
+        :param hedge_delay: Seconds to wait before hedging while an endpoint has fewer than `min_samples` latencies.
+        :param eject_after: Consecutive failures after which an endpoint is ejected.
+        :param eject_seconds: Seconds an ejected endpoint is skipped.
+        :param alpha: Weight of the newest sample in the latency and error EWMAs.
+        :param error_penalty: Seconds added to the score of an endpoint that always fails.
+        :param window: Number of recent latencies kept per endpoint for the p95.
+        :param min_samples: Latencies required before the p95 replaces `hedge_delay`.
+        """
+        self.hedge_delay = hedge_delay
+        self.eject_after = max(1, int(eject_after))
+        self.eject_seconds = eject_seconds
+        self.alpha = alpha
+        self.error_penalty = error_penalty
+        self.window = window
+        self.min_samples = min_samples
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def get_stats(self, url: str) -> EndpointStats:
+        stats = self.endpoints.get(url)
+        if stats is None:
+            with self._lock:
+                stats = self.endpoints.setdefault(url, EndpointStats(self.window))
+        return stats
+
+    def score(self, url: str) -> float:
+        stats = self.get_stats(url)
+        return (stats.latency_ewma or 0.0) + stats.error_ewma * self.error_penalty
+
+    def rank(self, urls: List[str]) -> List[str]:
+        """
+        :return: The urls best first, with ejected endpoints after every healthy one.
+        """
+        now = time.monotonic()
+        return sorted(urls, key=lambda url: (self.get_stats(url).ejected_until > now, self.score(url)))
+
+    def is_ejected(self, url: str) -> bool:
+        return self.get_stats(url).ejected_until > time.monotonic()
+
+    def get_hedge_delay(self, url: str) -> float:
+        latencies = sorted(self.get_stats(url).latencies)
+        if len(latencies) < self.min_samples:
+            return self.hedge_delay
+        return latencies[min(len(latencies) - 1, math.ceil(0.95 * len(latencies)) - 1)]
+
+    def record(self, url: str, latency: float, ok: bool) -> None:
+        stats = self.get_stats(url)
+        stats.requests += 1
+        stats.error_ewma += self.alpha * ((0.0 if ok else 1.0) - stats.error_ewma)
+        if ok:
+            stats.latencies.append(latency)
+            stats.latency_ewma = latency if stats.latency_ewma is None else stats.latency_ewma + self.alpha * (latency - stats.latency_ewma)
+            stats.consecutive_failures = 0
+            stats.ejected_until = 0.0
+            return
+        stats.errors += 1
+        stats.consecutive_failures += 1
+        if stats.consecutive_failures >= self.eject_after:
+            if stats.ejected_until <= time.monotonic():
+                print(f'Ejecting RPC {url} for {self.eject_seconds}s after {stats.consecutive_failures} consecutive failures')
+            stats.ejected_until = time.monotonic() + self.eject_seconds
+
+    def get_report(self) -> Dict[str, Dict[str, Optional[float]]]:
+        return {
+            url: {
+                'score': self.score(url),
+                'latency_ewma_seconds': stats.latency_ewma,
+                'error_ewma': stats.error_ewma,
+                'hedge_delay_seconds': self.get_hedge_delay(url),
+                'requests': stats.requests,
+                'errors': stats.errors,
+                'ejected': self.is_ejected(url)
+            }
+            for url, stats in list(self.endpoints.items())
+        }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure_rpc_pool(**kwargs) -> RpcPool:
+    """
+    Replace the shared pool with one built from the given `RpcPool` options.
+    """
+    global _pool
+    with _pool_lock:
+        _pool = RpcPool(**kwargs)
+    return _pool
+
+
+def get_rpc_pool() -> RpcPool:
+    """
+    Return the process-wide shared pool, creating it with defaults on first use.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = RpcPool()
+    return _pool
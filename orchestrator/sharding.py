@@ -0,0 +1,228 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from flask import Flask, jsonify, request
+
+from orchestrator.async_sweep import AsyncNonceSweeper
+from orchestrator.missing_nonce import ContractType, ReadStatus
+from orchestrator.results import NonceResult, from_columns, to_columns
+from utils.hash_ring import HashRing
+from utils.http_client import get_http_client
+
+
+def create_worker_app(nonce_sweeper: AsyncNonceSweeper) -> Flask:
+    """
+    HTTP app of a shard worker: `POST /sweep` runs `AsyncNonceSweeper.sweep` on the chains it is given
+    and answers with a columnar batch of records per contract type.
+    """
+    app = Flask(__name__)
+
+    @app.route('/ping', methods=['GET'])
+    def ping():
+        return jsonify({'ok': True})
+
+    @app.route('/sweep', methods=['POST'])
+    def sweep():
+        body = request.get_json(force=True)
+        results = nonce_sweeper.sweep(body.get('validator_infos'), tuple(body.get('contract_types') or ("GATEWAY", "VOYAGER")), body.get('chain_ids'))
+        return jsonify({'results': {contract_type: to_columns(records) for contract_type, records in (results or {}).items()}})
+
+    return app
+
+
+class ShardWorker:
+    __slots__ = ('url', 'process', 'alive', 'dead_since', 'ready_by', 'sweeps', 'failures')
+
+    def __init__(self, url: str, process: Optional[subprocess.Popen] = None):
+        self.url = url
+        self.process = process
+        self.alive = True
+        self.dead_since = 0.0
+        # Deadline of a local worker process that has not answered its first ping yet
+        self.ready_by = 0.0
+        self.sweeps = 0
+        self.failures = 0
+
+
+class ShardCoordinator:
+    """
+    Splits the chains of every sweep across shard workers with a consistent hash ring and merges their results.
+
+    A worker that fails a sweep request is taken off the ring and its chains are re-assigned to the
+    remaining workers within the same sweep. Dead workers are probed every `retry_dead_seconds`;
+    local worker processes that exited are restarted first. A worker that answers again rejoins
+    the ring and only takes back its own chains. Local worker processes are sent no sweep before
+    they answer `/ping`, for up to `startup_timeout` seconds after they were started.
+    """
+    def __init__(self, nonce_sweeper: AsyncNonceSweeper, worker_urls: List[str], request_timeout: float = 60,
+                 retry_dead_seconds: float = 30, local_command: Optional[List[str]] = None, startup_timeout: float = 30):
+        """
+        :param nonce_sweeper: Local sweeper providing the chain config snapshot and the result listeners.
+        :param worker_urls: Base urls of the shard workers.
+        :param request_timeout: Seconds to wait for a worker's sweep response.
+        :param retry_dead_seconds: Seconds between two probes of a dead worker.
+        :param local_command: Command starting a local worker, formatted with `{port}`; workers are remote when None.
+        :param startup_timeout: Seconds a started local worker is given to answer its first ping.
+        """
+        self.nonce_sweeper = nonce_sweeper
+        self.request_timeout = request_timeout
+        self.retry_dead_seconds = retry_dead_seconds
+        self.local_command = local_command
+        self.startup_timeout = startup_timeout
+        self.workers: Dict[str, ShardWorker] = {url.rstrip('/'): ShardWorker(url.rstrip('/')) for url in worker_urls}
+        self.ring = HashRing(self.workers)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(self.workers)), thread_name_prefix="shard-sweep")
+
+    @classmethod
+    def spawn_local(cls, nonce_sweeper: AsyncNonceSweeper, script_path: str, config_path: str, count: int, base_port: int, **kwargs) -> 'ShardCoordinator':
+        """
+        Start `count` worker processes of `script_path` on localhost ports from `base_port` and coordinate them.
+
+        Returns once every worker answers its ping or `startup_timeout` has passed.
+        """
+        command = [sys.executable, script_path, '--config', config_path, '--worker', '--port', '{port}', '--parent-pid', str(os.getpid())]
+        urls = [f"http://127.0.0.1:{base_port + index}" for index in range(count)]
+        coordinator = cls(nonce_sweeper, urls, local_command=command, **kwargs)
+        for worker in coordinator.workers.values():
+            coordinator.start_process(worker)
+        for worker in coordinator.workers.values():
+            if not coordinator.wait_ready(worker):
+                print(f"Shard worker {worker.url} did not answer within {coordinator.startup_timeout}s")
+        return coordinator
+
+    def start_process(self, worker: ShardWorker) -> None:
+        port = worker.url.rsplit(':', 1)[1]
+        worker.process = subprocess.Popen([part.format(port=port) for part in self.local_command])
+        worker.ready_by = time.monotonic() + self.startup_timeout
+        print(f"Started shard worker {worker.url} (pid {worker.process.pid})")
+
+    def ping(self, worker: ShardWorker) -> bool:
+        try:
+            get_http_client().get_session(get_http_client().get_host(worker.url)).get(f"{worker.url}/ping", timeout=2).raise_for_status()
+        except Exception:
+            return False
+        return True
+
+    def wait_ready(self, worker: ShardWorker) -> bool:
+        """
+        Wait for a starting local worker to answer its ping, until its startup deadline.
+
+        :return: True once the worker answers, False if it did not in time or its process exited.
+        """
+        while worker.ready_by:
+            if self.ping(worker):
+                worker.ready_by = 0.0
+                return True
+            if time.monotonic() >= worker.ready_by or worker.process.poll() is not None:
+                return False
+            time.sleep(0.2)
+        return True
+
+    def mark_dead(self, worker: ShardWorker, error: Exception) -> None:
+        with self._lock:
+            if worker.alive:
+                print(f"Shard worker {worker.url} failed, rebalancing its chains: {str(error)}")
+                worker.alive = False
+                worker.dead_since = time.monotonic()
+                self.ring.remove(worker.url)
+            worker.failures += 1
+
+    def revive_workers(self) -> None:
+        now = time.monotonic()
+        for worker in self.workers.values():
+            if worker.alive or now - worker.dead_since < self.retry_dead_seconds:
+                continue
+            worker.dead_since = now
+            if worker.process is not None and worker.process.poll() is not None:
+                # Rejoins once it answers a ping, which request_sweep waits for
+                self.start_process(worker)
+            elif not self.ping(worker):
+                continue
+            with self._lock:
+                print(f"Shard worker {worker.url} is back")
+                worker.alive = True
+                self.ring.add(worker.url)
+
+    def request_sweep(self, worker: ShardWorker, validator_infos, contract_types, chain_ids: List[str]) -> Dict[str, List[NonceResult]]:
+        if not self.wait_ready(worker):
+            raise ConnectionError(f"worker did not start within {self.startup_timeout}s")
+        session = get_http_client().get_session(get_http_client().get_host(worker.url))
+        response = session.post(f"{worker.url}/sweep", json={
+            'validator_infos': validator_infos,
+            'contract_types': list(contract_types),
+            'chain_ids': chain_ids
+        }, timeout=(3.05, self.request_timeout))
+        response.raise_for_status()
+        worker.sweeps += 1
+        return {contract_type: from_columns(columns) for contract_type, columns in (response.json().get('results') or {}).items()}
+
+    def sweep(self, validator_infos, contract_types=("GATEWAY", "VOYAGER"), chain_ids=None) -> Optional[Dict[str, List[NonceResult]]]:
+        """
+        Same contract as `AsyncNonceSweeper.sweep`, with the chains checked by the shard workers.
+        """
+        if isinstance(validator_infos, dict):
+            validator_infos = [validator_infos]
+        snapshot = self.nonce_sweeper.get_config_snapshot_sync()
+        if snapshot is None:
+            return None
+        pending = [chain_id for chain_id in snapshot.chain_infos if chain_ids is None or chain_id in chain_ids]
+        sweep_results = {ContractType(contract_type).value: [] for contract_type in contract_types}
+        self.revive_workers()
+        while pending:
+            assignment = self.ring.assign(pending)
+            if not assignment:
+                break
+            futures = {
+                url: self._executor.submit(self.request_sweep, self.workers[url], validator_infos, contract_types, shard_chain_ids)
+                for url, shard_chain_ids in assignment.items()
+            }
+            pending = []
+            for url, future in futures.items():
+                try:
+                    results = future.result()
+                except Exception as e:
+                    self.mark_dead(self.workers[url], e)
+                    pending.extend(assignment[url])
+                    continue
+                self.nonce_sweeper.publish_results(results)
+                for contract_type, records in results.items():
+                    sweep_results.setdefault(contract_type, []).extend(records)
+
+        if pending:
+            # No worker left to take these chains
+            validators = [validator_info['validator'] for validator_info in validator_infos or [] if validator_info and validator_info.get('validator')]
+            for chain_id in pending:
+                failures = self.nonce_sweeper.build_failures(chain_id, snapshot.chain_infos[chain_id], validators, list(sweep_results),
+                                                             ReadStatus.WORKER_ERROR, "no shard worker available")
+                self.nonce_sweeper.publish_results(failures)
+                for contract_type, records in failures.items():
+                    sweep_results[contract_type].extend(records)
+        return sweep_results
+
+    def get_report(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            url: {'alive': worker.alive, 'sweeps': worker.sweeps, 'failures': worker.failures, 'pid': worker.process.pid if worker.process else None}
+            for url, worker in self.workers.items()
+        }
+
+    def stop(self, timeout: float = 5) -> None:
+        """
+        Terminate the local worker processes, killing those still running after `timeout` seconds.
+        """
+        processes = [worker.process for worker in self.workers.values() if worker.process is not None and worker.process.poll() is None]
+        for process in processes:
+            process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in processes:
+            try:
+                process.wait(max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,79 @@
+import asyncio
+import hashlib
+from typing import Dict, Optional
+
+from orchestrator.nonce_reader import BLOCK_NUMBER, BatchNonceReader
+
+BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+
+
+def to_tron_hex(address: str) -> str:
+    """
+    Convert a base58 (`T...`), `41`-prefixed hex or 0x-prefixed EVM style Tron address to `41`-prefixed hex.
+    """
+    address = address.strip()
+    if address.startswith('T') and len(address) == 34:
+        value = 0
+        for char in address:
+            value = value * 58 + BASE58_ALPHABET.index(char)
+        raw = value.to_bytes(25, 'big')
+        if hashlib.sha256(hashlib.sha256(raw[:21]).digest()).digest()[:4] != raw[21:]:
+            raise ValueError(f"Invalid Tron address checksum: {address}")
+        return raw[:21].hex()
+    address = address.lower()
+    if address.startswith('0x'):
+        address = address[2:]
+    if len(address) == 40:
+        return '41' + address
+    if len(address) == 42 and address.startswith('41'):
+        return address
+    raise ValueError(f"Invalid Tron address: {address}")
+
+
+class TronNonceReader(BatchNonceReader):
+    """
+    Tron chain adapter.
+
+    RPC urls ending in `/jsonrpc` are Tron's Ethereum compatible JSON-RPC and are read like EVM chains
+    with the addresses converted. Any other url is a full node HTTP API, read with one
+    `triggerconstantcontract` call per contract and `getnowblock` for the block height.
+    """
+    async def call_constant(self, rpc: str, contract_type: str, address: str) -> Optional[int]:
+        try:
+            contract_address = to_tron_hex(address)
+            response = await self.post_json(f"{rpc}/wallet/triggerconstantcontract", {
+                'owner_address': contract_address,
+                'contract_address': contract_address,
+                'function_selector': self.contract_registry.get_signature(contract_type),
+                'parameter': '',
+                'visible': False
+            })
+        except Exception as e:
+            print(f'Error calling {contract_type} nonce getter on {rpc}: {str(e)}')
+            return None
+        if not isinstance(response, dict) or not response.get('result', {}).get('result') or not response.get('constant_result'):
+            return None
+        try:
+            return int(response['constant_result'][0] or '0', 16)
+        except (TypeError, ValueError):
+            return None
+
+    async def get_block_number(self, rpc: str) -> Optional[int]:
+        try:
+            response = await self.post_json(f"{rpc}/wallet/getnowblock", {})
+            return int(response['block_header']['raw_data']['number'])
+        except Exception as e:
+            print(f'Error calling getnowblock on {rpc}: {str(e)}')
+            return None
+
+    async def read_rpc(self, rpc: str, targets: Dict[str, str]) -> Dict[str, Optional[int]]:
+        rpc = rpc.strip().rstrip('/')
+        if rpc.endswith('/jsonrpc'):
+            return await super().read_rpc(rpc, {contract_type: '0x' + to_tron_hex(address)[2:] for contract_type, address in targets.items()})
+        keys = list(targets)
+        calls = [self.call_constant(rpc, contract_type, address) for contract_type, address in targets.items()]
+        if self.include_block_number:
+            keys.append(BLOCK_NUMBER)
+            calls.append(self.get_block_number(rpc))
+        values = await asyncio.gather(*calls)
+        return dict(zip(keys, values))
@@ -0,0 +1,112 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Iterable
+
+
+class Cadence:
+    __slots__ = ('interval', 'next_run', 'running', 'last_run')
+
+    def __init__(self, interval: float, next_run: float):
+        self.interval = interval
+        self.next_run = next_run
+        self.running = False
+        self.last_run = None
+
+
+class AdaptiveScheduler:
+    """
+    Runs one job per key on its own cadence within a bounded worker pool.
+
+    After each run the cadence of that key halves when the job reports progress and grows by
+    `backoff` when it does not, always clamped to [min_interval, max_interval]. A key is never
+    run again while its previous run is still in flight.
+    """
+    def __init__(self, job: Callable[[Hashable], bool], min_interval: float = 2, max_interval: float = 60,
+                 max_workers: int = 8, backoff: float = 1.25, tick: float = 0.2):
+        """
+        :param job: Called with a key; returns True when the watched value advanced since its previous run.
+        :param min_interval: Floor in seconds of any cadence.
+        :param max_interval: Ceiling in seconds of any cadence.
+        :param max_workers: Maximum number of jobs running at once.
+        :param backoff: Factor applied to the cadence of a key whose job reported no progress.
+        :param tick: Seconds between scans for due jobs.
+        """
+        self.job = job
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.max_workers = max(1, int(max_workers))
+        self.backoff = backoff
+        self.tick = tick
+        self.cadences: Dict[Hashable, Cadence] = {}
+        self._inflight = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="chain-poll")
+
+    def set_keys(self, keys: Iterable[Hashable]) -> None:
+        """
+        Start scheduling new keys immediately and stop scheduling keys that are gone. Existing cadences are kept.
+        """
+        keys = set(keys)
+        now = time.monotonic()
+        with self._lock:
+            for key in keys - set(self.cadences):
+                self.cadences[key] = Cadence(self.min_interval, now)
+            for key in set(self.cadences) - keys:
+                del self.cadences[key]
+
+    def reset(self, keys: Iterable[Hashable]) -> None:
+        """
+        Run the given keys as soon as possible and restart their cadence from `min_interval`.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                cadence = self.cadences.get(key)
+                if cadence is not None:
+                    cadence.interval = self.min_interval
+                    cadence.next_run = now
+
+    def reconfigure(self, min_interval: float, max_interval: float) -> None:
+        """
+        Change the cadence bounds; current cadences are clamped to them at their next run.
+        """
+        with self._lock:
+            self.min_interval = min_interval
+            self.max_interval = max(min_interval, max_interval)
+
+    def _run(self, key: Hashable, cadence: Cadence) -> None:
+        advanced = False
+        try:
+            advanced = bool(self.job(key))
+        except Exception as e:
+            print(f"Error polling {key}: {str(e)}")
+        finally:
+            now = time.monotonic()
+            with self._lock:
+                factor = 0.5 if advanced else self.backoff
+                cadence.interval = min(self.max_interval, max(self.min_interval, cadence.interval * factor))
+                cadence.last_run = now
+                cadence.next_run = now + cadence.interval
+                cadence.running = False
+                self._inflight -= 1
+
+    def run_pending(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            due = sorted((cadence.next_run, key) for key, cadence in self.cadences.items() if not cadence.running and cadence.next_run <= now)
+            for _, key in due[:self.max_workers - self._inflight]:
+                cadence = self.cadences[key]
+                cadence.running = True
+                self._inflight += 1
+                self._executor.submit(self._run, key, cadence)
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            self.run_pending()
+            self._stop.wait(self.tick)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._executor.shutdown(wait=False)
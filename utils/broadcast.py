@@ -0,0 +1,129 @@
+import json
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Fields that change on every read without the check itself changing
+VOLATILE_FIELDS = ('block_number',)
+
+
+def encode_default(value: Any) -> Any:
+    # Typed result records are only turned into dicts when they are encoded
+    to_dict = getattr(value, 'to_dict', None)
+    return to_dict() if to_dict is not None else str(value)
+
+
+def encode(payload: Any) -> str:
+    return json.dumps(payload, separators=(',', ':'), default=encode_default)
+
+
+def format_event(event: str, data: str, event_id: Optional[int] = None) -> str:
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines.append(f"event: {event}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+class ResultBroadcaster:
+    """
+    Fans nonce check results out to Server-Sent Events subscribers.
+
+    `publish` keeps the latest record per (contract type, chain, validator) and appends only the
+    records that changed to a bounded buffer of encoded events, which every subscriber reads from;
+    nothing is encoded per subscriber. A subscriber starts with a snapshot of every current record,
+    or resumes after its `Last-Event-ID` while that event is still buffered.
+    """
+    def __init__(self, buffer_size: int = 1024, heartbeat_seconds: float = 15):
+        """
+        :param buffer_size: Number of delta events kept for subscribers to catch up from.
+        :param heartbeat_seconds: Seconds of silence after which a comment line is sent to keep connections open.
+        """
+        self.heartbeat_seconds = heartbeat_seconds
+        self.records: Dict[Tuple[str, str, str], Any] = {}
+        self.events = deque(maxlen=max(1, int(buffer_size)))
+        self.seq = 0
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def get_key(source: str, record: Any) -> Tuple[str, str, str]:
+        return source, str(record.chain_id), str(record.validator_address)
+
+    @staticmethod
+    def is_changed(previous: Optional[Any], record: Any) -> bool:
+        if previous is None:
+            return True
+        return any(getattr(previous, field) != getattr(record, field) for field in record.__slots__ if field not in VOLATILE_FIELDS)
+
+    def publish(self, source: str, records: Iterable[Any]) -> int:
+        """
+        :param source: Contract type of the records.
+        :param records: `NonceResult` records of one or more chains; None entries are skipped.
+        :return: Number of changed records broadcast.
+        """
+        with self._condition:
+            changed = []
+            for record in records:
+                if record is None:
+                    continue
+                key = self.get_key(source, record)
+                if self.is_changed(self.records.get(key), record):
+                    changed.append(record)
+                self.records[key] = record
+            if not changed:
+                return 0
+            self.seq += 1
+            self.events.append((self.seq, format_event("delta", encode({"seq": self.seq, "source": source, "records": changed}), self.seq)))
+            self._condition.notify_all()
+        return len(changed)
+
+    def resize(self, buffer_size: int) -> None:
+        """
+        Change how many delta events are kept, keeping the newest ones.
+        """
+        with self._condition:
+            self.events = deque(self.events, maxlen=max(1, int(buffer_size)))
+
+    def snapshot(self) -> Tuple[int, str]:
+        with self._condition:
+            records: Dict[str, List[Any]] = {}
+            for (source, _, _), record in self.records.items():
+                records.setdefault(source, []).append(record)
+            return self.seq, format_event("snapshot", encode({"seq": self.seq, "records": records}), self.seq)
+
+    def get_events_after(self, seq: int) -> Optional[List[Tuple[int, str]]]:
+        """
+        :return: Buffered events newer than `seq`, or None if some of them were already dropped.
+        """
+        if self.events and self.events[0][0] > seq + 1:
+            return None
+        return [event for event in self.events if event[0] > seq]
+
+    def stream(self, last_event_id: Optional[str] = None) -> Iterator[str]:
+        """
+        Yield Server-Sent Events text: a snapshot (unless resuming), then deltas as they are published.
+        """
+        try:
+            seq = int(last_event_id)
+            with self._condition:
+                pending = self.get_events_after(seq) if seq <= self.seq else None
+        except (TypeError, ValueError):
+            pending = None
+        if pending is None:
+            seq, event = self.snapshot()
+            yield event
+        else:
+            for seq, event in pending:
+                yield event
+        while True:
+            with self._condition:
+                if self.seq == seq:
+                    self._condition.wait(self.heartbeat_seconds)
+                pending = self.get_events_after(seq)
+            if pending is None:
+                # Fell behind the buffer, start over from a fresh snapshot
+                seq, event = self.snapshot()
+                yield event
+            elif not pending:
+                yield ": heartbeat\n\n"
+            for seq, event in pending or []:
+                yield event
@@ -0,0 +1,119 @@
+import threading
+import time
+from typing import Dict, Hashable
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Fails fast for a dependency that keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and `allow` refuses calls for
+    `reset_timeout` seconds. It then lets `half_open_max` probe calls through: a successful probe
+    closes the circuit, a failed one opens it again.
+    """
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30, half_open_max: int = 1):
+        """
+        :param failure_threshold: Consecutive failures that open the circuit.
+        :param reset_timeout: Seconds the circuit stays open before probing.
+        :param half_open_max: Concurrent probe calls allowed while half open.
+        """
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = reset_timeout
+        self.half_open_max = max(1, int(half_open_max))
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at >= self.reset_timeout:
+                # Also re-arms probes whose outcome was never recorded, e.g. cancelled calls
+                self.state = HALF_OPEN
+                self.opened_at = now
+                self.probes = 0
+            if self.state == OPEN or self.probes >= self.half_open_max:
+                return False
+            self.probes += 1
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self.probes = 0
+
+
+class CircuitBreakers:
+    """
+    Circuit breakers created on first use per key, all with the same settings.
+    """
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30, half_open_max: int = 1):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self.breakers: Dict[Hashable, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> CircuitBreaker:
+        breaker = self.breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self.breakers.setdefault(key, CircuitBreaker(self.failure_threshold, self.reset_timeout, self.half_open_max))
+        return breaker
+
+    def reconfigure(self, failure_threshold: int, reset_timeout: float) -> None:
+        """
+        Change the settings of every breaker in place, keeping their current state.
+        """
+        with self._lock:
+            self.failure_threshold = failure_threshold
+            self.reset_timeout = reset_timeout
+            for breaker in self.breakers.values():
+                breaker.failure_threshold = max(1, int(failure_threshold))
+                breaker.reset_timeout = reset_timeout
+
+    def get_states(self) -> Dict[Hashable, str]:
+        return {key: breaker.state for key, breaker in list(self.breakers.items())}
+
+
+_breakers = None
+_breakers_lock = threading.Lock()
+
+
+def configure_circuit_breakers(**kwargs) -> CircuitBreakers:
+    """
+    Replace the shared breakers with ones built from the given `CircuitBreakers` options.
+    """
+    global _breakers
+    with _breakers_lock:
+        _breakers = CircuitBreakers(**kwargs)
+    return _breakers
+
+
+def get_circuit_breakers() -> CircuitBreakers:
+    """
+    Return the process-wide shared breakers, creating them with defaults on first use.
+    """
+    global _breakers
+    if _breakers is None:
+        with _breakers_lock:
+            if _breakers is None:
+                _breakers = CircuitBreakers()
+    return _breakers
@@ -0,0 +1,117 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+class FileWatcher:
+    """
+    Calls `callback(path)` from a background thread whenever one of the watched files changes.
+
+    On Linux the parent directories are watched with inotify, which also catches editors and
+    config maps that replace a file by renaming; elsewhere, or when inotify is unavailable, the
+    files are polled. Either way a change is confirmed by comparing the file's mtime, size and
+    inode, and changes arriving within `debounce` seconds are reported once.
+    """
+    def __init__(self, paths: Iterable[str], callback: Callable[[str], None], poll_interval: float = 5, debounce: float = 0.2):
+        """
+        :param paths: Files to watch.
+        :param callback: Called with the path of a file that changed.
+        :param poll_interval: Seconds between two polls of the files; also the inotify wait timeout.
+        :param debounce: Seconds to wait for more events after the first one.
+        """
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.signatures: Dict[str, Optional[Tuple[int, int, int]]] = {path: self.get_signature(path) for path in self.paths}
+        self.inotify_fd = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def get_signature(path: str) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def open_inotify(self) -> Optional[int]:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            for directory in {os.path.dirname(path) for path in self.paths}:
+                if libc.inotify_add_watch(fd, directory.encode(), WATCH_MASK) < 0:
+                    os.close(fd)
+                    return None
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def drain_events(self) -> None:
+        try:
+            while os.read(self.inotify_fd, 64 * 1024):
+                pass
+        except BlockingIOError:
+            pass
+
+    def check(self) -> List[str]:
+        """
+        :return: The watched files whose signature changed since the previous check.
+        """
+        changed = []
+        for path in self.paths:
+            signature = self.get_signature(path)
+            if signature != self.signatures.get(path):
+                self.signatures[path] = signature
+                if signature is not None:
+                    changed.append(path)
+        return changed
+
+    def wait(self) -> None:
+        if self.inotify_fd is None:
+            self._stop.wait(self.poll_interval)
+            return
+        readable, _, _ = select.select([self.inotify_fd], [], [], self.poll_interval)
+        if readable:
+            self.drain_events()
+            # Let the writer finish before the files are compared
+            self._stop.wait(self.debounce)
+            self.drain_events()
+
+    def run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                self.wait()
+                for path in self.check():
+                    try:
+                        self.callback(path)
+                    except Exception as e:
+                        print(f"Error applying changes of {path}: {str(e)}")
+        finally:
+            if self.inotify_fd is not None:
+                os.close(self.inotify_fd)
+                self.inotify_fd = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self.inotify_fd = self.open_inotify()
+            print(f"Watching {', '.join(self.paths)} for changes ({'inotify' if self.inotify_fd is not None else 'polling'})")
+            self._thread = threading.Thread(target=self.run, name="file-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -0,0 +1,60 @@
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+
+def hash_key(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+
+
+class HashRing:
+    """
+    Consistent hash ring with `replicas` virtual points per node.
+
+    Adding or removing a node only moves the keys that hashed to that node's points, so the other
+    nodes keep their keys and their warm caches.
+    """
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 64):
+        """
+        :param nodes: Initial node names.
+        :param replicas: Virtual points per node; more points spread keys more evenly.
+        """
+        self.replicas = replicas
+        self.points: List[int] = []
+        self.owners: Dict[int, str] = {}
+        self.nodes = set()
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str) -> None:
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for replica in range(self.replicas):
+            point = hash_key(f"{node}#{replica}")
+            self.owners[point] = node
+            bisect.insort(self.points, point)
+
+    def remove(self, node: str) -> None:
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        self.points = [point for point in self.points if self.owners[point] != node]
+        self.owners = {point: owner for point, owner in self.owners.items() if owner != node}
+
+    def get_node(self, key: str) -> Optional[str]:
+        if not self.points:
+            return None
+        index = bisect.bisect(self.points, hash_key(key)) % len(self.points)
+        return self.owners[self.points[index]]
+
+    def assign(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        :return: The keys owned by each node that owns at least one of them.
+        """
+        assignment: Dict[str, List[str]] = {}
+        for key in keys:
+            node = self.get_node(key)
+            if node is not None:
+                assignment.setdefault(node, []).append(key)
+        return assignment
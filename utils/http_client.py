@@ -0,0 +1,200 @@
+import json
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from utils.tracing import KIND_CLIENT, Span, span
+
+
+class ResponseTooLarge(requests.exceptions.RequestException):
+    """Raised when a response body exceeds the configured size limit."""
+
+
+class HostStats:
+    __slots__ = ('requests', 'errors', 'retries', 'latency_total', 'latency_max')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "latency_avg_seconds": self.latency_total / self.requests if self.requests else 0.0,
+            "latency_max_seconds": self.latency_max
+        }
+
+
+class HttpClient:
+    """
+    Shared HTTP client with one pooled session per host, timeouts, bounded retries and size limits.
+    """
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 10, max_retries: int = 2,
+                 backoff_base: float = 0.25, backoff_max: float = 4, max_response_bytes: int = 10 * 1024 * 1024,
+                 pool_maxsize: int = 20):
+        """
+        :param connect_timeout: Seconds to wait for a TCP/TLS connection.
+        :param read_timeout: Seconds to wait between bytes of the response.
+        :param max_retries: Retries after the first attempt on connection errors, timeouts and retryable status codes.
+        :param backoff_base: Base delay in seconds of the exponential backoff; the actual delay is fully jittered.
+        :param backoff_max: Upper bound in seconds of a single backoff delay.
+        :param max_response_bytes: Responses larger than this are rejected with `ResponseTooLarge`.
+        :param pool_maxsize: Maximum number of pooled keep-alive connections per host.
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_response_bytes = max_response_bytes
+        self.pool_maxsize = pool_maxsize
+        self._sessions = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_host(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def get_session(self, host: str) -> requests.Session:
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                    session.mount(host, adapter)
+                    self._sessions[host] = session
+        return session
+
+    def get_host_stats(self, host: str) -> HostStats:
+        stats = self._stats.get(host)
+        if stats is None:
+            stats = self._stats.setdefault(host, HostStats())
+        return stats
+
+    def record(self, host: str, latency: float, error: bool = False, retry: bool = False) -> None:
+        """
+        Record one request against a host. Also used by callers doing their own (e.g. asyncio) I/O.
+        """
+        stats = self.get_host_stats(host)
+        stats.requests += 1
+        stats.latency_total += latency
+        if latency > stats.latency_max:
+            stats.latency_max = latency
+        if error:
+            stats.errors += 1
+        if retry:
+            stats.retries += 1
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        :return: Per host request, error and retry counters plus average/max latency.
+        """
+        return {host: stats.as_dict() for host, stats in list(self._stats.items())}
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def read_body(self, response: requests.Response) -> bytes:
+        length = response.headers.get('Content-Length')
+        if length and length.isdigit() and int(length) > self.max_response_bytes:
+            raise ResponseTooLarge(f"Response of {length} bytes from {response.url} exceeds {self.max_response_bytes} bytes")
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > self.max_response_bytes:
+                raise ResponseTooLarge(f"Response from {response.url} exceeds {self.max_response_bytes} bytes")
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    def request(self, method: str, url: str, **kwargs) -> bytes:
+        """
+        Perform a request and return the raw body of a successful (2xx) response.
+
+        :raises requests.exceptions.RequestException: On connection errors, timeouts, HTTP errors or oversized bodies once retries are exhausted.
+        """
+        host = self.get_host(url)
+        with span(f"HTTP {method}", KIND_CLIENT, **{'http.request.method': method, 'server.address': host}) as http_span:
+            return self.request_with_retries(host, method, url, http_span, **kwargs)
+
+    def request_with_retries(self, host: str, method: str, url: str, http_span: Optional[Span], **kwargs) -> bytes:
+        session = self.get_session(host)
+        kwargs.setdefault('timeout', (self.connect_timeout, self.read_timeout))
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            retryable = False
+            if http_span is not None:
+                http_span.set_attribute('http.request.resend_count', attempt)
+            try:
+                with session.request(method, url, stream=True, **kwargs) as response:
+                    retryable = response.status_code in self.RETRY_STATUS_CODES
+                    if http_span is not None:
+                        http_span.set_attribute('http.response.status_code', response.status_code)
+                    response.raise_for_status()
+                    body = self.read_body(response)
+                self.record(host, time.monotonic() - started, retry=attempt > 0)
+                return body
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.HTTPError) as e:
+                self.record(host, time.monotonic() - started, error=True, retry=attempt > 0)
+                if isinstance(e, requests.exceptions.HTTPError) and not retryable:
+                    raise
+                if attempt >= self.max_retries:
+                    raise
+            except requests.exceptions.RequestException:
+                self.record(host, time.monotonic() - started, error=True, retry=attempt > 0)
+                raise
+            time.sleep(self.backoff(attempt))
+            attempt += 1
+
+    def get_json(self, url: str, **kwargs) -> Any:
+        return decode_json(self.request('GET', url, **kwargs))
+
+    def post_json(self, url: str, payload: Any, **kwargs) -> Any:
+        return decode_json(self.request('POST', url, json=payload, **kwargs))
+
+
+def decode_json(body: bytes) -> Any:
+    with span("json.decode", **{'http.response.body.size': len(body)}):
+        return json.loads(body)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def configure_http_client(**kwargs) -> HttpClient:
+    """
+    Replace the shared client with one built from the given `HttpClient` options.
+    """
+    global _client
+    with _client_lock:
+        _client = HttpClient(**kwargs)
+    return _client
+
+
+def get_http_client() -> HttpClient:
+    """
+    Return the process-wide shared client, creating it with defaults on first use.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
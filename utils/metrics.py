@@ -0,0 +1,207 @@
+import bisect
+import math
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from orchestrator.rpc_pool import get_rpc_pool
+from utils.circuit_breaker import OPEN, get_circuit_breakers
+from utils.http_client import get_http_client
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def format_labels(label_names: Tuple[str, ...], label_values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """
+    Base class of the in-process metrics.
+
+    Updates never take a lock: they are plain dict/list operations that rely on the GIL, so a
+    concurrent scrape may at worst read a sample that is one update behind.
+    """
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"] + self.samples()
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, *label_values) -> None:
+        labels = tuple(str(v) for v in label_values)
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{format_labels(self.label_names, labels)} {format_value(value)}" for labels, value in list(self.values.items())]
+
+
+class Gauge(Metric):
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, *label_values) -> None:
+        self.values[tuple(str(v) for v in label_values)] = float(value)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{format_labels(self.label_names, labels)} {format_value(value)}" for labels, value in list(self.values.items())]
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self.series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values) -> None:
+        labels = tuple(str(v) for v in label_values)
+        series = self.series.get(labels)
+        if series is None:
+            # [per-bucket counts..., sum]
+            series = self.series.setdefault(labels, [0] * len(self.buckets) + [0.0])
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, *label_values):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - started, *label_values)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, series in list(self.series.items()):
+            series = list(series)
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = 'le="' + format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{format_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.label_names, labels)} {format_value(series[-1])}")
+            lines.append(f"{self.name}_count{format_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class CallbackMetric(Metric):
+    """
+    Metric whose samples are computed at scrape time, e.g. from counters kept elsewhere.
+    """
+    def __init__(self, name: str, documentation: str, type_name: str, label_names: Iterable[str], collect: Callable[[], Iterable[Tuple[Tuple[str, ...], float]]]):
+        super().__init__(name, documentation, label_names)
+        self.type_name = type_name
+        self.collect = collect
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{format_labels(self.label_names, labels)} {format_value(value)}" for labels, value in self.collect()]
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+SWEEP_DURATION = REGISTRY.register(Histogram(
+    "router_monitor_sweep_duration_seconds", "Duration of a full nonce sweep over all chains and contract types."))
+RPC_NONCE_LATENCY = REGISTRY.register(Histogram(
+    "router_monitor_rpc_nonce_latency_seconds", "Latency of reading the on-chain nonces of a chain.", ("chain_id",)))
+RPC_HEDGED_READS = REGISTRY.register(Counter(
+    "router_monitor_rpc_hedged_reads_total", "Nonce reads duplicated to a second RPC because the first exceeded its p95 latency."))
+LCD_LAST_EVENT_NONCE_LATENCY = REGISTRY.register(Histogram(
+    "router_monitor_lcd_last_event_nonce_latency_seconds", "Latency of an LCD attestation last_event_nonce lookup.", ("chain_id", "contract_type")))
+BALANCE_FETCH_LATENCY = REGISTRY.register(Histogram(
+    "router_monitor_balance_fetch_latency_seconds", "Latency of an LCD bank balance lookup by denom."))
+LCD_LOOKUPS_SKIPPED = REGISTRY.register(Counter(
+    "router_monitor_lcd_lookups_skipped_total", "LCD last_event_nonce lookups skipped because nothing could have changed."))
+NONCE_READ_FAILURES = REGISTRY.register(Counter(
+    "router_monitor_nonce_read_failures_total", "Nonce checks that could not be read, by status.", ("chain_id", "contract_type", "status")))
+DIFF_NONCES = REGISTRY.register(Gauge(
+    "router_monitor_diff_nonces", "On-chain nonce minus the last nonce executed by the validator.", ("chain_id", "contract_type", "moniker")))
+VALIDATOR_JAILED = REGISTRY.register(Gauge(
+    "router_monitor_validator_jailed", "1 if the validator is jailed, 0 otherwise.", ("moniker",)))
+WALLET_BALANCE = REGISTRY.register(Gauge(
+    "router_monitor_wallet_balance", "Wallet balance in display units of its denom (ROUTE for route).", ("address", "role", "denom")))
+# Series of ROUTE balances kept under their original name for existing dashboards
+WALLET_BALANCE_ROUTE = REGISTRY.register(Gauge(
+    "router_monitor_wallet_balance_route", "Wallet balance in ROUTE.", ("address", "role")))
+
+
+def collect_http_stats(field: str) -> Callable[[], Iterable[Tuple[Tuple[str, ...], float]]]:
+    def collect():
+        return [((host,), stats[field]) for host, stats in get_http_client().get_stats().items()]
+    return collect
+
+
+def collect_rpc_stats(field: str, combine: Callable[[float, float], float]) -> Callable[[], Iterable[Tuple[Tuple[str, ...], float]]]:
+    def collect():
+        # Labelled by host only since RPC urls often embed provider API keys
+        by_host = {}
+        for url, stats in get_rpc_pool().get_report().items():
+            host = get_http_client().get_host(url)
+            value = float(stats[field] or 0)
+            by_host[host] = combine(by_host[host], value) if host in by_host else value
+        return [((host,), value) for host, value in by_host.items()]
+    return collect
+
+
+REGISTRY.register(CallbackMetric(
+    "router_monitor_http_requests_total", "HTTP requests sent per host.", "counter", ("host",), collect_http_stats("requests")))
+REGISTRY.register(CallbackMetric(
+    "router_monitor_http_errors_total", "Failed HTTP requests per host.", "counter", ("host",), collect_http_stats("errors")))
+REGISTRY.register(CallbackMetric(
+    "router_monitor_http_latency_avg_seconds", "Average HTTP request latency per host.", "gauge", ("host",), collect_http_stats("latency_avg_seconds")))
+REGISTRY.register(CallbackMetric(
+    "router_monitor_rpc_endpoint_latency_ewma_seconds", "Latency EWMA of the slowest chain RPC endpoint of a host.", "gauge", ("host",), collect_rpc_stats("latency_ewma_seconds", max)))
+REGISTRY.register(CallbackMetric(
+    "router_monitor_rpc_endpoint_errors_total", "Failed nonce reads per chain RPC host.", "counter", ("host",), collect_rpc_stats("errors", float.__add__)))
+REGISTRY.register(CallbackMetric(
+    "router_monitor_rpc_endpoint_ejected", "1 while a chain RPC endpoint of the host is ejected, 0 otherwise.", "gauge", ("host",), collect_rpc_stats("ejected", max)))
+REGISTRY.register(CallbackMetric(
+    "router_monitor_circuit_open", "1 while a chain RPC or LCD host circuit is open, 0 otherwise.", "gauge", ("circuit",),
+    lambda: [((key,), 1.0 if state == OPEN else 0.0) for key, state in get_circuit_breakers().get_states().items()]))
@@ -0,0 +1,93 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+
+class SamplingProfiler:
+    """
+    Samples the Python stacks of every thread at a fixed interval and aggregates them as folded stacks.
+
+    Sweeps run on the event loop thread and on executor threads, which a cProfile session started
+    from the calling thread would not see, so stacks are read from `sys._current_frames` instead.
+    The output is one `thread;outer;...;inner count` line per distinct stack, the input format of
+    flamegraph.pl, speedscope and inferno.
+    """
+    def __init__(self, interval: float = 0.01):
+        """
+        :param interval: Seconds between two samples.
+        """
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.started_at = None
+        self.stopped_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def get_label(code) -> str:
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def sample(self) -> None:
+        names: Dict[int, str] = {thread.ident: thread.name for thread in threading.enumerate()}
+        own = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self.get_label(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, str(thread_id)))
+            self.samples[';'.join(reversed(stack))] += 1
+        self.sample_count += 1
+
+    def run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self.run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.stopped_at = time.time()
+
+    def merge(self, other: 'SamplingProfiler') -> None:
+        """
+        Add the samples of a finished profile to this one.
+        """
+        self.samples.update(other.samples)
+        self.sample_count += other.sample_count
+        self.started_at = self.started_at or other.started_at
+        self.stopped_at = other.stopped_at
+
+    def render(self) -> str:
+        return ''.join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def write(self, directory: str, prefix: str = "profile", timestamped: bool = True) -> Optional[str]:
+        """
+        Write the folded stacks to `<directory>/<prefix>-<timestamp>.folded`, or to `<directory>/<prefix>.folded`
+        replacing the previous file when not `timestamped`.
+
+        :return: The path written, or None if it could not be written.
+        """
+        name = f"{prefix}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(self.started_at))}" if timestamped else prefix
+        path = os.path.join(directory, f"{name}.folded")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # Readers of a replaced file never see it half written
+            with open(path + '.tmp', 'w') as file:
+                file.write(self.render())
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            print(f"Error writing profile to {path}: {str(e)}")
+            return None
+        return path
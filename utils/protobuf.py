@@ -0,0 +1,35 @@
+from typing import Any, Dict
+
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.message import Message
+
+INT64_TYPES = {
+    FieldDescriptor.TYPE_INT64, FieldDescriptor.TYPE_UINT64, FieldDescriptor.TYPE_SINT64,
+    FieldDescriptor.TYPE_FIXED64, FieldDescriptor.TYPE_SFIXED64
+}
+
+
+def to_dict(message: Message) -> Dict[str, Any]:
+    """
+    Convert a decoded message to the JSON the LCD serves for it: every field under its proto name, absent
+    fields with their defaults (absent messages included, as the chain's non-nullable fields are), enums by
+    name and 64-bit integers as strings. Bytes are kept as bytes.
+    """
+    return {field.name: convert_field(field, getattr(message, field.name)) for field in message.DESCRIPTOR.fields}
+
+
+def convert_field(field: FieldDescriptor, value: Any) -> Any:
+    if field.label == FieldDescriptor.LABEL_REPEATED:
+        return [convert_value(field, item) for item in value]
+    return convert_value(field, value)
+
+
+def convert_value(field: FieldDescriptor, value: Any) -> Any:
+    if field.type == FieldDescriptor.TYPE_MESSAGE:
+        return to_dict(value)
+    if field.type == FieldDescriptor.TYPE_ENUM:
+        enum_value = field.enum_type.values_by_number.get(value)
+        return enum_value.name if enum_value is not None else value
+    if field.type in INT64_TYPES:
+        return str(value)
+    return value
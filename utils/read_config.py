@@ -1,5 +1,21 @@
 import yaml
 import os
+from typing import Any, Set
+
+
+def diff_config(old: Any, new: Any, prefix: str = "") -> Set[str]:
+    """
+    Return the dotted keys whose values differ between two loaded configurations.
+
+    Nested dictionaries are compared key by key; any other value, including lists, is compared as a whole.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed = set()
+        for key in set(old) | set(new):
+            changed |= diff_config(old.get(key), new.get(key), f"{prefix}.{key}" if prefix else str(key))
+        return changed
+    return set() if old == new else {prefix}
+
 
 class ConfigManager:
     def __init__(self, config_file_path: str = None):
@@ -47,3 +63,21 @@ class ConfigManager:
             return config
         except KeyError:
             return default
+
+    def reload(self) -> Set[str]:
+        """
+        Re-read the configuration file and replace the cached configuration.
+
+        A file that cannot be read or parsed keeps the previous configuration.
+
+        :return: The dotted keys that changed, e.g. `settings.schedule_interval_seconds`.
+        """
+        try:
+            with open(self.config_file_path, 'r') as file:
+                config = yaml.safe_load(file) or {}
+        except (OSError, yaml.YAMLError) as exc:
+            print(f"Error reloading {self.config_file_path}, keeping the previous configuration: {exc}")
+            return set()
+        changed = diff_config(self.config_cache, config)
+        self.config_cache = config
+        return changed
@@ -0,0 +1,46 @@
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple
+
+
+class SnapshotStore:
+    """
+    Holds the latest result of a periodic job and lets concurrent callers share a single on-demand refresh.
+    """
+    def __init__(self):
+        # value and generation time are swapped as one tuple so readers never see a mismatched pair
+        self._current = (None, None)
+        self._lock = threading.Lock()
+        self._inflight = None
+
+    def set(self, value: Any) -> None:
+        self._current = (value, time.time())
+
+    def get(self) -> Tuple[Optional[Any], Optional[float]]:
+        """
+        :return: The latest value and its generation time (epoch seconds), or (None, None) if nothing was produced yet.
+        """
+        return self._current
+
+    def refresh(self, producer: Callable[[], Any]) -> Tuple[Optional[Any], Optional[float]]:
+        """
+        Run `producer` and store its result. Callers arriving while a refresh is running wait for it instead of starting another.
+
+        :param producer: Function computing a fresh value.
+        :return: The refreshed value and its generation time.
+        """
+        with self._lock:
+            inflight = self._inflight
+            leader = inflight is None
+            if leader:
+                inflight = self._inflight = threading.Event()
+        if not leader:
+            inflight.wait()
+            return self.get()
+        try:
+            self.set(producer())
+        finally:
+            with self._lock:
+                self._inflight = None
+            inflight.set()
+        return self.get()
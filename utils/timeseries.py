@@ -0,0 +1,202 @@
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key1 TEXT NOT NULL,
+    key2 TEXT NOT NULL,
+    key3 TEXT NOT NULL,
+    UNIQUE (kind, key1, key2, key3)
+);
+CREATE TABLE IF NOT EXISTS nonce_samples (
+    series_id INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    onchain INTEGER NOT NULL,
+    executed INTEGER NOT NULL,
+    PRIMARY KEY (series_id, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS balance_samples (
+    series_id INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    balance REAL NOT NULL,
+    PRIMARY KEY (series_id, ts)
+) WITHOUT ROWID;
+"""
+
+
+def rate_per_hour(first_ts: int, first_value: float, last_ts: int, last_value: float) -> Optional[float]:
+    if last_ts <= first_ts:
+        return None
+    return (last_value - first_value) * 3600.0 / (last_ts - first_ts)
+
+
+class HistoryStore:
+    """
+    Append-only SQLite store of nonce and balance samples.
+
+    Samples are keyed by (series, unix second) in WITHOUT ROWID tables, so a range query on one
+    series is a single primary-key range scan. Samples older than `raw_retention_seconds` are
+    downsampled to the last sample of every `downsample_seconds` bucket, and samples older than
+    `retention_seconds` are dropped, which bounds the file size.
+    """
+    def __init__(self, path: str, raw_retention_seconds: int = 2 * 86400, downsample_seconds: int = 300,
+                 retention_seconds: int = 30 * 86400, maintenance_interval_seconds: int = 3600):
+        """
+        :param path: SQLite database file path.
+        :param raw_retention_seconds: Age after which samples are downsampled.
+        :param downsample_seconds: Bucket width in seconds of downsampled data.
+        :param retention_seconds: Age after which samples are deleted.
+        :param maintenance_interval_seconds: Minimum seconds between two downsampling/retention passes.
+        """
+        self.path = path
+        self.raw_retention_seconds = raw_retention_seconds
+        self.downsample_seconds = downsample_seconds
+        self.retention_seconds = retention_seconds
+        self.maintenance_interval_seconds = maintenance_interval_seconds
+        self._series_ids = {}
+        self._last_maintenance = 0.0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def get_series_id(self, kind: str, key1: str, key2: str = "", key3: str = "", create: bool = True) -> Optional[int]:
+        key = (kind, str(key1), str(key2), str(key3))
+        series_id = self._series_ids.get(key)
+        if series_id is None:
+            row = self.conn.execute("SELECT id FROM series WHERE kind=? AND key1=? AND key2=? AND key3=?", key).fetchone()
+            if row is None:
+                if not create:
+                    return None
+                row = (self.conn.execute("INSERT INTO series (kind, key1, key2, key3) VALUES (?, ?, ?, ?)", key).lastrowid,)
+            series_id = self._series_ids[key] = row[0]
+        return series_id
+
+    def record_nonces(self, samples: Iterable[Any], source: str, ts: Optional[int] = None) -> None:
+        """
+        :param samples: `NonceResult` records from a sweep whose nonces were read; None entries are skipped.
+        :param source: Contract type the records belong to.
+        :param ts: Sample time in unix seconds, now by default.
+        """
+        ts = int(ts if ts is not None else time.time())
+        with self._lock:
+            rows = [
+                (self.get_series_id("nonce", r.chain_id, source, r.validator_address), ts, int(r.onchain_nonce), int(r.executed_nonce))
+                for r in samples if r is not None
+            ]
+            self.conn.execute("BEGIN")
+            self.conn.executemany("INSERT OR REPLACE INTO nonce_samples (series_id, ts, onchain, executed) VALUES (?, ?, ?, ?)", rows)
+            self.conn.execute("COMMIT")
+        self.maybe_maintain()
+
+    def record_balance(self, address: str, role: str, balance: float, ts: Optional[int] = None, denom: str = "route") -> None:
+        ts = int(ts if ts is not None else time.time())
+        with self._lock:
+            series_id = self.get_series_id("balance", address, role, denom)
+            self.conn.execute("INSERT OR REPLACE INTO balance_samples (series_id, ts, balance) VALUES (?, ?, ?)", (series_id, ts, float(balance)))
+
+    def maybe_maintain(self) -> None:
+        if time.monotonic() - self._last_maintenance >= self.maintenance_interval_seconds:
+            self.maintain()
+
+    def maintain(self, now: Optional[int] = None) -> None:
+        """
+        Downsample old samples, drop expired ones and return freed pages to the file system.
+        """
+        now = int(now if now is not None else time.time())
+        downsample_before = now - self.raw_retention_seconds
+        delete_before = now - self.retention_seconds
+        with self._lock:
+            self.conn.execute("BEGIN")
+            for table in ("nonce_samples", "balance_samples"):
+                self.conn.execute(f"DELETE FROM {table} WHERE ts < ?", (delete_before,))
+                # Keep only the last sample of each bucket: one primary-key seek per candidate row
+                self.conn.execute(
+                    f"""DELETE FROM {table} AS s WHERE s.ts < :before AND EXISTS (
+                        SELECT 1 FROM {table} AS n WHERE n.series_id = s.series_id
+                        AND n.ts > s.ts AND n.ts < (s.ts / :bucket + 1) * :bucket)""",
+                    {"before": downsample_before, "bucket": self.downsample_seconds})
+            self.conn.execute("COMMIT")
+            self.conn.execute("PRAGMA incremental_vacuum")
+            self._last_maintenance = time.monotonic()
+
+    def nonce_history(self, chain_id: str, source: str, validator_address: str, start: int, end: int, buffer: int = 0) -> Dict[str, Any]:
+        """
+        Return the nonce samples of one chain/contract/validator in [start, end] with derived rates.
+
+        `onchain_velocity_per_hour` and `executed_velocity_per_hour` are nonce increase rates;
+        `catch_up_rate_per_hour` is their difference (positive when the validator is closing the gap);
+        `time_behind_seconds` is how long the validator has been more than `buffer` nonces behind.
+        """
+        with self._lock:
+            series_id = self.get_series_id("nonce", chain_id, source, validator_address, create=False)
+            rows = [] if series_id is None else self.conn.execute(
+                "SELECT ts, onchain, executed FROM nonce_samples WHERE series_id=? AND ts BETWEEN ? AND ? ORDER BY ts",
+                (series_id, start, end)).fetchall()
+        result = {
+            "samples": [[ts, onchain, executed, onchain - executed] for ts, onchain, executed in rows],
+            "onchain_velocity_per_hour": None,
+            "executed_velocity_per_hour": None,
+            "catch_up_rate_per_hour": None,
+            "time_behind_seconds": None,
+            "estimated_catch_up_seconds": None
+        }
+        if not rows:
+            return result
+        first, last = rows[0], rows[-1]
+        onchain_velocity = rate_per_hour(first[0], first[1], last[0], last[1])
+        executed_velocity = rate_per_hour(first[0], first[2], last[0], last[2])
+        result["onchain_velocity_per_hour"] = onchain_velocity
+        result["executed_velocity_per_hour"] = executed_velocity
+        if onchain_velocity is not None and executed_velocity is not None:
+            result["catch_up_rate_per_hour"] = executed_velocity - onchain_velocity
+        behind_since = None
+        for ts, onchain, executed in reversed(rows):
+            if onchain - executed <= buffer:
+                break
+            behind_since = ts
+        result["time_behind_seconds"] = last[0] - behind_since if behind_since is not None else 0
+        lag = last[1] - last[2]
+        catch_up_rate = result["catch_up_rate_per_hour"]
+        if lag > buffer and catch_up_rate:
+            result["estimated_catch_up_seconds"] = (lag - buffer) * 3600.0 / catch_up_rate if catch_up_rate > 0 else None
+        return result
+
+    def balance_history(self, address: str, role: str, start: int, end: int, threshold: Optional[float] = None, denom: str = "route") -> Dict[str, Any]:
+        """
+        Return the balance samples of one address and denom in [start, end] with its burn rate.
+
+        `burn_rate_per_hour` is positive while the balance decreases; `time_to_threshold_seconds`
+        extrapolates it down to `threshold`.
+        """
+        with self._lock:
+            series_id = self.get_series_id("balance", address, role, denom, create=False)
+            rows = [] if series_id is None else self.conn.execute(
+                "SELECT ts, balance FROM balance_samples WHERE series_id=? AND ts BETWEEN ? AND ? ORDER BY ts",
+                (series_id, start, end)).fetchall()
+        result = {"samples": [list(row) for row in rows], "burn_rate_per_hour": None, "time_to_threshold_seconds": None}
+        if not rows:
+            return result
+        change = rate_per_hour(rows[0][0], rows[0][1], rows[-1][0], rows[-1][1])
+        if change is not None:
+            result["burn_rate_per_hour"] = 0.0 - change
+            if threshold is not None and change < 0:
+                result["time_to_threshold_seconds"] = max(0.0, (rows[-1][1] - threshold) * 3600.0 / -change)
+        return result
+
+    def list_series(self) -> List[Dict[str, str]]:
+        with self._lock:
+            rows = self.conn.execute("SELECT kind, key1, key2, key3 FROM series ORDER BY kind, key1, key2, key3").fetchall()
+        series = []
+        for kind, key1, key2, key3 in rows:
+            if kind == "nonce":
+                series.append({"kind": kind, "chain_id": key1, "contract_type": key2, "validator": key3})
+            else:
+                series.append({"kind": kind, "address": key1, "role": key2, "denom": key3})
+        return series
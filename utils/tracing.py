@@ -0,0 +1,177 @@
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+SERVICE_NAME = 'router-chain-monitor'
+# OTLP span kinds
+KIND_INTERNAL = 1
+KIND_CLIENT = 3
+STATUS_ERROR = 2
+
+# Marks a trace that was not sampled, so its children are skipped too
+NOT_SAMPLED = object()
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+def to_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+class Span:
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'kind', 'start_ns', 'end_ns', 'attributes', 'error')
+
+    def __init__(self, name: str, parent: Optional['Span'] = None, kind: int = KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else '%032x' % random.getrandbits(128)
+        self.span_id = '%016x' % random.getrandbits(64)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes or {}
+        self.error = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns or self.start_ns),
+            'attributes': [to_attribute(key, value) for key, value in self.attributes.items() if value is not None]
+        }
+        if self.parent_id is not None:
+            span['parentSpanId'] = self.parent_id
+        if self.error is not None:
+            span['status'] = {'code': STATUS_ERROR, 'message': self.error}
+        return span
+
+
+class Tracer:
+    """
+    Records nested spans and appends each finished trace to a JSON lines file.
+
+    Every line is an OTLP/JSON `ExportTraceServiceRequest`, the format written by the OpenTelemetry
+    collector's file exporter, so the file can be replayed into a collector or loaded into Jaeger.
+    The current span is kept in a context variable, which follows asyncio tasks; use `bind` and
+    `propagate` to carry it into the sweep event loop and into executor threads.
+    """
+    def __init__(self, path: str = '', sample_rate: float = 1.0, max_file_bytes: int = 100 * 1024 * 1024, max_pending: int = 10000):
+        """
+        :param path: JSON lines file the traces are appended to. Tracing is off when empty.
+        :param sample_rate: Fraction of root spans (and their children) that are recorded.
+        :param max_file_bytes: Size at which the file is rotated to `<path>.1`.
+        :param max_pending: Finished spans buffered before they are written without waiting for their root.
+        """
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_file_bytes = max_file_bytes
+        self.max_pending = max_pending
+        self.pending: List[Span] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, kind: int = KIND_INTERNAL, **attributes) -> Iterator[Optional[Span]]:
+        """
+        Record the enclosed block as a span, a child of the current span if there is one.
+
+        :return: The span, or None when tracing is off or the trace is not sampled.
+        """
+        parent = _current_span.get()
+        if not self.path or parent is NOT_SAMPLED:
+            yield None
+            return
+        if parent is None and self.sample_rate < 1 and random.random() >= self.sample_rate:
+            token = _current_span.set(NOT_SAMPLED)
+            try:
+                yield None
+            finally:
+                _current_span.reset(token)
+            return
+        span = Span(name, parent, kind, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {str(e)}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            self.finish(span)
+
+    def finish(self, span: Span) -> None:
+        with self._lock:
+            self.pending.append(span)
+            # Children still running when their root ends (e.g. abandoned hedged reads) go out with the next trace
+            if span.parent_id is None or len(self.pending) >= self.max_pending:
+                spans, self.pending = self.pending, []
+                self.write(spans)
+
+    def write(self, spans: List[Span]) -> None:
+        line = json.dumps({'resourceSpans': [{
+            'resource': {'attributes': [to_attribute('service.name', SERVICE_NAME), to_attribute('process.pid', os.getpid())]},
+            'scopeSpans': [{'scope': {'name': SERVICE_NAME}, 'spans': [span.to_otlp() for span in spans]}]
+        }]}, separators=(',', ':'))
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_file_bytes:
+                os.replace(self.path, self.path + '.1')
+            with open(self.path, 'a') as file:
+                file.write(line + '\n')
+        except OSError as e:
+            print(f"Error writing traces to {self.path}: {str(e)}")
+
+
+_tracer = Tracer()
+
+
+def configure_tracer(**kwargs) -> Tracer:
+    """
+    Replace the shared tracer with one built from the given `Tracer` options.
+    """
+    global _tracer
+    _tracer = Tracer(**kwargs)
+    return _tracer
+
+
+def span(name: str, kind: int = KIND_INTERNAL, **attributes):
+    """
+    Context manager recording a span with the shared tracer.
+    """
+    return _tracer.span(name, kind, **attributes)
+
+
+def bind(coro):
+    """
+    Wrap a coroutine so it runs under the current span, e.g. when it is handed to another thread's event loop.
+    """
+    parent = _current_span.get()
+
+    async def run():
+        # Each task runs in its own copy of the context, so the parent needs no reset
+        _current_span.set(parent)
+        return await coro
+    return run()
+
+
+def propagate(fn: Callable) -> Callable:
+    """
+    Wrap a callable so it runs under the current span in an executor thread.
+    """
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(fn, *args, **kwargs)